@@ -0,0 +1,108 @@
+"""partition_attendance_records
+
+Revision ID: 0b6e4d2a9c57
+Revises: f7d2b9e6c130
+Create Date: 2026-10-18 14:05:19.837226
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e4d2a9c57'
+down_revision: Union[str, None] = 'f7d2b9e6c130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Creates attendance_records_y<year> covering one academic year
+# [year-<start_month>-01, year+1-<start_month>-01). Rows that already landed in the
+# default partition for that range are moved into the new partition first.
+ENSURE_PARTITION_FN = """
+CREATE OR REPLACE FUNCTION attendance_records_ensure_partition(p_year integer, p_start_month integer)
+RETURNS text LANGUAGE plpgsql AS $$
+DECLARE
+    part text := format('attendance_records_y%s', p_year);
+    lo date := make_date(p_year, p_start_month, 1);
+    hi date := make_date(p_year + 1, p_start_month, 1);
+BEGIN
+    IF to_regclass(part) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE attendance_records INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM attendance_records_default WHERE date >= %L AND date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved', lo, hi, part);
+    EXECUTE format('ALTER TABLE attendance_records ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, lo, hi);
+    RETURN part;
+END $$;
+"""
+
+COLUMNS = "id, school_id, class_id, student_id, teacher_id, date, status, notes, created_at, updated_at"
+
+
+def _add_constraints(primary_key: list) -> None:
+    op.create_primary_key('attendance_records_pkey', 'attendance_records', primary_key)
+    op.create_unique_constraint(
+        'uq_attendance_records_student_day', 'attendance_records',
+        ['school_id', 'class_id', 'student_id', 'date'],
+    )
+    for column, table in [('school_id', 'schools'), ('class_id', 'classes'),
+                          ('student_id', 'students'), ('teacher_id', 'teachers')]:
+        op.create_foreign_key(f'attendance_records_{column}_fkey', 'attendance_records', table, [column], ['id'])
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE attendance_records RENAME TO attendance_records_unpartitioned")
+    op.execute("""
+        CREATE TABLE attendance_records (
+            LIKE attendance_records_unpartitioned INCLUDING DEFAULTS
+        ) PARTITION BY RANGE (date)
+    """)
+    op.execute("CREATE TABLE attendance_records_default PARTITION OF attendance_records DEFAULT")
+    op.execute(ENSURE_PARTITION_FN)
+
+    # One partition per academic year that has data, plus the current and next year
+    start_month = settings.TERM1_START_MONTH
+    op.execute(f"""
+        SELECT attendance_records_ensure_partition(y::integer, {start_month})
+        FROM generate_series(
+            LEAST(
+                (SELECT min(extract(year FROM date - interval '{start_month - 1} months'))
+                 FROM attendance_records_unpartitioned),
+                extract(year FROM current_date - interval '{start_month - 1} months')
+            ),
+            extract(year FROM current_date - interval '{start_month - 1} months') + 1
+        ) AS y
+    """)
+
+    op.execute(f"INSERT INTO attendance_records ({COLUMNS}) SELECT {COLUMNS} FROM attendance_records_unpartitioned")
+    op.execute("DROP TABLE attendance_records_unpartitioned")
+
+    # The partition key must be part of every unique constraint, so the primary key becomes (id, date)
+    _add_constraints(['id', 'date'])
+    # date-leading composites; each partition gets its own copy
+    op.create_index('ix_attendance_records_school_date', 'attendance_records', ['school_id', 'date'])
+    op.create_index('ix_attendance_records_class_date', 'attendance_records', ['class_id', 'date'])
+    op.create_index('ix_attendance_records_student_date', 'attendance_records', ['student_id', 'date'])
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE attendance_records RENAME TO attendance_records_partitioned")
+    op.execute("""
+        CREATE TABLE attendance_records (
+            LIKE attendance_records_partitioned INCLUDING DEFAULTS
+        )
+    """)
+    op.execute(f"INSERT INTO attendance_records ({COLUMNS}) SELECT {COLUMNS} FROM attendance_records_partitioned")
+    op.execute("DROP TABLE attendance_records_partitioned CASCADE")
+    op.execute("DROP FUNCTION attendance_records_ensure_partition(integer, integer)")
+
+    _add_constraints(['id'])
+    for column in ['class_id', 'date', 'school_id', 'student_id']:
+        op.create_index(f'ix_attendance_records_{column}', 'attendance_records', [column])
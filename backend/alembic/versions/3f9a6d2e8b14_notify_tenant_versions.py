@@ -0,0 +1,60 @@
+"""notify_tenant_versions
+
+Revision ID: 3f9a6d2e8b14
+Revises: 8e2c4a7b1f05
+Create Date: 2026-10-18 18:05:47.209331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6d2e8b14'
+down_revision: Union[str, None] = '8e2c4a7b1f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same bump as 8e2c4a7b1f05, now also announcing every new version as
+# "school_id:resource:version" on the tenant_versions channel (see app.services.invalidation).
+# NOTIFY is transactional: listeners hear about a write only once it has committed.
+BUMP_FN = """
+CREATE OR REPLACE FUNCTION tenant_versions_bump() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    schools uuid[];
+    bumped record;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT school_id) INTO schools FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(DISTINCT school_id) INTO schools
+        FROM (SELECT school_id FROM new_rows UNION ALL SELECT school_id FROM old_rows) s;
+    ELSE
+        SELECT array_agg(DISTINCT school_id) INTO schools FROM old_rows;
+    END IF;
+
+    FOR bumped IN
+        INSERT INTO tenant_versions AS v (school_id, resource, version, updated_at)
+        SELECT u.school_id, TG_TABLE_NAME, nextval('tenant_versions_seq'), now()
+        FROM unnest(schools) AS u(school_id)
+        WHERE u.school_id IS NOT NULL
+        ON CONFLICT (school_id, resource) DO UPDATE SET version = EXCLUDED.version, updated_at = now()
+        RETURNING v.school_id, v.resource, v.version
+    LOOP
+        {notify}
+    END LOOP;
+    RETURN NULL;
+END $$;
+"""
+
+NOTIFY = "PERFORM pg_notify('tenant_versions', bumped.school_id || ':' || bumped.resource || ':' || bumped.version);"
+
+
+def upgrade() -> None:
+    op.execute(BUMP_FN.replace("{notify}", NOTIFY))
+
+
+def downgrade() -> None:
+    op.execute(BUMP_FN.replace("{notify}", "NULL;"))
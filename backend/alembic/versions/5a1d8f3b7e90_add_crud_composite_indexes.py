@@ -0,0 +1,52 @@
+"""add_crud_composite_indexes
+
+Revision ID: 5a1d8f3b7e90
+Revises: 0b6e4d2a9c57
+Create Date: 2026-10-18 14:52:08.374512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a1d8f3b7e90'
+down_revision: Union[str, None] = '0b6e4d2a9c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns) -- one per tenant-scoped access path in app/crud/
+INDEXES = [
+    # new_modules.get_class_attendance; supersedes (class_id, date)
+    ('ix_attendance_records_school_class_date', 'attendance_records', ['school_id', 'class_id', 'date']),
+    # new_modules.get_calendar_events (overlap of [start_date, end_date] with a month)
+    ('ix_calendar_events_school_start_end', 'calendar_events', ['school_id', 'start_date', 'end_date']),
+    # new_modules.get_announcements (newest first)
+    ('ix_announcements_school_created', 'announcements', ['school_id', sa.text('created_at DESC')]),
+    # new_modules.get_school_schedule
+    ('ix_schedule_slots_school_day_period', 'schedule_slots', ['school_id', 'day_of_week', 'period']),
+    # academic.get_classes_by_teacher
+    ('ix_classes_school_teacher', 'classes', ['school_id', 'teacher_id']),
+    # academic.get_enrollment_map (index-only scan per school)
+    ('ix_class_enrollments_school_class_student', 'class_enrollments', ['school_id', 'class_id', 'student_id']),
+    # academic.get_curriculum / get_assessments
+    ('ix_curriculums_school_class', 'curriculums', ['school_id', 'class_id']),
+    ('ix_assessments_school_class', 'assessments', ['school_id', 'class_id']),
+    # student.get_profile recent grades
+    ('ix_grades_school_student_created', 'grades', ['school_id', 'student_id', sa.text('created_at DESC')]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    op.drop_index('ix_attendance_records_class_date', table_name='attendance_records')
+
+
+def downgrade() -> None:
+    op.create_index('ix_attendance_records_class_date', 'attendance_records', ['class_id', 'date'])
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
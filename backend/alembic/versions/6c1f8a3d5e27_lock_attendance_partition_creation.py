@@ -0,0 +1,52 @@
+"""lock_attendance_partition_creation
+
+Revision ID: 6c1f8a3d5e27
+Revises: c7d4e1a9b2f6
+Create Date: 2026-10-18 22:03:51.116842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1f8a3d5e27'
+down_revision: Union[str, None] = 'c7d4e1a9b2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same function as 0b6e4d2a9c57. Every worker runs it at startup, so the existence
+# check and the CREATE TABLE now happen under a transaction-level advisory lock:
+# a worker that loses the race waits, then finds the partition and returns NULL.
+ENSURE_PARTITION_FN = """
+CREATE OR REPLACE FUNCTION attendance_records_ensure_partition(p_year integer, p_start_month integer)
+RETURNS text LANGUAGE plpgsql AS $$
+DECLARE
+    part text := format('attendance_records_y%s', p_year);
+    lo date := make_date(p_year, p_start_month, 1);
+    hi date := make_date(p_year + 1, p_start_month, 1);
+BEGIN
+    {lock}
+    IF to_regclass(part) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE attendance_records INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM attendance_records_default WHERE date >= %L AND date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved', lo, hi, part);
+    EXECUTE format('ALTER TABLE attendance_records ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, lo, hi);
+    RETURN part;
+END $$;
+"""
+
+LOCK = "PERFORM pg_advisory_xact_lock(hashtext('attendance_records_partitions'));"
+
+
+def upgrade() -> None:
+    op.execute(ENSURE_PARTITION_FN.replace("{lock}", LOCK))
+
+
+def downgrade() -> None:
+    op.execute(ENSURE_PARTITION_FN.replace("{lock}", "NULL;"))
@@ -0,0 +1,85 @@
+"""add_tenant_versions
+
+Revision ID: 8e2c4a7b1f05
+Revises: 5a1d8f3b7e90
+Create Date: 2026-10-18 16:40:12.518903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2c4a7b1f05'
+down_revision: Union[str, None] = '5a1d8f3b7e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables whose writes bump tenant_versions (resource = table name); see app.api.dependencies.conditional_get
+TABLES = ['students', 'teachers', 'financial_records', 'announcements', 'calendar_events',
+          'classes', 'class_enrollments']
+
+# Statement-level with transition tables: one upsert per school touched, however many
+# rows the statement wrote (bulk import, attendance-style bulk updates)
+BUMP_FN = """
+CREATE OR REPLACE FUNCTION tenant_versions_bump() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO tenant_versions AS v (school_id, resource, version, updated_at)
+        SELECT s.school_id, TG_TABLE_NAME, nextval('tenant_versions_seq'), now()
+        FROM (SELECT DISTINCT school_id FROM new_rows WHERE school_id IS NOT NULL) s
+        ON CONFLICT (school_id, resource) DO UPDATE SET version = EXCLUDED.version, updated_at = now();
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO tenant_versions AS v (school_id, resource, version, updated_at)
+        SELECT s.school_id, TG_TABLE_NAME, nextval('tenant_versions_seq'), now()
+        FROM (SELECT school_id FROM new_rows UNION SELECT school_id FROM old_rows) s
+        WHERE s.school_id IS NOT NULL
+        ON CONFLICT (school_id, resource) DO UPDATE SET version = EXCLUDED.version, updated_at = now();
+    ELSE
+        INSERT INTO tenant_versions AS v (school_id, resource, version, updated_at)
+        SELECT s.school_id, TG_TABLE_NAME, nextval('tenant_versions_seq'), now()
+        FROM (SELECT DISTINCT school_id FROM old_rows WHERE school_id IS NOT NULL) s
+        ON CONFLICT (school_id, resource) DO UPDATE SET version = EXCLUDED.version, updated_at = now();
+    END IF;
+    RETURN NULL;
+END $$;
+"""
+
+# Transition tables allow a single event per trigger
+EVENTS = [
+    ('ins', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('upd', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('del', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE tenant_versions_seq")
+    op.create_table('tenant_versions',
+    sa.Column('school_id', sa.UUID(), nullable=False),
+    sa.Column('resource', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('school_id', 'resource')
+    )
+    op.execute(BUMP_FN)
+    for table in TABLES:
+        for suffix, event, referencing in EVENTS:
+            op.execute(f"""
+                CREATE TRIGGER trg_tenant_versions_{table}_{suffix}
+                AFTER {event} ON {table}
+                REFERENCING {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION tenant_versions_bump()
+            """)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        for suffix, _, _ in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_tenant_versions_{table}_{suffix} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS tenant_versions_bump()")
+    op.drop_table('tenant_versions')
+    op.execute("DROP SEQUENCE IF EXISTS tenant_versions_seq")
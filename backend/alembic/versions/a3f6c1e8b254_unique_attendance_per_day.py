@@ -0,0 +1,39 @@
+"""unique_attendance_per_day
+
+Revision ID: a3f6c1e8b254
+Revises: e5b8d0c4a7f3
+Create Date: 2026-10-18 12:40:15.284690
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f6c1e8b254'
+down_revision: Union[str, None] = 'e5b8d0c4a7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The old delete-and-reinsert path could leave duplicates on concurrent saves; keep the latest.
+    op.execute("""
+        DELETE FROM attendance_records a
+        USING attendance_records newer
+        WHERE newer.school_id = a.school_id
+          AND newer.class_id = a.class_id
+          AND newer.student_id = a.student_id
+          AND newer.date = a.date
+          AND (COALESCE(newer.updated_at, '-infinity'), newer.id) > (COALESCE(a.updated_at, '-infinity'), a.id)
+    """)
+    op.create_unique_constraint(
+        'uq_attendance_records_student_day', 'attendance_records',
+        ['school_id', 'class_id', 'student_id', 'date'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_attendance_records_student_day', 'attendance_records', type_='unique')
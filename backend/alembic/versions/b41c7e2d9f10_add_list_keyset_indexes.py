@@ -0,0 +1,38 @@
+"""add_list_keyset_indexes
+
+Revision ID: b41c7e2d9f10
+Revises: d85112b99520
+Create Date: 2026-10-18 10:04:52.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41c7e2d9f10'
+down_revision: Union[str, None] = 'd85112b99520'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_students_school_name', 'students', ['school_id', 'last_name', 'first_name', 'id']),
+    ('ix_students_school_grade_section', 'students', ['school_id', 'grade', 'section', 'last_name', 'first_name', 'id']),
+    ('ix_teachers_school_name', 'teachers', ['school_id', 'last_name', 'first_name', 'id']),
+    ('ix_financial_records_school_due', 'financial_records', ['school_id', 'due_date', 'id']),
+    ('ix_financial_records_school_status_due', 'financial_records', ['school_id', 'status', 'due_date', 'id']),
+    ('ix_financial_records_school_student_due', 'financial_records', ['school_id', 'student_id', 'due_date', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
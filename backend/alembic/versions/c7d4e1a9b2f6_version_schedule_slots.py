@@ -0,0 +1,46 @@
+"""version_schedule_slots
+
+Revision ID: c7d4e1a9b2f6
+Revises: 3f9a6d2e8b14
+Create Date: 2026-10-18 21:12:36.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d4e1a9b2f6'
+down_revision: Union[str, None] = '3f9a6d2e8b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The schedule is served from the response cache, so its writes must bump (and notify)
+# like the tables in 8e2c4a7b1f05; app.core.cache refuses to cache reads of unversioned tables
+TABLES = ['schedule_slots']
+
+# Transition tables allow a single event per trigger
+EVENTS = [
+    ('ins', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('upd', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('del', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        for suffix, event, referencing in EVENTS:
+            op.execute(f"""
+                CREATE TRIGGER trg_tenant_versions_{table}_{suffix}
+                AFTER {event} ON {table}
+                REFERENCING {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION tenant_versions_bump()
+            """)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        for suffix, _, _ in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_tenant_versions_{table}_{suffix} ON {table}")
@@ -0,0 +1,34 @@
+"""unique_grade_per_assessment
+
+Revision ID: c9e3a5f17d42
+Revises: b41c7e2d9f10
+Create Date: 2026-10-18 11:21:07.503198
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e3a5f17d42'
+down_revision: Union[str, None] = 'b41c7e2d9f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Re-saving a gradebook used to insert a second row; keep only the latest grade.
+    op.execute("""
+        DELETE FROM grades g
+        USING grades newer
+        WHERE newer.assessment_id = g.assessment_id
+          AND newer.student_id = g.student_id
+          AND (COALESCE(newer.created_at, '-infinity'), newer.id) > (COALESCE(g.created_at, '-infinity'), g.id)
+    """)
+    op.create_unique_constraint('uq_grades_assessment_student', 'grades', ['assessment_id', 'student_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_grades_assessment_student', 'grades', type_='unique')
@@ -0,0 +1,152 @@
+"""add_tenant_stats
+
+Revision ID: d85112b99520
+Revises: 962ddafc509f
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd85112b99520'
+down_revision: Union[str, None] = '962ddafc509f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+APPLY_FN = """
+CREATE OR REPLACE FUNCTION tenant_stats_apply(
+    p_school_id uuid, p_students integer, p_teachers integer, p_invoice_total numeric,
+    p_paid numeric, p_pending numeric, p_overdue numeric, p_outstanding integer
+) RETURNS void LANGUAGE sql AS $$
+    INSERT INTO tenant_stats AS t (
+        school_id, student_count, teacher_count, invoice_total,
+        paid_amount, pending_amount, overdue_amount, outstanding_invoices, updated_at
+    )
+    VALUES (p_school_id, p_students, p_teachers, p_invoice_total,
+            p_paid, p_pending, p_overdue, p_outstanding, now())
+    ON CONFLICT (school_id) DO UPDATE SET
+        student_count        = t.student_count        + EXCLUDED.student_count,
+        teacher_count        = t.teacher_count        + EXCLUDED.teacher_count,
+        invoice_total        = t.invoice_total        + EXCLUDED.invoice_total,
+        paid_amount          = t.paid_amount          + EXCLUDED.paid_amount,
+        pending_amount       = t.pending_amount       + EXCLUDED.pending_amount,
+        overdue_amount       = t.overdue_amount       + EXCLUDED.overdue_amount,
+        outstanding_invoices = t.outstanding_invoices + EXCLUDED.outstanding_invoices,
+        updated_at           = now();
+$$;
+"""
+
+# students / teachers: +1 / -1 headcount per row (moving a row between schools counts for both)
+HEADCOUNT_FN = """
+CREATE OR REPLACE FUNCTION tenant_stats_headcount() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    is_student integer := CASE WHEN TG_TABLE_NAME = 'students' THEN 1 ELSE 0 END;
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.school_id IS NOT DISTINCT FROM NEW.school_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM tenant_stats_apply(OLD.school_id, -is_student, is_student - 1, 0, 0, 0, 0, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM tenant_stats_apply(NEW.school_id, is_student, 1 - is_student, 0, 0, 0, 0, 0);
+    END IF;
+    RETURN NULL;
+END $$;
+"""
+
+# financial_records: remove the OLD invoice's contribution, add the NEW one
+FINANCE_FN = """
+CREATE OR REPLACE FUNCTION tenant_stats_finance() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.type = 'invoice' THEN
+        PERFORM tenant_stats_apply(
+            OLD.school_id, 0, 0, -OLD.amount,
+            CASE WHEN OLD.status = 'paid'    THEN -OLD.amount ELSE 0 END,
+            CASE WHEN OLD.status = 'pending' THEN -OLD.amount ELSE 0 END,
+            CASE WHEN OLD.status = 'overdue' THEN -OLD.amount ELSE 0 END,
+            CASE WHEN OLD.status <> 'paid'   THEN -1 ELSE 0 END
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.type = 'invoice' THEN
+        PERFORM tenant_stats_apply(
+            NEW.school_id, 0, 0, NEW.amount,
+            CASE WHEN NEW.status = 'paid'    THEN NEW.amount ELSE 0 END,
+            CASE WHEN NEW.status = 'pending' THEN NEW.amount ELSE 0 END,
+            CASE WHEN NEW.status = 'overdue' THEN NEW.amount ELSE 0 END,
+            CASE WHEN NEW.status <> 'paid'   THEN 1 ELSE 0 END
+        );
+    END IF;
+    RETURN NULL;
+END $$;
+"""
+
+BACKFILL = """
+INSERT INTO tenant_stats (
+    school_id, student_count, teacher_count, invoice_total,
+    paid_amount, pending_amount, overdue_amount, outstanding_invoices, updated_at
+)
+SELECT s.id,
+       (SELECT count(*) FROM students st WHERE st.school_id = s.id),
+       (SELECT count(*) FROM teachers t  WHERE t.school_id  = s.id),
+       coalesce(f.invoice_total, 0), coalesce(f.paid, 0), coalesce(f.pending, 0),
+       coalesce(f.overdue, 0), coalesce(f.outstanding, 0), now()
+FROM schools s
+LEFT JOIN (
+    SELECT school_id,
+           sum(amount)                                   AS invoice_total,
+           sum(amount) FILTER (WHERE status = 'paid')    AS paid,
+           sum(amount) FILTER (WHERE status = 'pending') AS pending,
+           sum(amount) FILTER (WHERE status = 'overdue') AS overdue,
+           count(*)    FILTER (WHERE status <> 'paid')   AS outstanding
+    FROM financial_records
+    WHERE type = 'invoice'
+    GROUP BY school_id
+) f ON f.school_id = s.id
+"""
+
+
+def upgrade() -> None:
+    op.create_table('tenant_stats',
+    sa.Column('school_id', sa.UUID(), nullable=False),
+    sa.Column('student_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('teacher_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('invoice_total', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+    sa.Column('paid_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+    sa.Column('pending_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+    sa.Column('overdue_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+    sa.Column('outstanding_invoices', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('school_id')
+    )
+    op.execute(APPLY_FN)
+    op.execute(HEADCOUNT_FN)
+    op.execute(FINANCE_FN)
+    for table in ('students', 'teachers'):
+        op.execute(f"""
+            CREATE TRIGGER trg_tenant_stats_{table}
+            AFTER INSERT OR DELETE OR UPDATE OF school_id ON {table}
+            FOR EACH ROW EXECUTE FUNCTION tenant_stats_headcount()
+        """)
+    op.execute("""
+        CREATE TRIGGER trg_tenant_stats_financial_records
+        AFTER INSERT OR DELETE OR UPDATE OF school_id, type, status, amount ON financial_records
+        FOR EACH ROW EXECUTE FUNCTION tenant_stats_finance()
+    """)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_tenant_stats_financial_records ON financial_records")
+    op.execute("DROP TRIGGER IF EXISTS trg_tenant_stats_teachers ON teachers")
+    op.execute("DROP TRIGGER IF EXISTS trg_tenant_stats_students ON students")
+    op.execute("DROP FUNCTION IF EXISTS tenant_stats_finance()")
+    op.execute("DROP FUNCTION IF EXISTS tenant_stats_headcount()")
+    op.execute("DROP FUNCTION IF EXISTS tenant_stats_apply(uuid, integer, integer, numeric, numeric, numeric, numeric, integer)")
+    op.drop_table('tenant_stats')
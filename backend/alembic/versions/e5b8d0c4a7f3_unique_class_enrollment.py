@@ -0,0 +1,34 @@
+"""unique_class_enrollment
+
+Revision ID: e5b8d0c4a7f3
+Revises: c9e3a5f17d42
+Create Date: 2026-10-18 11:58:43.920415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8d0c4a7f3'
+down_revision: Union[str, None] = 'c9e3a5f17d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Double submits used to enroll a student twice; keep the earliest enrollment.
+    op.execute("""
+        DELETE FROM class_enrollments e
+        USING class_enrollments older
+        WHERE older.class_id = e.class_id
+          AND older.student_id = e.student_id
+          AND (COALESCE(older.created_at, '-infinity'), older.id) < (COALESCE(e.created_at, '-infinity'), e.id)
+    """)
+    op.create_unique_constraint('uq_class_enrollments_class_student', 'class_enrollments', ['class_id', 'student_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_class_enrollments_class_student', 'class_enrollments', type_='unique')
@@ -0,0 +1,57 @@
+"""add_attendance_daily_rollup
+
+Revision ID: f7d2b9e6c130
+Revises: a3f6c1e8b254
+Create Date: 2026-10-18 13:27:36.661052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7d2b9e6c130'
+down_revision: Union[str, None] = 'a3f6c1e8b254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+INSERT INTO attendance_daily_rollup (school_id, class_id, date, present, absent, late, excused, updated_at)
+SELECT school_id, class_id, date,
+       count(*) FILTER (WHERE status = 'present'),
+       count(*) FILTER (WHERE status = 'absent'),
+       count(*) FILTER (WHERE status = 'late'),
+       count(*) FILTER (WHERE status = 'excused'),
+       timezone('UTC', now())
+FROM attendance_records
+GROUP BY school_id, class_id, date
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'attendance_daily_rollup',
+        sa.Column('school_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('class_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('present', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('absent', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('late', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('excused', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('school_id', 'class_id', 'date'),
+    )
+    # School-wide trends scan by (school_id, date) regardless of class
+    op.create_index('ix_attendance_daily_rollup_school_date', 'attendance_daily_rollup', ['school_id', 'date'])
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendance_daily_rollup_school_date', table_name='attendance_daily_rollup')
+    op.drop_table('attendance_daily_rollup')
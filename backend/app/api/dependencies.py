@@ -1,52 +1,128 @@
-from typing import Optional
+from typing import Dict, Optional
+from collections import OrderedDict
+from uuid import UUID
 import jwt
 import base64
+import hashlib
 import logging
-import httpx
-from fastapi import Depends, HTTPException
+import time
+from fastapi import Depends, Header, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
+from app.core.timing import record
+from app.crud.versions import get_versions
+from app.db.session import read_session
+from app.services.jwks import jwks_manager
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
-# Simple in-memory JWKS cache (keyed by kid)
-_jwks_cache: dict = {}
+# Verified-claims cache: sha256(token) -> (claims, exp). Bounded LRU so the
+# parallel calls of one page load pay for a single signature check.
+_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
 
-def _get_jwks_key(kid: str):
-    """Fetch EC or RSA public key from Supabase JWKS endpoint, cached by kid."""
-    global _jwks_cache
-    if kid in _jwks_cache:
-        return _jwks_cache[kid]
+# HS secret candidates as (label, key). Narrowed to the working form once it
+# is known, so HS tokens are verified with a single decode.
+_hs_secrets: Optional[list] = None
+
+_DECODE_OPTS = {"verify_aud": False}
+
+def _hs_secret_candidates() -> list:
+    """Raw secret first, then the base64url-decoded form (if it decodes)."""
+    secret = settings.SUPABASE_JWT_SECRET
+    candidates = [("raw", secret)]
     try:
-        jwks_url = f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json"
-        resp = httpx.get(jwks_url, timeout=5.0)
-        resp.raise_for_status()
-        keys = resp.json().get("keys", [])
-        for key_data in keys:
-            key_id = key_data.get("kid", "")
-            kty = key_data.get("kty", "RSA")
-            if kty == "EC":
-                public_key = jwt.algorithms.ECAlgorithm.from_jwk(key_data)
-            else:
-                public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key_data)
-            _jwks_cache[key_id] = public_key
-            logger.info("Cached JWKS key: kid=%s kty=%s alg=%s", key_id, kty, key_data.get("alg"))
-        return _jwks_cache.get(kid)
-    except Exception as e:
-        logger.error("Failed to fetch JWKS from Supabase: %s", e)
+        candidates.append(("b64", base64.urlsafe_b64decode(secret + "==")))
+    except Exception:
+        pass
+    return candidates
+
+
+def _pin_hs_secret(label: str, key) -> None:
+    global _hs_secrets
+    if _hs_secrets is None or len(_hs_secrets) > 1:
+        logger.info("Using %s form of SUPABASE_JWT_SECRET for HS tokens", label)
+    _hs_secrets = [(label, key)]
+
+
+def init_hs_secret() -> Optional[str]:
+    """
+    Detect which form of SUPABASE_JWT_SECRET verifies HS tokens (called at startup).
+    The anon key (SUPABASE_KEY) is an HS256 JWT signed with the same secret, so it is
+    used as the probe. If it cannot decide, the form is pinned on the first valid token.
+    """
+    global _hs_secrets
+    _hs_secrets = _hs_secret_candidates()
+    probe = settings.SUPABASE_KEY
+    try:
+        alg = jwt.get_unverified_header(probe).get("alg", "")
+    except Exception:
+        return None
+    if alg not in ("HS256", "HS384", "HS512"):
+        return None
+    for label, key in _hs_secrets:
+        try:
+            jwt.decode(probe, key, algorithms=[alg], options={"verify_aud": False, "verify_exp": False})
+        except jwt.InvalidTokenError:
+            continue
+        _pin_hs_secret(label, key)
+        return label
+    return None
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cache_get(digest: str) -> Optional[dict]:
+    entry = _token_cache.get(digest)
+    if entry is None:
         return None
+    claims, exp = entry
+    if exp <= time.time():
+        del _token_cache[digest]
+        return None
+    _token_cache.move_to_end(digest)
+    return claims
+
+
+def _cache_put(digest: str, claims: dict) -> None:
+    exp = claims.get("exp")
+    # Tokens without an expiry are never cached: there is no point to evict them at.
+    if not isinstance(exp, (int, float)) or settings.AUTH_TOKEN_CACHE_SIZE <= 0:
+        return
+    _token_cache[digest] = (claims, exp)
+    _token_cache.move_to_end(digest)
+    while len(_token_cache) > settings.AUTH_TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
 
 
-def _decode_token(token: str) -> dict:
+def _decode_hs(token: str, alg: str) -> dict:
+    """Verify an HS token with SUPABASE_JWT_SECRET (raw or base64url-decoded)."""
+    candidates = _hs_secrets if _hs_secrets is not None else _hs_secret_candidates()
+    errors = []
+    for label, key in candidates:
+        try:
+            payload = jwt.decode(token, key, algorithms=[alg], options=_DECODE_OPTS)
+        except jwt.ExpiredSignatureError:
+            raise
+        except jwt.InvalidTokenError as e:
+            errors.append(f"{label}: {e}")
+            continue
+        if len(candidates) > 1:
+            _pin_hs_secret(label, key)
+        return payload
+    raise jwt.InvalidTokenError(f"HS decode failed: {'; '.join(errors)}")
+
+
+async def _decode_token(token: str) -> dict:
     """
     Decode a Supabase JWT.
     - Peeks at the header to detect the algorithm (HS256 or RS256).
     - HS256: verifies with SUPABASE_JWT_SECRET.
-    - RS256/RS384/RS512: fetches the public key from Supabase JWKS endpoint.
+    - RS/ES: looks up the public key in the async JWKS manager (no event-loop blocking).
     """
-    decode_opts = {"verify_aud": False}
-
     try:
         header = jwt.get_unverified_header(token)
     except Exception as e:
@@ -57,48 +133,43 @@ def _decode_token(token: str) -> dict:
 
     if alg in ("HS256", "HS384", "HS512"):
         # --- Symmetric: use JWT secret ---
-        secret = settings.SUPABASE_JWT_SECRET
-        errors = []
-        # Try raw secret
-        try:
-            return jwt.decode(token, secret, algorithms=[alg], options=decode_opts)
-        except jwt.ExpiredSignatureError:
-            raise
-        except jwt.InvalidTokenError as e:
-            errors.append(f"raw: {e}")
-        # Try base64url-decoded secret
-        try:
-            decoded_secret = base64.urlsafe_b64decode(secret + "==")
-            return jwt.decode(token, decoded_secret, algorithms=[alg], options=decode_opts)
-        except jwt.ExpiredSignatureError:
-            raise
-        except Exception as e:
-            errors.append(f"b64: {e}")
-        raise jwt.InvalidTokenError(f"HS decode failed: {'; '.join(errors)}")
+        return _decode_hs(token, alg)
 
     elif alg in ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512"):
         # --- Asymmetric: use EC or RSA public key from Supabase JWKS ---
         kid = header.get("kid", "")
-        public_key = _get_jwks_key(kid)
+        public_key = await jwks_manager.get_key(kid)
         if not public_key:
             raise jwt.InvalidTokenError(
                 f"Could not find public key for kid='{kid}' from Supabase JWKS. "
                 "Check that SUPABASE_URL is correct in backend/.env"
             )
-        return jwt.decode(token, public_key, algorithms=[alg], options=decode_opts)
+        return jwt.decode(token, public_key, algorithms=[alg], options=_DECODE_OPTS)
 
     else:
         raise jwt.InvalidTokenError(f"Unsupported JWT algorithm: {alg}")
 
 
-
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
     Verify Supabase JWT token and extract user information.
+    Verified claims are cached until the token's `exp`, keyed by the token digest.
     """
-    token = credentials.credentials
+    start = time.perf_counter()
+    try:
+        return await _verify_token(credentials.credentials)
+    finally:
+        record("auth", time.perf_counter() - start)
+
+
+async def _verify_token(token: str) -> dict:
+    digest = _token_digest(token)
+    cached = _cache_get(digest)
+    if cached is not None:
+        return cached
     try:
-        payload = _decode_token(token)
+        payload = await _decode_token(token)
+        _cache_put(digest, payload)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired — please log in again")
@@ -121,6 +192,56 @@ def get_current_tenant(current_user: dict = Depends(get_current_user)) -> str:
         raise HTTPException(status_code=403, detail="User does not belong to any tenant/school.")
     return school_id
 
+async def get_db_read(school_id: str = Depends(get_current_tenant)):
+    """
+    Session for read-only routes: round-robins over DATABASE_READ_URLS replicas.
+    Falls back to the primary when no replicas are configured or the tenant wrote recently.
+    """
+    async with read_session(school_id) as session:
+        yield session
+
+def _resource_etag(school_id: str, versions: Dict[str, int], request: Request) -> str:
+    """
+    Weak ETag for one tenant's view of a URL at the given resource versions. Weak
+    because the bytes depend on the negotiated Content-Encoding, and a 304 (which
+    CompressionMiddleware never touches) must carry the same ETag as the 200 did.
+    """
+    key = "|".join([settings.VERSION, school_id, request.url.path, request.url.query,
+                    *(f"{name}={version}" for name, version in sorted(versions.items()))])
+    return 'W/"%s"' % hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires."""
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+def conditional_get(*resources: str):
+    """
+    Dependency factory for GETs whose response only depends on the tenant's rows in
+    `resources` (table names, see app.models.tenant_versions). Returns the ETag for the
+    response, or answers 304 Not Modified when If-None-Match already has it, so an
+    unchanged refresh costs one primary-key lookup instead of the endpoint's queries.
+
+    Versions are read before the endpoint's data in the same session, so a concurrent
+    write can only pair an old ETag with newer data (one extra download), never the reverse.
+    """
+    async def etag_checker(
+        request: Request,
+        school_id: str = Depends(get_current_tenant),
+        db: AsyncSession = Depends(get_db_read),
+        if_none_match: Optional[str] = Header(None),
+    ) -> str:
+        try:
+            tenant_uuid = UUID(school_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid school ID format in token")
+        etag = _resource_etag(school_id, await get_versions(db, tenant_uuid, resources), request)
+        if if_none_match and _etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        return etag
+    return etag_checker
+
 def require_role(allowed_roles: list[str]):
     """
     Dependency factory to check if the current user has one of the allowed roles.
@@ -0,0 +1,26 @@
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(obj):
+    # Pydantic's JSON mode writes Decimal as a string; keep the wire format identical
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    The app's default response class. orjson encodes UUID, date, time and datetime
+    natively (same ISO formats as Pydantic), Decimal as a string, and non-string
+    dict keys such as UUIDs.
+
+    List endpoints return it directly with rows already shaped like their
+    response_model, which then only documents the schema: FastAPI skips
+    validating and re-encoding a returned Response.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
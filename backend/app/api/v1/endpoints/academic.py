@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional
 from uuid import UUID
 import io
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
@@ -6,9 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
 from app.api import dependencies
-from app.db.session import get_db
+from app.api.responses import FastJSONResponse
+from app.core.cache import response_cache
+from app.db.session import get_db, mark_write
 from app.schemas import academic as schemas
 from app.crud.academic import academic as crud_academic
+from app.crud import student as crud_student
 from app.models.academic import Curriculum
 
 router = APIRouter()
@@ -64,29 +67,45 @@ async def create_class(
 
 @router.get("/classes/matrix", response_model=List[schemas.ClassMatrixResponse])
 async def get_classes_matrix(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
-    _ = Depends(dependencies.require_role(["Admin"]))
+    _ = Depends(dependencies.require_role(["Admin"])),
+    etag: str = Depends(dependencies.conditional_get("classes", "teachers", "class_enrollments")),
 ):
     """
     Get the master matrix of all classes for the school manager.
     Includes teacher names and student enrollment counts.
     """
     tenant_uuid = validate_school_id(school_id)
-    return await crud_academic.get_classes_matrix(db, school_id=tenant_uuid)
+
+    async def build():
+        return FastJSONResponse(await crud_academic.get_classes_matrix(db, school_id=tenant_uuid))
+
+    response = await response_cache.fetch(
+        tenant_uuid, "classes_matrix", etag, ("classes", "teachers", "class_enrollments"), build
+    )
+    response.headers["ETag"] = etag
+    return response
 
 @router.get("/classes/teacher/{teacher_id}", response_model=List[schemas.ClassResponse])
 async def get_teacher_classes(
     teacher_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
-    _ = Depends(dependencies.require_role(["Admin", "Teacher"]))
+    _ = Depends(dependencies.require_role(["Admin", "Teacher"])),
+    etag: str = Depends(dependencies.conditional_get("classes")),
 ):
     tenant_uuid = validate_school_id(school_id)
-    return await crud_academic.get_classes_by_teacher(db, school_id=tenant_uuid, teacher_id=teacher_id)
+
+    async def build():
+        return FastJSONResponse(await crud_academic.get_classes_by_teacher(db, school_id=tenant_uuid, teacher_id=teacher_id))
+
+    response = await response_cache.fetch(tenant_uuid, "classes_by_teacher", etag, ("classes",), build)
+    response.headers["ETag"] = etag
+    return response
 
 # -- Enrollments --
-@router.post("/enrollments")
+@router.post("/enrollments", response_model=schemas.EnrollmentResult)
 async def enroll_students(
     enrollment_in: schemas.EnrollmentCreate,
     db: AsyncSession = Depends(get_db),
@@ -96,13 +115,55 @@ async def enroll_students(
     tenant_uuid = validate_school_id(school_id)
     if enrollment_in.school_id != tenant_uuid:
         raise HTTPException(status_code=403, detail="Cross-tenant request blocked")
-    await crud_academic.enroll_students(db, tenant_uuid, enrollment_in.class_id, enrollment_in.student_ids)
-    return {"status": "success", "message": f"Enrolled {len(enrollment_in.student_ids)} students"}
+    enrolled = await crud_academic.enroll_students(db, tenant_uuid, enrollment_in.class_id, enrollment_in.student_ids)
+    return {
+        "message": f"Enrolled {len(enrolled)} students",
+        "class_id": enrollment_in.class_id,
+        "enrolled": enrolled,
+    }
+
+@router.post("/enrollments/cohort", response_model=schemas.CohortEnrollmentResult)
+async def enroll_cohort(
+    cohort_in: schemas.CohortEnrollmentCreate,
+    db: AsyncSession = Depends(get_db),
+    school_id: str = Depends(dependencies.get_current_tenant),
+    _ = Depends(dependencies.require_role(["Admin"]))
+):
+    """Enroll a whole grade (or one section of it) into several classes in one transaction."""
+    tenant_uuid = validate_school_id(school_id)
+    if cohort_in.school_id != tenant_uuid:
+        raise HTTPException(status_code=403, detail="Cross-tenant request blocked")
+    enrolled = await crud_academic.enroll_cohort(
+        db, tenant_uuid, cohort_in.class_ids, grade=cohort_in.grade, section=cohort_in.section
+    )
+    total = sum(len(ids) for ids in enrolled.values())
+    return {"message": f"Created {total} enrollments in {len(enrolled)} classes", "enrolled": enrolled}
+
+@router.get("/enrollments", response_model=Dict[UUID, list])
+async def get_enrollment_map(
+    class_ids: Optional[str] = None,
+    compact: bool = True,
+    db: AsyncSession = Depends(dependencies.get_db_read),
+    school_id: str = Depends(dependencies.get_current_tenant),
+    _ = Depends(dependencies.require_role(["Admin", "Teacher"]))
+):
+    """
+    Map of class_id -> enrolled student IDs for comma-separated `class_ids`, or for
+    every class in the school when omitted. compact=false returns student profiles.
+    """
+    tenant_uuid = validate_school_id(school_id)
+    ids = None
+    if class_ids:
+        try:
+            ids = [UUID(c) for c in class_ids.split(",") if c.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid class ID in class_ids")
+    return await crud_academic.get_enrollment_map(db, school_id=tenant_uuid, class_ids=ids, compact=compact)
 
 @router.get("/enrollments/{class_id}")
 async def get_class_students(
     class_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
     _ = Depends(dependencies.require_role(["Admin", "Teacher"]))
 ):
@@ -172,7 +233,7 @@ async def upload_curriculum_file(
 @router.get("/curriculum/{class_id}")
 async def get_curriculum(
     class_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
     _ = Depends(dependencies.get_current_user),
 ):
@@ -211,6 +272,7 @@ async def delete_curriculum(
         Curriculum.class_id == class_id,
         Curriculum.school_id == tenant_uuid,
     ))
+    mark_write(db, tenant_uuid)
     await db.commit()
     return {"deleted": True, "class_id": str(class_id)}
 
@@ -240,4 +302,27 @@ async def submit_grade(
     tenant_uuid = validate_school_id(school_id)
     if grade_in.school_id != tenant_uuid:
         raise HTTPException(status_code=403, detail="Cross-tenant request blocked")
-    return await crud_academic.submit_grade(db, obj_in=grade_in)
+    if not await crud_academic.get_assessment(db, school_id=tenant_uuid, assessment_id=grade_in.assessment_id):
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    if not await crud_student.get_by_id(db, school_id=tenant_uuid, student_id=grade_in.student_id):
+        raise HTTPException(status_code=404, detail="Student not found")
+    grade = await crud_academic.submit_grade(db, obj_in=grade_in)
+    if grade is None:
+        raise HTTPException(status_code=409, detail="Grade belongs to another school")
+    return grade
+
+@router.post("/grades/bulk", response_model=schemas.GradeBulkResponse)
+async def submit_grades_bulk(
+    grades_in: schemas.GradeBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    school_id: str = Depends(dependencies.get_current_tenant),
+    _ = Depends(dependencies.require_role(["Admin", "Teacher"]))
+):
+    """Save all scores for one assessment in a single statement; invalid rows come back in `errors`."""
+    tenant_uuid = validate_school_id(school_id)
+    if grades_in.school_id != tenant_uuid:
+        raise HTTPException(status_code=403, detail="Cross-tenant request blocked")
+    assessment = await crud_academic.get_assessment(db, school_id=tenant_uuid, assessment_id=grades_in.assessment_id)
+    if not assessment:
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    return await crud_academic.submit_grades_bulk(db, tenant_uuid, assessment, grades_in.grades)
@@ -4,31 +4,29 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import dependencies
+from app.api.responses import FastJSONResponse
+from app.core.cache import response_cache
 from app.db.session import get_db
 from app.crud import new_modules as crud
-from app.schemas.new_modules import AnnouncementCreate, AnnouncementResponse
+from app.schemas.new_modules import AnnouncementCreate, AnnouncementResponse, AnnouncementRow
 
 router = APIRouter()
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=List[AnnouncementRow])
 async def list_announcements(
     audience: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
+    etag: str = Depends(dependencies.conditional_get("announcements")),
 ):
-    anns = await crud.get_announcements(db, UUID(school_id), audience)
-    return [
-        {
-            "id":         str(a.id),
-            "title":      a.title,
-            "body":       a.body,
-            "audience":   a.audience,
-            "priority":   a.priority,
-            "expires_at": str(a.expires_at) if a.expires_at else None,
-            "created_at": str(a.created_at),
-        }
-        for a in anns
-    ]
+    tenant_uuid = UUID(school_id)
+
+    async def build():
+        return FastJSONResponse(await crud.get_announcements(db, tenant_uuid, audience))
+
+    response = await response_cache.fetch(tenant_uuid, "announcements", etag, ("announcements",), build)
+    response.headers["ETag"] = etag
+    return response
 
 @router.post("/", response_model=dict, status_code=201)
 async def create_announcement(
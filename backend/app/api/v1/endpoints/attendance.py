@@ -1,45 +1,81 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date as date_type
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import dependencies
+from app.api.responses import FastJSONResponse
 from app.db.session import get_db
 from app.crud import new_modules as crud
+from app.core.terms import resolve_period
+from app.schemas.new_modules import AttendanceBulkCreate, AttendanceBulkResult, AttendanceRow
 
 router = APIRouter()
 
-@router.get("/{class_id}", response_model=List[dict])
+def _period(date_from: Optional[date_type], date_to: Optional[date_type], term: Optional[str]):
+    try:
+        return resolve_period(date_from, date_to, term)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/summary", response_model=Dict[UUID, dict])
+async def attendance_summaries(
+    class_id: Optional[UUID] = None,
+    grade: Optional[str] = None,
+    section: Optional[str] = None,
+    date_from: Optional[date_type] = Query(None, alias="from"),
+    date_to: Optional[date_type] = Query(None, alias="to"),
+    term: Optional[str] = None,
+    db: AsyncSession = Depends(dependencies.get_db_read),
+    school_id: str = Depends(dependencies.get_current_tenant),
+    _ = Depends(dependencies.require_role(["Admin", "Teacher"])),
+):
+    """Per-student attendance summaries for a class or a grade (optionally one section)."""
+    if class_id is None and grade is None:
+        raise HTTPException(status_code=400, detail="Provide class_id or grade")
+    date_from, date_to = _period(date_from, date_to, term)
+    return await crud.get_attendance_summaries(
+        db, UUID(school_id), class_id=class_id, grade=grade, section=section,
+        date_from=date_from, date_to=date_to,
+    )
+
+@router.get("/{class_id}", response_model=List[AttendanceRow])
 async def get_attendance(
     class_id: UUID,
-    date: str,
-    db: AsyncSession = Depends(get_db),
+    date: date_type,
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
 ):
-    return await crud.get_class_attendance(db, UUID(school_id), class_id, date)
+    return FastJSONResponse(await crud.get_class_attendance(db, UUID(school_id), class_id, date))
 
-@router.post("/bulk", response_model=dict, status_code=201)
+@router.post("/bulk", response_model=AttendanceBulkResult, status_code=201)
 async def submit_bulk_attendance(
     *,
     db: AsyncSession = Depends(get_db),
     school_id: str = Depends(dependencies.get_current_tenant),
-    body: dict,
+    body: AttendanceBulkCreate,
 ):
-    teacher_id = UUID(str(body["teacher_id"])) if body.get("teacher_id") else None
-    count = await crud.bulk_upsert_attendance(
+    tenant_uuid = UUID(school_id)
+    if body.school_id != tenant_uuid:
+        raise HTTPException(status_code=403, detail="Cross-tenant request blocked")
+    return await crud.bulk_upsert_attendance(
         db,
-        school_id=UUID(school_id),
-        class_id=UUID(str(body["class_id"])),
-        teacher_id=teacher_id,
-        date_str=body["date"],
-        records=body.get("records", []),
+        school_id=tenant_uuid,
+        class_id=body.class_id,
+        teacher_id=body.teacher_id,
+        day=body.date,
+        records=body.records,
     )
-    return {"saved": count}
 
 @router.get("/student/{student_id}/summary", response_model=dict)
 async def student_attendance_summary(
     student_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    date_from: Optional[date_type] = Query(None, alias="from"),
+    date_to: Optional[date_type] = Query(None, alias="to"),
+    term: Optional[str] = None,
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
 ):
-    return await crud.get_student_attendance_summary(db, UUID(school_id), student_id)
+    date_from, date_to = _period(date_from, date_to, term)
+    return await crud.get_student_attendance_summary(db, UUID(school_id), student_id, date_from, date_to)
@@ -4,31 +4,22 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import dependencies
+from app.api.responses import FastJSONResponse
 from app.db.session import get_db
 from app.crud import new_modules as crud
+from app.schemas.new_modules import CalendarEventRow
 
 router = APIRouter()
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=List[CalendarEventRow])
 async def list_events(
     year:  int,
     month: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
+    etag: str = Depends(dependencies.conditional_get("calendar_events")),
 ):
-    events = await crud.get_calendar_events(db, UUID(school_id), year, month)
-    return [
-        {
-            "id":          str(e.id),
-            "title":       e.title,
-            "description": e.description,
-            "event_type":  e.event_type,
-            "start_date":  str(e.start_date),
-            "end_date":    str(e.end_date),
-            "class_id":    str(e.class_id) if e.class_id else None,
-        }
-        for e in events
-    ]
+    return FastJSONResponse(await crud.get_calendar_events(db, UUID(school_id), year, month), headers={"ETag": etag})
 
 @router.post("/", response_model=dict, status_code=201)
 async def create_event(
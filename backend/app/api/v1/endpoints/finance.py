@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import dependencies
+from app.api.responses import FastJSONResponse
 from app.db.session import get_db
 from app.schemas.finance import FinancialRecordCreate, FinancialRecordUpdate, FinancialRecordResponse
 from app.crud import finance as crud_finance
@@ -12,27 +14,43 @@ router = APIRouter()
 
 @router.get("/", response_model=List[FinancialRecordResponse])
 async def read_records(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = None,
+    student_id: Optional[UUID] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
-    _ = Depends(dependencies.require_role(["Admin", "Accountant"]))
+    _ = Depends(dependencies.require_role(["Admin", "Accountant"])),
+    etag: str = Depends(dependencies.conditional_get("financial_records")),
 ):
     """
-    Retrieve all financial records for the current tenant's school.
+    Retrieve financial records for the current tenant's school, newest due date first.
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
+    Send the ETag back as If-None-Match to get 304 while no record changed.
     """
     try:
         tenant_uuid = UUID(school_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid school ID format")
-    
-    records = await crud_finance.financial_record.get_multi(db, school_id=tenant_uuid, skip=skip, limit=limit)
-    return records
+
+    try:
+        records, next_cursor = await crud_finance.financial_record.get_page(
+            db, school_id=tenant_uuid, cursor=cursor, limit=limit,
+            status=status, student_id=student_id, due_from=due_from, due_to=due_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(records, headers=headers)
 
 @router.get("/student/{student_id}", response_model=List[FinancialRecordResponse])
 async def read_student_records(
     student_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
     _ = Depends(dependencies.require_role(["Admin", "Accountant"]))
 ):
@@ -41,7 +59,7 @@ async def read_student_records(
     """
     tenant_uuid = UUID(school_id)
     records = await crud_finance.financial_record.get_by_student(db, school_id=tenant_uuid, student_id=student_id)
-    return records
+    return FastJSONResponse(records)
 
 @router.post("/", response_model=FinancialRecordResponse)
 async def create_record(
@@ -0,0 +1,23 @@
+import os
+from fastapi import APIRouter, Depends
+
+from app.api import dependencies
+from app.db.session import engine, read_engines, pool_stats
+from app.services.jwks import jwks_manager
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def worker_metrics(
+    _ = Depends(dependencies.require_role(["SuperAdmin"])),
+):
+    """
+    Per-worker runtime metrics (SuperAdmin only).
+    Each uvicorn worker keeps its own counters; `pid` identifies which one answered.
+    """
+    return {
+        "pid": os.getpid(),
+        "db_pool": pool_stats(engine),
+        "db_read_pools": [pool_stats(e) for e in read_engines],
+        "jwks": jwks_manager.stats(),
+    }
@@ -1,22 +1,25 @@
+from typing import List, Literal, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import dependencies
-from app.db.session import get_db
-from app.schemas.report import DashboardStats
+from app.core.terms import resolve_period
+from app.schemas.report import DashboardStats, AttendanceTrendPoint
 from app.crud.report import report as crud_report
 
 router = APIRouter()
 
 @router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
-    _ = Depends(dependencies.require_role(["Admin", "Accountant"]))
+    current_user: dict = Depends(dependencies.require_role(["Admin", "Accountant", "Teacher"]))
 ):
     """
     Retrieve aggregated dashboard statistics for the tenant school.
+    Teachers get the school overview without the financial figures.
     """
     try:
         tenant_uuid = UUID(school_id)
@@ -24,4 +27,36 @@ async def get_dashboard_summary(
         raise HTTPException(status_code=400, detail="Invalid school ID format")
     
     stats = await crud_report.get_dashboard_stats(db, school_id=tenant_uuid)
+    if current_user.get("user_metadata", {}).get("role") == "Teacher":
+        stats = stats.model_copy(update={
+            "total_revenue_expected": 0.0,
+            "total_revenue_collected": 0.0,
+            "outstanding_invoices_count": 0,
+            "amounts_by_status": {},
+        })
     return stats
+
+@router.get("/attendance", response_model=List[AttendanceTrendPoint])
+async def get_attendance_trend(
+    group_by: Literal["day", "month", "class"] = "day",
+    class_id: Optional[UUID] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    term: Optional[str] = None,
+    db: AsyncSession = Depends(dependencies.get_db_read),
+    school_id: str = Depends(dependencies.get_current_tenant),
+    _ = Depends(dependencies.require_role(["Admin", "Teacher"]))
+):
+    """
+    Attendance counts and absence rate per day, month or class, read from the daily rollup.
+    """
+    try:
+        tenant_uuid = UUID(school_id)
+        date_from, date_to = resolve_period(date_from, date_to, term)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await crud_report.get_attendance_trend(
+        db, school_id=tenant_uuid, group_by=group_by, class_id=class_id,
+        date_from=date_from, date_to=date_to,
+    )
@@ -5,9 +5,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import dependencies
+from app.api.responses import FastJSONResponse
+from app.core.cache import response_cache
 from app.db.session import get_db
 from app.crud import new_modules as crud
-from app.schemas.new_modules import ScheduleSlotCreate, ScheduleSlotResponse
+from app.schemas.new_modules import ScheduleSlotCreate, ScheduleSlotResponse, ScheduleSlotRow
 
 router = APIRouter()
 
@@ -19,12 +21,20 @@ PERIOD_TIMES = {
     7: ("12:15", "13:00"), 8: ("13:00", "13:45"),
 }
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=List[ScheduleSlotRow])
 async def get_schedule(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
+    etag: str = Depends(dependencies.conditional_get("schedule_slots", "classes", "teachers")),
 ):
-    return await crud.get_school_schedule(db, UUID(school_id))
+    tenant_uuid = UUID(school_id)
+
+    async def build():
+        return FastJSONResponse(await crud.get_school_schedule(db, tenant_uuid))
+
+    response = await response_cache.fetch(tenant_uuid, "schedule", etag, ("schedule_slots", "classes", "teachers"), build)
+    response.headers["ETag"] = etag
+    return response
 
 @router.post("/", response_model=dict, status_code=201)
 async def add_slot(
@@ -1,32 +1,72 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import dependencies
+from app.api.responses import FastJSONResponse
 from app.db.session import get_db
-from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
+from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse, StudentProfileResponse
 from app.crud import student as crud_student
 
 router = APIRouter()
 
 @router.get("/", response_model=List[StudentResponse])
 async def read_students(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    grade: Optional[str] = None,
+    section: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
+    etag: str = Depends(dependencies.conditional_get("students")),
 ):
     """
-    Retrieve students for the current tenant's school.
+    Retrieve students for the current tenant's school, ordered by name.
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
+    Send the ETag back as If-None-Match to get 304 while no student changed.
     """
     try:
         tenant_uuid = UUID(school_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid school ID format in token")
-    
-    students = await crud_student.get_multi(db, school_id=tenant_uuid, skip=skip, limit=limit)
-    return students
+
+    try:
+        students, next_cursor = await crud_student.get_page(
+            db, school_id=tenant_uuid, cursor=cursor, limit=limit,
+            grade=grade, section=section, name_prefix=name_prefix,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(students, headers=headers)
+
+@router.get("/{student_id}/profile", response_model=StudentProfileResponse)
+async def read_student_profile(
+    student_id: UUID,
+    db: AsyncSession = Depends(dependencies.get_db_read),
+    school_id: str = Depends(dependencies.get_current_tenant),
+    current_user: dict = Depends(dependencies.require_role(["Admin", "Accountant", "Teacher"]))
+):
+    """
+    Student with attendance summary, financial records and balance, enrolled classes
+    and recent grades. Teachers get the profile without the financial records.
+    """
+    try:
+        tenant_uuid = UUID(school_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid school ID format in token")
+
+    include_finance = current_user.get("user_metadata", {}).get("role") != "Teacher"
+    profile = await crud_student.get_profile(
+        db, school_id=tenant_uuid, student_id=student_id, include_finance=include_finance
+    )
+    if not profile:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return profile
 
 @router.post("/", response_model=StudentResponse)
 async def create_student(
@@ -1,11 +1,13 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import secrets, string
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.api import dependencies
+from app.api.responses import FastJSONResponse
+from app.core.cache import response_cache
 from app.db.session import get_db
 from app.schemas.teacher import TeacherCreate, TeacherUpdate, TeacherResponse
 from app.crud import teacher as crud_teacher
@@ -30,23 +32,33 @@ def _random_password(length: int = 12) -> str:
 
 @router.get("/", response_model=List[TeacherResponse])
 async def read_teachers(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
+    etag: str = Depends(dependencies.conditional_get("teachers")),
 ):
     try:
         tenant_uuid = UUID(school_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid school ID format in token")
-    teachers = await crud_teacher.get_multi(db, school_id=tenant_uuid, skip=skip, limit=limit)
-    return teachers
+
+    async def build():
+        try:
+            teachers, next_cursor = await crud_teacher.get_page(db, school_id=tenant_uuid, cursor=cursor, limit=limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return FastJSONResponse(teachers, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+    response = await response_cache.fetch(tenant_uuid, "teachers", etag, ("teachers",), build)
+    response.headers["ETag"] = etag
+    return response
 
 
 @router.get("/{teacher_id}", response_model=TeacherResponse)
 async def read_teacher(
     teacher_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(dependencies.get_db_read),
     school_id: str = Depends(dependencies.get_current_tenant),
 ):
     tenant_uuid = UUID(school_id)
@@ -2,7 +2,7 @@ from fastapi import APIRouter
 from app.api.v1.endpoints import (
     auth, students, teachers, finance, reports,
     webhooks, academic, manager_ai, teacher_tools, admin_tools, students_bulk,
-    schedule, attendance, announcements, calendar,
+    schedule, attendance, announcements, calendar, internal,
 )
 
 api_router = APIRouter()
@@ -21,4 +21,4 @@ api_router.include_router(schedule.router,       prefix="/schedule",      tags=[
 api_router.include_router(attendance.router,     prefix="/attendance",    tags=["attendance"])
 api_router.include_router(announcements.router,  prefix="/announcements", tags=["announcements"])
 api_router.include_router(calendar.router,       prefix="/calendar",      tags=["calendar"])
-
+api_router.include_router(internal.router,       prefix="/internal",      tags=["internal"])
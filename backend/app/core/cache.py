@@ -0,0 +1,219 @@
+"""
+Read-through cache of rendered responses for tenant reference data.
+
+Entries are response bodies, already serialized, plus headers such as X-Next-Cursor.
+Each entry is keyed by school, a read name and its variant. The variant is the ETag
+from app.api.dependencies.conditional_get, which hashes the URL with the tenant_versions
+the request read in its own session. A body is therefore only ever served for the
+versions it was rendered at, and so with the ETag that goes with it, whichever worker,
+replica or moment it came from.
+
+The key also carries a generation of every table the read depends on. A CRUD write
+bumps the generations of the tables it changed (`invalidate`), and other workers'
+writes arrive through the LISTEN/NOTIFY bus in app.services.invalidation. This only
+retires superseded entries early; they would otherwise age out through the TTL or
+LRU eviction, since nobody asks for an old ETag's key once the versions have moved.
+
+Backends:
+- "local": per-worker LRU with a byte budget.
+- "redis": shared by every worker. It needs the `redis` package and CACHE_REDIS_URL.
+
+Every table a cached read depends on must have tenant_versions triggers, or its writes
+would never change the ETag and the cached body would be served until the TTL. Startup
+loads the triggered tables (`versioned_tables`), and reads of any other table are not cached.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import AbstractSet, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.metrics import prometheus_family, prometheus_labels
+
+logger = logging.getLogger(__name__)
+
+# Response headers that belong to the content and are worth caching with it
+CACHED_HEADERS = ("x-next-cursor",)
+
+Entry = Tuple[bytes, Dict[str, str]]  # (body, headers)
+
+
+class LocalBackend:
+    """In-process LRU with TTL, bounded by the total size of the cached bodies."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[Entry, float]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    async def generations(self, keys: Sequence[str]) -> List[int]:
+        return [self._generations.get(key, 0) for key in keys]
+
+    async def bump(self, keys: Sequence[str]) -> None:
+        self.bump_now(keys)
+
+    def bump_now(self, keys: Sequence[str]) -> None:
+        for key in keys:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    async def get(self, key: str) -> Optional[Entry]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        entry, expires = item
+        if expires < time.monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: Entry, ttl: float) -> None:
+        if len(entry[0]) > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = (entry, time.monotonic() + ttl)
+        self.size += len(entry[0])
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.size -= len(item[0][0])
+
+
+class RedisBackend:
+    """Shared backend: generations are INCR counters, entries are values with an expiry."""
+
+    def __init__(self, url: str, prefix: str = "rc:"):
+        import redis.asyncio as redis  # optional dependency, only needed for CACHE_BACKEND=redis
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def generations(self, keys: Sequence[str]) -> List[int]:
+        values = await self.client.mget([self.prefix + "gen:" + key for key in keys])
+        return [int(v) if v is not None else 0 for v in values]
+
+    async def bump(self, keys: Sequence[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(self.prefix + "gen:" + key)
+            await pipe.execute()
+
+    async def get(self, key: str) -> Optional[Entry]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        # orjson escapes newlines inside strings, so the first one ends the headers
+        headers, _, body = value.partition(b"\n")
+        return body, orjson.loads(headers)
+
+    async def set(self, key: str, entry: Entry, ttl: float) -> None:
+        body, headers = entry
+        await self.client.set(self.prefix + key, orjson.dumps(headers) + b"\n" + body, px=int(ttl * 1000))
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        # Tables with tenant_versions triggers, set at startup; None until checked
+        self.versioned_tables: Optional[AbstractSet[str]] = None
+        self._refused: Set[str] = set()
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        if settings.CACHE_BACKEND == "redis":
+            backend = RedisBackend(settings.CACHE_REDIS_URL)
+        else:
+            backend = LocalBackend(settings.CACHE_MAX_BYTES)
+        return cls(backend, settings.CACHE_TTL_SECONDS, settings.CACHE_ENABLED and settings.CACHE_TTL_SECONDS > 0)
+
+    async def fetch(self, school_id, name: str, variant: str, tables: Sequence[str],
+                    build: Callable[[], Awaitable[Response]]) -> Response:
+        """
+        Cached copy of the response `build()` makes for this school's `name` read,
+        or build it and cache the body. Only 200 responses are cached.
+        `variant` must be the request's ETag from conditional_get over `tables`,
+        which are the tables the response is read from; reads of a table
+        without tenant_versions triggers are never cached.
+        """
+        if not self.enabled:
+            return await build()
+        if self.versioned_tables is not None and not self.versioned_tables.issuperset(tables):
+            if name not in self._refused:
+                self._refused.add(name)
+                logger.error("Not caching %s: no tenant_versions triggers on %s", name,
+                             ", ".join(sorted(set(tables) - set(self.versioned_tables))))
+            return await build()
+        try:
+            generations = await self.backend.generations([f"{school_id}:{table}" for table in tables])
+            key = f"{school_id}:{name}:{variant}:{'.'.join(map(str, generations))}"
+            entry = await self.backend.get(key)
+        except Exception as e:
+            # A shared backend being down costs a database read, not an error
+            logger.warning("Response cache unavailable for %s: %s", name, e)
+            return await build()
+        if entry is not None:
+            self.hits[name] = self.hits.get(name, 0) + 1
+            body, headers = entry
+            return Response(body, headers=headers, media_type="application/json")
+
+        self.misses[name] = self.misses.get(name, 0) + 1
+        response = await build()
+        if response.status_code == 200:
+            headers = {k: v for k, v in response.headers.items() if k in CACHED_HEADERS}
+            try:
+                await self.backend.set(key, (bytes(response.body), headers), self.ttl)
+            except Exception as e:
+                logger.warning("Could not cache %s: %s", name, e)
+        return response
+
+    async def invalidate(self, school_id, *tables: str) -> None:
+        """Drop every cached read of this school that depends on one of `tables`. Call after commit."""
+        if not self.enabled:
+            return
+        try:
+            await self.backend.bump([f"{school_id}:{table}" for table in tables])
+        except Exception as e:
+            # The write is already committed; readers see it once the TTL runs out
+            logger.error("Could not invalidate cached %s for school %s: %s", ", ".join(tables), school_id, e)
+
+    # -- Cross-worker coherence (app.services.invalidation) --
+    @property
+    def needs_notifications(self) -> bool:
+        """Only a per-worker backend misses other workers' writes."""
+        return self.enabled and isinstance(self.backend, LocalBackend)
+
+    def on_notification(self, school_id, resource: str, version: int) -> None:
+        """A write committed elsewhere: invalidate this worker's reads of `resource` for the school."""
+        self.backend.bump_now([f"{school_id}:{resource}"])
+
+    def on_reconnect(self) -> None:
+        """Invalidations may have been missed while nobody listened: start over."""
+        self.backend.clear()
+
+    def prometheus(self) -> List[str]:
+        lines = prometheus_family(
+            "response_cache_hits_total", "counter", "Reads answered from the response cache.",
+            [f"response_cache_hits_total{{{prometheus_labels(read=name)}}} {n}" for name, n in sorted(self.hits.items())],
+        )
+        lines += prometheus_family(
+            "response_cache_misses_total", "counter", "Reads that went to the database and filled the cache.",
+            [f"response_cache_misses_total{{{prometheus_labels(read=name)}}} {n}" for name, n in sorted(self.misses.items())],
+        )
+        return lines
+
+
+response_cache = ResponseCache.from_settings()
@@ -0,0 +1,190 @@
+"""
+Response compression negotiated from Accept-Encoding: brotli, zstd and gzip.
+
+CompressionMiddleware picks the first encoding in the server's preference order that
+the client accepts with the highest q-value. It compresses text-like responses (JSON,
+text/*, XML, CSV) that are at least `minimum_size` bytes. A response that arrives in
+one body message is compressed in one go and keeps an exact Content-Length. A
+streamed response (more_body) is compressed as it streams. Each chunk is flushed so
+the client can decode it straight away, and Content-Length is dropped.
+
+brotli and zstd need the `brotli` and `zstandard` packages. When one is not
+installed its encoding is skipped, and gzip (zlib) is always available.
+"""
+import zlib
+from typing import Callable, Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: "br" is not offered without it
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: "zstd" is not offered without it
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "text/")
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._c = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+def available_encoders() -> Dict[str, Callable]:
+    """Content-Encoding name -> encoder class, for the codecs installed here."""
+    encoders = {"gzip": _GzipEncoder}
+    if brotli is not None:
+        encoders["br"] = _BrotliEncoder
+    if zstandard is not None:
+        encoders["zstd"] = _ZstdEncoder
+    return encoders
+
+
+def negotiate(accept_encoding: str, offered: Sequence[str]) -> Optional[str]:
+    """The offered encoding (in server preference order) the client accepts with the highest q-value."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in offered:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware, like TimingMiddleware."""
+
+    def __init__(self, app, minimum_size: int = 1024, encodings: Sequence[str] = ("br", "zstd", "gzip"),
+                 levels: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        installed = available_encoders()
+        # Server preference order, limited to the codecs that are installed
+        self.encoders = {name: installed[name] for name in encodings if name in installed}
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = message["status"] in (204, 304) or not compressible(Headers(raw=message["headers"]))
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                # First body message: decide between identity, one-shot and streaming
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = self.encoders[encoding](self.levels[encoding])
+                headers = MutableHeaders(scope=start_message)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The compressed bytes differ from the identity representation. A 304
+                    # passes through untouched, so conditional_get's ETags are weak from the start
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    compressed = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+            if more_body:
+                chunk = encoder.compress(body) + encoder.flush()
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": encoder.compress(body) + encoder.finish()})
+
+        await self.app(scope, receive, send_compressed)
@@ -23,12 +23,63 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str = ""
     SUPABASE_SERVICE_ROLE_KEY: str = ""
     SUPABASE_JWT_SECRET: str = ""
+
+    # Auth Settings
+    AUTH_TOKEN_CACHE_SIZE: int = 2048  # verified tokens kept in memory per worker (0 disables)
+    SUPABASE_JWKS_URL: str = ""        # defaults to {SUPABASE_URL}/auth/v1/.well-known/jwks.json
+    JWKS_REFRESH_SECONDS: float = 600.0
+    JWKS_MISS_TTL_SECONDS: float = 30.0
+    JWKS_MIN_REFRESH_SECONDS: float = 30.0  # between fetches triggered by unknown kids
+    JWKS_TIMEOUT_SECONDS: float = 5.0
     
+    # Academic calendar: term "YYYY-1" runs from TERM1_START_MONTH of YYYY, "YYYY-2" from
+    # TERM2_START_MONTH of YYYY+1 until the next academic year starts
+    TERM1_START_MONTH: int = 9
+    TERM2_START_MONTH: int = 2
+    ATTENDANCE_PARTITION_YEARS_AHEAD: int = 1  # yearly attendance_records partitions created at startup
+
+    # Observability
+    METRICS_ENABLED: bool = True        # request timing middleware and the Prometheus /metrics endpoint
+    METRICS_TOKEN: str = ""             # /metrics requires "Authorization: Bearer <token>"; unset = not served
+    SERVER_TIMING_HEADER: bool = True   # add Server-Timing (auth, db, serialize, total) to responses
+    ACCESS_LOG: bool = False            # "app.access" line per request with query count and DB time
+    SQL_REPEAT_WARN_THRESHOLD: int = 0  # dev: warn when a request runs one statement more than N times (0 = off)
+
+    # Response compression (Accept-Encoding)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024              # bytes; smaller one-shot responses are sent uncompressed
+    COMPRESSION_ENCODINGS: str = "br,zstd,gzip"   # server preference; br/zstd are skipped if not installed
+    COMPRESSION_GZIP_LEVEL: int = 6               # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4           # 0-11; above ~6 costs more CPU than it saves bytes on JSON
+    COMPRESSION_ZSTD_LEVEL: int = 3               # 1-22
+
+    # Response cache for tenant reference data (teachers, classes, schedule, announcements)
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "local"         # "local" (per-worker LRU) or "redis" (shared; needs the redis package)
+    CACHE_REDIS_URL: str = ""
+    CACHE_TTL_SECONDS: float = 60.0      # entries are keyed by ETag, so this only bounds memory held by old ones
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # local backend: total size of cached bodies per worker
+    CACHE_NOTIFY_ENABLED: bool = True    # local backend: LISTEN for other workers' writes to retire entries early
+    CACHE_NOTIFY_URL: str = ""           # direct/session-mode URL for LISTEN; defaults to DATABASE_URL
+    CACHE_NOTIFY_PING_SECONDS: float = 30.0
+
     # AI Settings
     OPENAI_API_KEY: str = ""
     
     # DB Settings
     DATABASE_URL: str = ""
+    DATABASE_READ_URLS: str = ""        # comma-separated read replicas; empty = read from primary
+    # After a tenant writes, its reads stay on the primary: on the worker that wrote, and on
+    # any worker for clients that send back the signed read_pin cookie or X-Read-Pin header.
+    # Other clients of the tenant, and clients that drop both, can read a lagging replica.
+    DATABASE_READ_PIN_SECONDS: float = 5.0
+    DATABASE_READ_PIN_SECRET: str = ""  # signs read pins; defaults to one derived from SUPABASE_JWT_SECRET
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0       # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800         # seconds; recycle before server/pooler idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # set to 0 behind pgbouncer in transaction mode
 
     class Config:
         case_sensitive = True
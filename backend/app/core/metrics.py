@@ -0,0 +1,53 @@
+import bisect
+from typing import List, Sequence
+
+# Seconds. Covers an idle pool (sub-millisecond) up to the default pool timeout.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative, Prometheus-style) kept in process memory."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {"count": self.count, "sum": round(self.sum, 6), "buckets": cumulative}
+
+    def prometheus(self, name: str, labels: str = "") -> List[str]:
+        """`name_bucket`/`name_sum`/`name_count` sample lines; `labels` as built by prometheus_labels()."""
+        sep = "," if labels else ""
+        lines, running = [], 0
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {running}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        braces = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{braces} {self.sum:.6f}")
+        lines.append(f"{name}_count{braces} {self.count}")
+        return lines
+
+
+def prometheus_labels(**labels) -> str:
+    """Render label pairs for the Prometheus text format, escaping values."""
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+def prometheus_family(name: str, kind: str, help_text: str, samples: List[str]) -> List[str]:
+    """A metric family: HELP and TYPE comments followed by its sample lines."""
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *samples]
@@ -0,0 +1,117 @@
+"""
+Read-your-writes across workers for clients of the read replicas.
+
+A worker only knows about the writes it committed itself (app.db.session keeps them per
+worker), so a client whose next GET lands on another worker could still read a lagging
+replica. After a request commits a write, ReadPinMiddleware hands the client a signed,
+short-lived pin ("school_id.expires.signature") as a `read_pin` cookie and an
+X-Read-Pin header. While a request carries a valid pin for its tenant, in the cookie
+or echoed in the header, read_session keeps it on the primary, whichever worker it reaches.
+
+Clients that keep neither (for instance server-side fetches that drop cookies) only
+get the per-worker pinning.
+"""
+import hashlib
+import hmac
+import math
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+
+from app.core.config import settings
+
+COOKIE_NAME = "read_pin"
+HEADER_NAME = "X-Read-Pin"
+
+
+class ReadPin:
+    """What one request knows about read-your-writes: the client's pin and its own writes."""
+
+    __slots__ = ("school_id", "expires", "wrote")
+
+    def __init__(self, school_id: Optional[str] = None, expires: float = 0.0):
+        self.school_id = school_id
+        self.expires = expires
+        self.wrote: Optional[str] = None  # school the request committed a write for
+
+
+_current: ContextVar[Optional[ReadPin]] = ContextVar("read_pin", default=None)
+
+
+def _secret() -> bytes:
+    secret = settings.DATABASE_READ_PIN_SECRET or settings.SUPABASE_JWT_SECRET
+    return hashlib.sha256(b"read-pin:" + secret.encode()).digest()
+
+
+def _sign(payload: str) -> str:
+    return hmac.new(_secret(), payload.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def issue(school_id: str, expires: float) -> str:
+    payload = f"{school_id}.{int(math.ceil(expires))}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify(value: str) -> Optional[ReadPin]:
+    """The pin in `value`, or None if it is malformed, forged or expired."""
+    try:
+        school_id, expires, signature = value.rsplit(".", 2)
+        expires_at = float(int(expires))
+    except ValueError:
+        return None
+    if not hmac.compare_digest(signature, _sign(f"{school_id}.{expires}")) or expires_at <= time.time():
+        return None
+    return ReadPin(school_id, expires_at)
+
+
+def note_write(school_id: str) -> None:
+    """Called on commit: the response of the current request will carry a pin for the school."""
+    pin = _current.get()
+    if pin is not None:
+        pin.wrote = school_id
+
+
+def client_pinned(school_id: str) -> bool:
+    """The current request holds a valid pin for this school."""
+    pin = _current.get()
+    return pin is not None and pin.school_id == str(school_id) and pin.expires > time.time()
+
+
+class ReadPinMiddleware:
+    """Pure ASGI middleware: reads the client's pin and hands out a new one after writes."""
+
+    def __init__(self, app, pin_seconds: float):
+        self.app = app
+        self.pin_seconds = pin_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        pin = self._read(Headers(scope=scope)) or ReadPin()
+        token = _current.set(pin)
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and pin.wrote is not None:
+                value = issue(pin.wrote, time.time() + self.pin_seconds)
+                headers = MutableHeaders(scope=message)
+                headers.append("Set-Cookie", f"{COOKIE_NAME}={value}; Max-Age={int(math.ceil(self.pin_seconds))}; "
+                                             f"Path=/; HttpOnly; SameSite=Lax")
+                headers.append(HEADER_NAME, value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _current.reset(token)
+
+    @staticmethod
+    def _read(headers: Headers) -> Optional[ReadPin]:
+        value = headers.get(HEADER_NAME)
+        if value is None and "cookie" in headers:
+            value = cookie_parser(headers["cookie"]).get(COOKIE_NAME)
+        return verify(value) if value else None
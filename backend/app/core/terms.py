@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+
+def term_bounds(term: str) -> Tuple[date, date]:
+    """
+    Inclusive (first_day, last_day) of an academic term written "YYYY-N", where YYYY
+    is the year the academic year starts and N is 1 or 2. Raises ValueError otherwise.
+    """
+    try:
+        year_str, number = term.split("-")
+        year = int(year_str)
+    except ValueError:
+        raise ValueError(f"Invalid term '{term}', expected YYYY-1 or YYYY-2")
+    term1 = date(year, settings.TERM1_START_MONTH, 1)
+    term2 = date(year + 1, settings.TERM2_START_MONTH, 1)
+    next_year = date(year + 1, settings.TERM1_START_MONTH, 1)
+    if number == "1":
+        return term1, term2 - timedelta(days=1)
+    if number == "2":
+        return term2, next_year - timedelta(days=1)
+    raise ValueError(f"Invalid term '{term}', expected YYYY-1 or YYYY-2")
+
+
+def resolve_period(
+    date_from: Optional[date], date_to: Optional[date], term: Optional[str]
+) -> Tuple[Optional[date], Optional[date]]:
+    """Combine explicit from/to bounds with a term; explicit bounds narrow the term."""
+    if term:
+        start, end = term_bounds(term)
+        date_from = max(date_from, start) if date_from else start
+        date_to = min(date_to, end) if date_to else end
+    if date_from and date_to and date_from > date_to:
+        raise ValueError("'from' must not be after 'to'")
+    return date_from, date_to
@@ -0,0 +1,291 @@
+"""
+Per-request timing: a Server-Timing header and per-route Prometheus metrics.
+
+TimingMiddleware keeps a RequestTiming in a context variable for each HTTP request.
+The auth dependency, the SQLAlchemy cursor hooks (instrument_engine) and the route
+wrappers (instrument_routes) add to it; when the response starts the middleware
+writes the Server-Timing header, and when it finishes it records the request in
+`request_metrics` under the route template (e.g. /api/v1/students/{student_id}/profile),
+optionally logs an access line with the query count and DB time, and warns about
+statements repeated more than `repeat_threshold` times (likely N+1 loops).
+
+Everything is in-process and per worker, like the pool metrics in app.db.session.
+"""
+import asyncio
+import functools
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+
+from app.core.metrics import Histogram, prometheus_family, prometheus_labels
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("app.access")
+
+UNMATCHED_ROUTE = "<unmatched>"
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+# Bind-parameter lists ("$1, $2, $3" from expanding IN) collapse so their length doesn't change the shape
+_PARAM_LIST = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestTiming:
+    """Where the time of one request went, in seconds."""
+
+    __slots__ = ("start", "route", "auth", "db", "queries", "statements", "endpoint_done", "response_start")
+
+    def __init__(self, track_statements: bool = False):
+        self.start = time.perf_counter()
+        self.route: Optional[str] = None
+        self.auth = 0.0
+        self.db = 0.0
+        self.queries = 0
+        # SQL text -> executions, only kept when repeated statements are being checked
+        self.statements: Optional[Counter] = Counter() if track_statements else None
+        self.endpoint_done: Optional[float] = None
+        self.response_start: Optional[float] = None
+
+    @property
+    def serialize(self) -> float:
+        """Endpoint return to response start: response-model validation, encoding, rendering."""
+        if self.endpoint_done is None or self.response_start is None:
+            return 0.0
+        return self.response_start - self.endpoint_done
+
+    def server_timing(self) -> str:
+        total = (self.response_start or time.perf_counter()) - self.start
+        return (f"auth;dur={self.auth * 1000:.1f}, db;dur={self.db * 1000:.1f};desc=\"{self.queries} queries\", "
+                f"serialize;dur={self.serialize * 1000:.1f}, total;dur={total * 1000:.1f}")
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """The RequestTiming of the request being handled, or None outside a request."""
+    return _current.get()
+
+
+class RequestMetrics:
+    """Per-worker request counters and histograms keyed by (method, route template)."""
+
+    def __init__(self):
+        self.latency: Dict[tuple, Histogram] = defaultdict(Histogram)
+        self.db_time: Dict[tuple, Histogram] = defaultdict(Histogram)
+        self.queries: Dict[tuple, Histogram] = defaultdict(functools.partial(Histogram, QUERY_COUNT_BUCKETS))
+        self.repeated: Dict[tuple, int] = defaultdict(int)  # requests flagged for repeated statements
+        self.responses: Dict[tuple, int] = defaultdict(int)  # (method, route, status) -> count
+        self.in_flight: Dict[tuple, int] = defaultdict(int)
+
+    def observe(self, method: str, route: str, status: int, timing: RequestTiming) -> None:
+        key = (method, route)
+        self.latency[key].observe(time.perf_counter() - timing.start)
+        self.db_time[key].observe(timing.db)
+        self.queries[key].observe(timing.queries)
+        self.responses[(method, route, status)] += 1
+
+    def prometheus(self) -> List[str]:
+        def labels(key) -> str:
+            return prometheus_labels(method=key[0], route=key[1])
+
+        lines = prometheus_family(
+            "http_requests_total", "counter", "Responses by method, route template and status.",
+            [f"http_requests_total{{{prometheus_labels(method=m, route=r, status=s)}}} {n}"
+             for (m, r, s), n in sorted(self.responses.items())],
+        )
+        lines += prometheus_family(
+            "http_requests_in_flight", "gauge", "Requests currently being handled.",
+            [f"http_requests_in_flight{{{labels(key)}}} {n}" for key, n in sorted(self.in_flight.items())],
+        )
+        lines += prometheus_family(
+            "http_request_duration_seconds", "histogram", "Time from request start to the last body byte.",
+            [line for key, h in sorted(self.latency.items())
+             for line in h.prometheus("http_request_duration_seconds", labels(key))],
+        )
+        lines += prometheus_family(
+            "http_request_db_seconds", "histogram", "Time spent executing SQL per request.",
+            [line for key, h in sorted(self.db_time.items())
+             for line in h.prometheus("http_request_db_seconds", labels(key))],
+        )
+        lines += prometheus_family(
+            "http_request_queries", "histogram", "SQL statements executed per request.",
+            [line for key, h in sorted(self.queries.items())
+             for line in h.prometheus("http_request_queries", labels(key))],
+        )
+        lines += prometheus_family(
+            "http_requests_repeated_statements_total", "counter",
+            "Requests that ran one statement more often than the repeat threshold (likely N+1).",
+            [f"http_requests_repeated_statements_total{{{labels(key)}}} {n}"
+             for key, n in sorted(self.repeated.items())],
+        )
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware (no extra task per request, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app, server_timing: bool = True, access_log: bool = False, repeat_threshold: int = 0):
+        self.app = app
+        self.server_timing = server_timing
+        self.access_log = access_log
+        self.repeat_threshold = repeat_threshold  # 0 disables the repeated-statement check
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(track_statements=self.repeat_threshold > 0)
+        token = _current.set(timing)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing.response_start = time.perf_counter()
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", timing.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = timing.route or UNMATCHED_ROUTE
+            request_metrics.observe(scope["method"], route, status, timing)
+            if timing.statements is not None:
+                self._check_repeats(scope["method"], route, timing.statements)
+            if self.access_log:
+                access_logger.info(
+                    "%s %s %d %.1fms queries=%d db=%.1fms",
+                    scope["method"], scope["path"], status, (time.perf_counter() - timing.start) * 1000,
+                    timing.queries, timing.db * 1000,
+                )
+
+    def _check_repeats(self, method: str, route: str, statements: Counter) -> None:
+        shapes = Counter()
+        for statement, n in statements.items():
+            shapes[_WHITESPACE.sub(" ", _PARAM_LIST.sub("?", statement)).strip()] += n
+        repeated = [(shape, n) for shape, n in shapes.items() if n > self.repeat_threshold]
+        if not repeated:
+            return
+        request_metrics.repeated[(method, route)] += 1
+        for shape, n in repeated:
+            logger.warning("%s %s ran the same statement %d times (likely N+1): %.300s", method, route, n, shape)
+
+
+def record(phase: str, seconds: float) -> None:
+    """Add time to a phase (e.g. "auth") of the current request, if there is one."""
+    timing = _current.get()
+    if timing is not None:
+        setattr(timing, phase, getattr(timing, phase) + seconds)
+
+
+def _track_route(app, template: str):
+    async def tracked(scope, receive, send):
+        timing = _current.get()
+        if timing is None:
+            await app(scope, receive, send)
+            return
+        timing.route = template
+        key = (scope["method"], template)
+        request_metrics.in_flight[key] += 1
+        try:
+            await app(scope, receive, send)
+        finally:
+            request_metrics.in_flight[key] -= 1
+    return tracked
+
+
+def _stamp_endpoint_done(call):
+    def stamp():
+        timing = _current.get()
+        if timing is not None:
+            timing.endpoint_done = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def timed(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                stamp()
+    else:
+        @functools.wraps(call)
+        def timed(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                stamp()
+    return timed
+
+
+def instrument_routes(app: FastAPI) -> None:
+    """
+    Label requests with their route template and mark when each endpoint returns.
+    Call once after every route is registered.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.app = _track_route(route.app, route.path_format)
+            # The request handler calls dependant.call, and chose await vs threadpool
+            # from the original function, so the wrapper keeps the same kind.
+            route.dependant.call = _stamp_endpoint_done(route.dependant.call)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _current.get()
+    start = getattr(context, "_timing_start", None)
+    if timing is None or start is None:
+        return
+    timing.db += time.perf_counter() - start
+    timing.queries += 1
+    if timing.statements is not None:
+        timing.statements[statement] += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count SQL statements and their time towards the current request (contextvars follow SQLAlchemy's greenlets)."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def render_prometheus(pools: Dict[str, AsyncEngine]) -> str:
+    """Request metrics plus connection pool metrics for each engine, keyed by a pool label."""
+    lines = request_metrics.prometheus()
+    stats = {name: engine.sync_engine.pool for name, engine in pools.items()}
+    gauges = [
+        ("db_pool_checked_out", "Connections currently checked out.", lambda p: p.checkedout()),
+        ("db_pool_waiting", "Callers waiting for a connection.", lambda p: p.metrics.waiting),
+        ("db_pool_checkouts_total", "Connection checkouts.", lambda p: p.metrics.checkouts),
+        ("db_pool_timeouts_total", "Checkouts that timed out.", lambda p: p.metrics.timeouts),
+    ]
+    for name, help_text, value in gauges:
+        kind = "counter" if name.endswith("_total") else "gauge"
+        lines += prometheus_family(name, kind, help_text, [
+            f"{name}{{{prometheus_labels(pool=label)}}} {value(pool)}" for label, pool in stats.items()
+        ])
+    lines += prometheus_family(
+        "db_pool_checkout_seconds", "histogram", "Time to check out a connection (including pre-ping).",
+        [line for label, pool in stats.items()
+         for line in pool.metrics.checkout_latency.prometheus("db_pool_checkout_seconds", prometheus_labels(pool=label))],
+    )
+    return "\n".join(lines) + "\n"
@@ -1,13 +1,17 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, bindparam, literal, literal_column, true, Numeric, String, JSON
+from sqlalchemy.dialects.postgresql import insert, array_agg, aggregate_order_by, ARRAY, UUID as PG_UUID
+from app.core.cache import response_cache
+from app.crud.rows import as_dicts, columns_for
+from app.db.session import mark_write
 from app.models.academic import Class, ClassEnrollment, Curriculum, Assessment, Grade
 from app.models.teacher import Teacher
 from app.models.user import User
 from app.models.student import Student
-from app.schemas.academic import ClassCreate, CurriculumCreate, AssessmentCreate, GradeCreate
+from app.schemas.academic import ClassResponse, ClassCreate, CurriculumCreate, AssessmentCreate, GradeCreate, GradeEntry
 
 class CRUDAcademic:
     
@@ -16,14 +20,16 @@ class CRUDAcademic:
         db_obj = Class(**obj_in.model_dump())
         db.add(db_obj)
         await db.commit()
+        await response_cache.invalidate(obj_in.school_id, "classes")
         await db.refresh(db_obj)
         return db_obj
 
-    async def get_classes_by_teacher(self, db: AsyncSession, school_id: UUID, teacher_id: UUID) -> List[Class]:
+    async def get_classes_by_teacher(self, db: AsyncSession, school_id: UUID, teacher_id: UUID) -> List[dict]:
+        """Rows shaped like ClassResponse."""
         result = await db.execute(
-            select(Class).filter(Class.school_id == school_id, Class.teacher_id == teacher_id)
+            select(*columns_for(Class, ClassResponse)).filter(Class.school_id == school_id, Class.teacher_id == teacher_id)
         )
-        return list(result.scalars().all())
+        return as_dicts(result)
 
     async def get_classes_matrix(self, db: AsyncSession, school_id: UUID):
         stmt = (
@@ -60,13 +66,105 @@ class CRUDAcademic:
         ]
 
     # -- Enrollments --
-    async def enroll_students(self, db: AsyncSession, school_id: UUID, class_id: UUID, student_ids: List[UUID]):
-        # Quick robust insert (ignoring duplicates for now based on UI logic)
-        for s_id in student_ids:
-            enrollment = ClassEnrollment(school_id=school_id, class_id=class_id, student_id=s_id)
-            db.add(enrollment)
+    async def _insert_enrollments(self, db: AsyncSession, school_id: UUID, pairs) -> Dict[UUID, List[UUID]]:
+        """
+        INSERT ... SELECT the (class_id, student_id) rows of `pairs` with
+        ON CONFLICT DO NOTHING; returns only the newly created pairs, grouped by class.
+        """
+        now = func.timezone("UTC", func.now())
+        source = select(
+            func.gen_random_uuid(), literal(school_id), pairs.c.class_id, pairs.c.student_id, now, now,
+        )
+        stmt = (
+            insert(ClassEnrollment)
+            .from_select(["id", "school_id", "class_id", "student_id", "created_at", "updated_at"], source)
+            .on_conflict_do_nothing(index_elements=[ClassEnrollment.class_id, ClassEnrollment.student_id])
+            .returning(ClassEnrollment.class_id, ClassEnrollment.student_id)
+        )
+        rows = (await db.execute(stmt)).all()
+        mark_write(db, school_id)
         await db.commit()
-        return True
+        if rows:
+            await response_cache.invalidate(school_id, "class_enrollments")
+
+        enrolled: Dict[UUID, List[UUID]] = {}
+        for row in rows:
+            enrolled.setdefault(row.class_id, []).append(row.student_id)
+        return enrolled
+
+    async def enroll_students(self, db: AsyncSession, school_id: UUID, class_id: UUID, student_ids: List[UUID]) -> List[UUID]:
+        """
+        Enroll `student_ids` in a class in one statement. Idempotent: students already
+        enrolled, or not in this school, are skipped. Returns the newly enrolled IDs.
+        """
+        ids = func.unnest(
+            bindparam("student_ids", list(dict.fromkeys(student_ids)), type_=ARRAY(PG_UUID(as_uuid=True)))
+        ).table_valued("student_id").render_derived(name="v")
+        pairs = (
+            select(Class.id.label("class_id"), Student.id.label("student_id"))
+            .select_from(ids)
+            .join(Student, (Student.id == ids.c.student_id) & (Student.school_id == school_id))
+            .join(Class, (Class.id == class_id) & (Class.school_id == school_id))
+            .subquery()
+        )
+        enrolled = await self._insert_enrollments(db, school_id, pairs)
+        return enrolled.get(class_id, [])
+
+    async def enroll_cohort(
+        self, db: AsyncSession, school_id: UUID, class_ids: List[UUID], grade: str, section: Optional[str] = None
+    ) -> Dict[UUID, List[UUID]]:
+        """
+        Enroll every student of a grade (optionally one section) into each of
+        `class_ids` in a single transaction. Returns {class_id: newly enrolled IDs}.
+        """
+        students = select(Student.id).filter(Student.school_id == school_id, Student.grade == grade)
+        if section is not None:
+            students = students.filter(Student.section == section)
+        students = students.subquery()
+        pairs = (
+            select(Class.id.label("class_id"), students.c.id.label("student_id"))
+            .select_from(Class)
+            .join(students, true())
+            .filter(Class.school_id == school_id, Class.id.in_(class_ids))
+            .subquery()
+        )
+        return await self._insert_enrollments(db, school_id, pairs)
+
+    async def get_enrollment_map(
+        self, db: AsyncSession, school_id: UUID, class_ids: Optional[List[UUID]] = None, compact: bool = True
+    ) -> Dict[UUID, list]:
+        """
+        {class_id: [student_id, ...]} for `class_ids` (or every class in the school)
+        from one grouped query. With compact=False the lists hold student profiles instead.
+        """
+        if compact:
+            students = array_agg(aggregate_order_by(ClassEnrollment.student_id, ClassEnrollment.student_id))
+            stmt = select(ClassEnrollment.class_id, students.label("students"))
+        else:
+            profile = func.json_build_object(
+                "id", Student.id,
+                "first_name", Student.first_name,
+                "last_name", Student.last_name,
+                "grade", Student.grade,
+                "section", Student.section,
+                "email", Student.email,
+                "phone", Student.phone,
+                "enrollment_date", Student.enrollment_date,
+            )
+            students = func.json_agg(aggregate_order_by(profile, Student.last_name, Student.first_name), type_=JSON)
+            stmt = (
+                select(ClassEnrollment.class_id, students.label("students"))
+                .join(Student, ClassEnrollment.student_id == Student.id)
+            )
+        stmt = stmt.filter(ClassEnrollment.school_id == school_id).group_by(ClassEnrollment.class_id)
+        if class_ids is not None:
+            stmt = stmt.filter(ClassEnrollment.class_id.in_(class_ids))
+
+        result = await db.execute(stmt)
+        enrollment_map: Dict[UUID, list] = {class_id: [] for class_id in class_ids or ()}
+        for row in result.all():
+            enrollment_map[row.class_id] = row.students
+        return enrollment_map
 
     async def get_students_in_class(self, db: AsyncSession, school_id: UUID, class_id: UUID):
         """Get all students enrolled in a class with their profile details."""
@@ -132,14 +230,92 @@ class CRUDAcademic:
         )
         return list(result.scalars().all())
 
+    async def get_assessment(self, db: AsyncSession, school_id: UUID, assessment_id: UUID) -> Optional[Assessment]:
+        result = await db.execute(
+            select(Assessment).filter(Assessment.id == assessment_id, Assessment.school_id == school_id)
+        )
+        return result.scalars().first()
+
     # -- Grades --
-    async def submit_grade(self, db: AsyncSession, obj_in: GradeCreate) -> Grade:
-        db_obj = Grade(**obj_in.model_dump())
-        db.add(db_obj)
+    async def submit_grade(self, db: AsyncSession, obj_in: GradeCreate) -> Optional[Grade]:
+        """
+        Insert or re-grade one student's score for an assessment. The caller checks the
+        assessment and student belong to `obj_in.school_id`; an existing grade of another
+        school is never overwritten (None is returned instead).
+        """
+        stmt = insert(Grade).values(**obj_in.model_dump())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Grade.assessment_id, Grade.student_id],
+            set_={"score": stmt.excluded.score, "remarks": stmt.excluded.remarks, "updated_at": stmt.excluded.updated_at},
+            where=Grade.school_id == stmt.excluded.school_id,
+        ).returning(Grade)
+        db_obj = (await db.execute(stmt, execution_options={"populate_existing": True})).scalars().first()
+        if db_obj is None:
+            await db.rollback()
+            return None
+        mark_write(db, obj_in.school_id)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
-        
+
+    async def submit_grades_bulk(
+        self, db: AsyncSession, school_id: UUID, assessment: Assessment, entries: List[GradeEntry]
+    ) -> dict:
+        """
+        Upsert every score for `assessment` in one INSERT ... SELECT FROM unnest(...)
+        ON CONFLICT (assessment_id, student_id) DO UPDATE. Rows that fail validation
+        or whose student is not in this school are reported in `errors`, the rest are saved.
+        """
+        errors, valid = [], {}
+        for entry in entries:
+            if entry.student_id in valid:
+                errors.append({"student_id": entry.student_id, "detail": "Duplicate student in request"})
+            elif entry.score < 0 or entry.score > assessment.max_score:
+                errors.append({"student_id": entry.student_id, "detail": f"Score must be between 0 and {assessment.max_score}"})
+            else:
+                valid[entry.student_id] = entry
+        if not valid:
+            return {"assessment_id": assessment.id, "inserted": 0, "updated": 0, "errors": errors}
+
+        rows = func.unnest(
+            bindparam("student_ids", [e.student_id for e in valid.values()], type_=ARRAY(PG_UUID(as_uuid=True))),
+            bindparam("scores", [e.score for e in valid.values()], type_=ARRAY(Numeric(5, 2))),
+            bindparam("remarks", [e.remarks for e in valid.values()], type_=ARRAY(String)),
+        ).table_valued("student_id", "score", "remarks").render_derived(name="v")
+        now = func.timezone("UTC", func.now())
+        source = (
+            select(
+                func.gen_random_uuid(), literal(school_id), rows.c.student_id, literal(assessment.id),
+                rows.c.score, rows.c.remarks, now, now,
+            )
+            # Join drops students from other schools (and unknown ids) instead of failing the batch
+            .join(Student, (Student.id == rows.c.student_id) & (Student.school_id == school_id))
+        )
+        stmt = insert(Grade).from_select(
+            ["id", "school_id", "student_id", "assessment_id", "score", "remarks", "created_at", "updated_at"],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Grade.assessment_id, Grade.student_id],
+            set_={"score": stmt.excluded.score, "remarks": stmt.excluded.remarks, "updated_at": stmt.excluded.updated_at},
+        ).returning(Grade.student_id, literal_column("xmax = 0").label("inserted"))
+
+        result = (await db.execute(stmt)).all()
+        mark_write(db, school_id)
+        await db.commit()
+
+        saved = {row.student_id for row in result}
+        errors.extend(
+            {"student_id": student_id, "detail": "Student not found"}
+            for student_id in valid if student_id not in saved
+        )
+        inserted = sum(1 for row in result if row.inserted)
+        return {
+            "assessment_id": assessment.id,
+            "inserted": inserted,
+            "updated": len(result) - inserted,
+            "errors": errors,
+        }
+
     async def get_grades(self, db: AsyncSession, school_id: UUID, assessment_id: UUID) -> List[Grade]:
         result = await db.execute(
             select(Grade).filter(Grade.school_id == school_id, Grade.assessment_id == assessment_id)
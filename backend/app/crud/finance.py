@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.crud.pagination import keyset_page
+from app.crud.rows import as_dicts, columns_for
 from app.models.finance import FinancialRecord
-from app.schemas.finance import FinancialRecordCreate, FinancialRecordUpdate
+from app.schemas.finance import FinancialRecordCreate, FinancialRecordUpdate, FinancialRecordResponse
 
 class CRUDFinancialRecord:
     async def get_by_id(self, db: AsyncSession, school_id: UUID, record_id: UUID) -> Optional[FinancialRecord]:
@@ -12,20 +15,45 @@ class CRUDFinancialRecord:
         )
         return result.scalars().first()
 
-    async def get_multi(self, db: AsyncSession, school_id: UUID, skip: int = 0, limit: int = 100) -> List[FinancialRecord]:
-        result = await db.execute(
-            select(FinancialRecord).filter(FinancialRecord.school_id == school_id).offset(skip).limit(limit)
-        )
-        return list(result.scalars().all())
+    # Newest due date first; backed by the ix_financial_records_school_* composite indexes
+    order_by = (FinancialRecord.due_date, FinancialRecord.id)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        school_id: UUID,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+        student_id: Optional[UUID] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Keyset-paginated, filtered records (newest due date first).
+        Returns (rows shaped like FinancialRecordResponse, next_cursor).
+        """
+        stmt = select(*columns_for(FinancialRecord, FinancialRecordResponse)).filter(FinancialRecord.school_id == school_id)
+        if status is not None:
+            stmt = stmt.filter(FinancialRecord.status == status)
+        if student_id is not None:
+            stmt = stmt.filter(FinancialRecord.student_id == student_id)
+        if due_from is not None:
+            stmt = stmt.filter(FinancialRecord.due_date >= due_from)
+        if due_to is not None:
+            stmt = stmt.filter(FinancialRecord.due_date <= due_to)
+        return await keyset_page(db, stmt, self.order_by, cursor, limit, descending=True, rows_as_dicts=True)
         
-    async def get_by_student(self, db: AsyncSession, school_id: UUID, student_id: UUID) -> List[FinancialRecord]:
+    async def get_by_student(self, db: AsyncSession, school_id: UUID, student_id: UUID) -> List[dict]:
+        """The student's records, newest due date first, as rows shaped like FinancialRecordResponse."""
         result = await db.execute(
-            select(FinancialRecord).filter(
+            select(*columns_for(FinancialRecord, FinancialRecordResponse)).filter(
                 FinancialRecord.school_id == school_id, 
                 FinancialRecord.student_id == student_id
             ).order_by(FinancialRecord.due_date.desc())
         )
-        return list(result.scalars().all())
+        return as_dicts(result)
 
     async def create(self, db: AsyncSession, obj_in: FinancialRecordCreate) -> FinancialRecord:
         db_obj = FinancialRecord(**obj_in.model_dump())
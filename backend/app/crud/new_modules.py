@@ -1,52 +1,51 @@
 from uuid import UUID
 from typing import List, Optional
 from datetime import date as date_type
-from sqlalchemy import select, and_, delete
+from sqlalchemy import select, and_, delete, func, bindparam, literal, literal_column, String, Text
+from sqlalchemy.dialects.postgresql import insert, ARRAY, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import response_cache
+from app.crud.rows import as_dicts, columns_for
+from app.db.session import mark_write
+
 from app.models.schedule import ScheduleSlot
-from app.models.attendance import AttendanceRecord
+from app.models.attendance import AttendanceRecord, AttendanceDailyRollup
 from app.models.announcement import Announcement
 from app.models.calendar import CalendarEvent
-from app.models.academic import Class
+from app.models.academic import Class, ClassEnrollment
 from app.models.teacher import Teacher
 from app.models.student import Student
+from app.models.school import School
+from app.schemas.new_modules import AttendanceEntry, AnnouncementRow, CalendarEventRow
 
 
 # ═══════════════════════════════════════════════════════════════
 #  SCHEDULE
 # ═══════════════════════════════════════════════════════════════
 async def get_school_schedule(db: AsyncSession, school_id: UUID) -> List[dict]:
+    """Rows shaped like ScheduleSlotRow."""
     result = await db.execute(
-        select(ScheduleSlot, Class, Teacher)
+        select(
+            ScheduleSlot.id, ScheduleSlot.school_id, ScheduleSlot.class_id, ScheduleSlot.teacher_id,
+            ScheduleSlot.day_of_week, ScheduleSlot.period, ScheduleSlot.start_time, ScheduleSlot.end_time,
+            ScheduleSlot.room,
+            Class.name.label("class_name"),
+            Class.subject,
+            func.concat(Teacher.first_name, " ", Teacher.last_name).label("teacher_name"),
+        )
         .join(Class,   Class.id   == ScheduleSlot.class_id)
         .join(Teacher, Teacher.id == ScheduleSlot.teacher_id)
         .where(ScheduleSlot.school_id == school_id)
         .order_by(ScheduleSlot.day_of_week, ScheduleSlot.period)
     )
-    rows = result.all()
-    slots = []
-    for slot, cls, teacher in rows:
-        slots.append({
-            "id":           str(slot.id),
-            "school_id":    str(slot.school_id),
-            "class_id":     str(slot.class_id),
-            "teacher_id":   str(slot.teacher_id),
-            "day_of_week":  slot.day_of_week,
-            "period":       slot.period,
-            "start_time":   str(slot.start_time) if slot.start_time else None,
-            "end_time":     str(slot.end_time)   if slot.end_time   else None,
-            "room":         slot.room,
-            "class_name":   cls.name,
-            "subject":      cls.subject,
-            "teacher_name": f"{teacher.first_name} {teacher.last_name}",
-        })
-    return slots
+    return as_dicts(result)
 
 async def create_schedule_slot(db: AsyncSession, obj_in: dict) -> ScheduleSlot:
     slot = ScheduleSlot(**obj_in)
     db.add(slot)
     await db.commit()
+    await response_cache.invalidate(slot.school_id, "schedule_slots")
     await db.refresh(slot)
     return slot
 
@@ -61,86 +60,231 @@ async def delete_schedule_slot(db: AsyncSession, school_id: UUID, slot_id: UUID)
         return False
     await db.delete(slot)
     await db.commit()
+    await response_cache.invalidate(school_id, "schedule_slots")
     return True
 
 
 # ═══════════════════════════════════════════════════════════════
 #  ATTENDANCE
 # ═══════════════════════════════════════════════════════════════
-async def get_class_attendance(db: AsyncSession, school_id: UUID, class_id: UUID, date_str: str) -> List[dict]:
+ATTENDANCE_STATUSES = ("present", "absent", "late", "excused")
+ROLLUP_COLUMNS = ["school_id", "class_id", "date", *ATTENDANCE_STATUSES, "updated_at"]
+
+
+def _upsert_rollup(*conditions):
+    """INSERT ... ON CONFLICT DO UPDATE attendance_daily_rollup from the raw records matching `conditions`."""
+    source = (
+        select(
+            AttendanceRecord.school_id, AttendanceRecord.class_id, AttendanceRecord.date,
+            *[func.count().filter(AttendanceRecord.status == status) for status in ATTENDANCE_STATUSES],
+            func.timezone("UTC", func.now()),
+        )
+        .where(*conditions)
+        .group_by(AttendanceRecord.school_id, AttendanceRecord.class_id, AttendanceRecord.date)
+    )
+    stmt = insert(AttendanceDailyRollup).from_select(ROLLUP_COLUMNS, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[AttendanceDailyRollup.school_id, AttendanceDailyRollup.class_id, AttendanceDailyRollup.date],
+        set_={c: stmt.excluded[c] for c in ROLLUP_COLUMNS[3:]},
+    )
+
+
+async def get_class_attendance(db: AsyncSession, school_id: UUID, class_id: UUID, day: date_type) -> List[dict]:
+    """Rows shaped like AttendanceRow."""
     result = await db.execute(
-        select(AttendanceRecord, Student)
+        select(
+            AttendanceRecord.id, AttendanceRecord.student_id,
+            func.concat(Student.first_name, " ", Student.last_name).label("student_name"),
+            AttendanceRecord.date, AttendanceRecord.status, AttendanceRecord.notes,
+        )
         .join(Student, Student.id == AttendanceRecord.student_id)
         .where(and_(
             AttendanceRecord.school_id == school_id,
             AttendanceRecord.class_id  == class_id,
-            AttendanceRecord.date      == date_str,
+            AttendanceRecord.date      == day,
         ))
     )
-    rows = result.all()
-    return [{
-        "id":           str(r.id),
-        "student_id":   str(r.student_id),
-        "student_name": f"{s.first_name} {s.last_name}",
-        "date":         str(r.date),
-        "status":       r.status,
-        "notes":        r.notes,
-    } for r, s in rows]
+    return as_dicts(result)
 
 async def bulk_upsert_attendance(db: AsyncSession, school_id: UUID, class_id: UUID,
-                                  teacher_id: Optional[UUID], date_str: str, records: list) -> int:
-    # Delete existing records for this class/date to allow re-submission
-    await db.execute(
-        delete(AttendanceRecord).where(and_(
+                                  teacher_id: Optional[UUID], day: date_type,
+                                  records: List[AttendanceEntry]) -> dict:
+    """
+    Save a roll call in one statement: INSERT ... ON CONFLICT (school_id, class_id,
+    student_id, date) DO UPDATE from arrays, touching only rows whose status, notes
+    or teacher actually changed. Students outside the school are skipped.
+    """
+    latest = {r.student_id: r for r in records}  # one row per student, last entry wins
+    # Serialize roll calls for the same class/day so each rollup refresh sees the other's rows
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(f"attendance:{class_id}:{day}", 0))))
+    rows = func.unnest(
+        bindparam("student_ids", list(latest), type_=ARRAY(PG_UUID(as_uuid=True))),
+        bindparam("statuses", [r.status for r in latest.values()], type_=ARRAY(String)),
+        bindparam("notes", [r.notes for r in latest.values()], type_=ARRAY(Text)),
+    ).table_valued("student_id", "status", "notes").render_derived(name="v")
+    valid = (
+        select(rows.c.student_id, rows.c.status, rows.c.notes)
+        .join(Student, and_(Student.id == rows.c.student_id, Student.school_id == school_id))
+        .cte("valid")
+    )
+
+    now = func.timezone("UTC", func.now())
+    upsert = insert(AttendanceRecord).from_select(
+        ["id", "school_id", "class_id", "student_id", "teacher_id", "date", "status", "notes", "created_at", "updated_at"],
+        select(
+            func.gen_random_uuid(), literal(school_id), literal(class_id), valid.c.student_id,
+            literal(teacher_id, PG_UUID(as_uuid=True)), literal(day), valid.c.status, valid.c.notes, now, now,
+        ),
+    )
+    excluded = upsert.excluded
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[AttendanceRecord.school_id, AttendanceRecord.class_id,
+                        AttendanceRecord.student_id, AttendanceRecord.date],
+        set_={"status": excluded.status, "notes": excluded.notes,
+              "teacher_id": excluded.teacher_id, "updated_at": excluded.updated_at},
+        # Unchanged rows are left alone: no new tuple version, no index churn
+        where=(
+            AttendanceRecord.status.is_distinct_from(excluded.status)
+            | AttendanceRecord.notes.is_distinct_from(excluded.notes)
+            | AttendanceRecord.teacher_id.is_distinct_from(excluded.teacher_id)
+        ),
+    ).returning(literal_column("xmax = 0").label("inserted")).cte("upserted")
+
+    counts = (await db.execute(select(
+        select(func.count()).select_from(valid).scalar_subquery().label("matched"),
+        select(func.count()).select_from(upsert).scalar_subquery().label("changed"),
+        select(func.count()).select_from(upsert).where(upsert.c.inserted).scalar_subquery().label("inserted"),
+    ))).one()
+    if counts.changed:
+        await db.execute(_upsert_rollup(
             AttendanceRecord.school_id == school_id,
-            AttendanceRecord.class_id  == class_id,
-            AttendanceRecord.date      == date_str,
+            AttendanceRecord.class_id == class_id,
+            AttendanceRecord.date == day,
         ))
-    )
-    inserted = 0
-    for rec in records:
-        obj = AttendanceRecord(
-            school_id=school_id,
-            class_id=class_id,
-            teacher_id=teacher_id,
-            student_id=UUID(str(rec["student_id"])),
-            date=date_str,
-            status=rec.get("status", "present"),
-            notes=rec.get("notes"),
-        )
-        db.add(obj)
-        inserted += 1
+    mark_write(db, school_id)
     await db.commit()
-    return inserted
 
-async def get_student_attendance_summary(db: AsyncSession, school_id: UUID, student_id: UUID) -> dict:
+    return {
+        "saved": counts.matched,
+        "inserted": counts.inserted,
+        "updated": counts.changed - counts.inserted,
+        "unchanged": counts.matched - counts.changed,
+        "skipped": len(latest) - counts.matched,
+    }
+
+def _in_period(date_from: Optional[date_type], date_to: Optional[date_type]) -> list:
+    conditions = []
+    if date_from is not None:
+        conditions.append(AttendanceRecord.date >= date_from)
+    if date_to is not None:
+        conditions.append(AttendanceRecord.date <= date_to)
+    return conditions
+
+
+async def rebuild_attendance_rollup(db: AsyncSession, school_id: Optional[UUID] = None,
+                                    date_from: Optional[date_type] = None,
+                                    date_to: Optional[date_type] = None) -> int:
+    """
+    Recompute attendance_daily_rollup from attendance_records for one school (or all),
+    optionally limited to a date range; one transaction per school. Returns rows written.
+    """
+    if school_id:
+        school_ids = [school_id]
+    else:
+        school_ids = list((await db.execute(select(School.id))).scalars().all())
+
+    written = 0
+    for sid in school_ids:
+        await db.execute(delete(AttendanceDailyRollup).where(
+            AttendanceDailyRollup.school_id == sid,
+            *([AttendanceDailyRollup.date >= date_from] if date_from else []),
+            *([AttendanceDailyRollup.date <= date_to] if date_to else []),
+        ))
+        result = await db.execute(_upsert_rollup(AttendanceRecord.school_id == sid, *_in_period(date_from, date_to)))
+        written += result.rowcount
+        await db.commit()
+    return written
+
+
+async def get_student_attendance_summary(db: AsyncSession, school_id: UUID, student_id: UUID,
+                                         date_from: Optional[date_type] = None,
+                                         date_to: Optional[date_type] = None) -> dict:
     result = await db.execute(
-        select(AttendanceRecord).where(and_(
+        select(AttendanceRecord.status, func.count())
+        .where(and_(
             AttendanceRecord.school_id  == school_id,
             AttendanceRecord.student_id == student_id,
+            *_in_period(date_from, date_to),
         ))
+        .group_by(AttendanceRecord.status)
     )
-    records = result.scalars().all()
-    summary = {"present": 0, "absent": 0, "late": 0, "excused": 0, "total": len(records)}
-    for r in records:
-        summary[r.status] = summary.get(r.status, 0) + 1
+    summary = {status: 0 for status in ATTENDANCE_STATUSES}
+    for status, count in result.all():
+        summary[status] = count
+    summary["total"] = sum(summary.values())
     return summary
 
 
+async def get_attendance_summaries(db: AsyncSession, school_id: UUID,
+                                   class_id: Optional[UUID] = None,
+                                   grade: Optional[str] = None, section: Optional[str] = None,
+                                   date_from: Optional[date_type] = None,
+                                   date_to: Optional[date_type] = None) -> dict:
+    """
+    {student_id: {present, absent, late, excused, total}} for every student enrolled in
+    `class_id` (counting that class's records) or in `grade`/`section` (counting all
+    records), in one grouped query. Students without records get zeros.
+    """
+    record_filter = [
+        AttendanceRecord.student_id == Student.id,
+        AttendanceRecord.school_id == school_id,
+        *_in_period(date_from, date_to),
+    ]
+    stmt = select(
+        Student.id,
+        *[func.count(AttendanceRecord.id).filter(AttendanceRecord.status == status).label(status)
+          for status in ATTENDANCE_STATUSES],
+        func.count(AttendanceRecord.id).label("total"),
+    ).where(Student.school_id == school_id)
+    if class_id is not None:
+        record_filter.append(AttendanceRecord.class_id == class_id)
+        stmt = stmt.join(ClassEnrollment, and_(
+            ClassEnrollment.student_id == Student.id,
+            ClassEnrollment.class_id == class_id,
+            ClassEnrollment.school_id == school_id,
+        ))
+    if grade is not None:
+        stmt = stmt.where(Student.grade == grade)
+    if section is not None:
+        stmt = stmt.where(Student.section == section)
+    stmt = stmt.outerjoin(AttendanceRecord, and_(*record_filter)).group_by(Student.id)
+
+    result = await db.execute(stmt)
+    return {
+        row.id: {key: getattr(row, key) for key in (*ATTENDANCE_STATUSES, "total")}
+        for row in result.all()
+    }
+
+
 # ═══════════════════════════════════════════════════════════════
 #  ANNOUNCEMENTS
 # ═══════════════════════════════════════════════════════════════
-async def get_announcements(db: AsyncSession, school_id: UUID, audience: Optional[str] = None) -> List[Announcement]:
-    q = select(Announcement).where(Announcement.school_id == school_id).order_by(Announcement.created_at.desc())
+async def get_announcements(db: AsyncSession, school_id: UUID, audience: Optional[str] = None) -> List[dict]:
+    """Rows shaped like AnnouncementRow, newest first."""
+    q = (
+        select(*columns_for(Announcement, AnnouncementRow))
+        .where(Announcement.school_id == school_id)
+        .order_by(Announcement.created_at.desc())
+    )
     if audience and audience != "all":
         q = q.where(Announcement.audience.in_(["all", audience]))
-    result = await db.execute(q)
-    return result.scalars().all()
+    return as_dicts(await db.execute(q))
 
 async def create_announcement(db: AsyncSession, obj_in: dict) -> Announcement:
     ann = Announcement(**obj_in)
     db.add(ann)
     await db.commit()
+    await response_cache.invalidate(ann.school_id, "announcements")
     await db.refresh(ann)
     return ann
 
@@ -153,24 +297,26 @@ async def delete_announcement(db: AsyncSession, school_id: UUID, ann_id: UUID) -
         return False
     await db.delete(ann)
     await db.commit()
+    await response_cache.invalidate(school_id, "announcements")
     return True
 
 
 # ═══════════════════════════════════════════════════════════════
 #  CALENDAR EVENTS
 # ═══════════════════════════════════════════════════════════════
-async def get_calendar_events(db: AsyncSession, school_id: UUID, year: int, month: int) -> List[CalendarEvent]:
+async def get_calendar_events(db: AsyncSession, school_id: UUID, year: int, month: int) -> List[dict]:
+    """Rows shaped like CalendarEventRow for events overlapping the month."""
     from calendar import monthrange
     first = date_type(year, month, 1)
     last  = date_type(year, month, monthrange(year, month)[1])
     result = await db.execute(
-        select(CalendarEvent).where(and_(
+        select(*columns_for(CalendarEvent, CalendarEventRow)).where(and_(
             CalendarEvent.school_id  == school_id,
-            CalendarEvent.start_date <= str(last),
-            CalendarEvent.end_date   >= str(first),
+            CalendarEvent.start_date <= last,
+            CalendarEvent.end_date   >= first,
         )).order_by(CalendarEvent.start_date)
     )
-    return result.scalars().all()
+    return as_dicts(result)
 
 async def create_calendar_event(db: AsyncSession, obj_in: dict) -> CalendarEvent:
     event = CalendarEvent(**obj_in)
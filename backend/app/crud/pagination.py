@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+from app.crud.rows import as_dicts
+
+# Keyset ("cursor") pagination. A cursor is the sort key of the last row of the previous
+# page, so page N costs the same index seek as page 1 instead of scanning N * limit rows.
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    def _plain(v):
+        if isinstance(v, (UUID, Decimal)):
+            return str(v)
+        if isinstance(v, (date, datetime)):
+            return v.isoformat()
+        return v
+    raw = json.dumps([_plain(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _from_plain(column, value):
+    python_type = column.type.python_type
+    if value is None:
+        return None
+    if python_type in (UUID, Decimal):
+        return python_type(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    """Decode a cursor back into typed sort-key values. Raises ValueError if malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of keys")
+        return [_from_plain(col, v) for col, v in zip(columns, values)]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+async def keyset_page(
+    db,
+    stmt: Select,
+    order_by: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+    rows_as_dicts: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Apply a stable ORDER BY and the keyset predicate for `cursor` to `stmt`
+    (a select of one ORM entity, or of plain columns with `rows_as_dicts`),
+    fetch one row past `limit` to detect whether there is a next page, and
+    return (rows, next_cursor).
+    """
+    if cursor:
+        after = decode_cursor(cursor, order_by)
+        key = tuple_(*order_by)
+        stmt = stmt.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    stmt = stmt.order_by(*[c.desc() if descending else c.asc() for c in order_by]).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = as_dicts(result) if rows_as_dicts else list(result.scalars().all())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last[c.key] if rows_as_dicts else getattr(last, c.key) for c in order_by])
+    return rows, next_cursor
+
+
+def prefix_pattern(text: str) -> str:
+    """LIKE pattern matching values that start with `text` (wildcards escaped, escape char '\\')."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
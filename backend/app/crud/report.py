@@ -1,50 +1,192 @@
+from datetime import date
+from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func, literal, true, JSON, String
 
+from app.models.school import School
 from app.models.student import Student
 from app.models.teacher import Teacher
 from app.models.finance import FinancialRecord
-from app.schemas.report import DashboardStats
+from app.models.tenant_stats import TenantStats
+from app.models.attendance import AttendanceDailyRollup
+from app.schemas.report import DashboardStats, AttendanceTrendPoint
+
+RECENT_STUDENTS_LIMIT = 5
 
 class CRUDReport:
     async def get_dashboard_stats(self, db: AsyncSession, school_id: UUID) -> DashboardStats:
-        # Count students
-        students_query = await db.execute(
-            select(func.count(Student.id)).filter(Student.school_id == school_id)
+        # One statement: headcounts and invoice totals come from the trigger-maintained
+        # tenant_stats row (constant cost however many invoices a school has), students
+        # per grade and the latest students from the school's students.
+        grades = (
+            select(
+                func.coalesce(Student.grade, "غير محدد").label("grade"),
+                func.count(Student.id).label("students"),
+            )
+            .filter(Student.school_id == school_id)
+            .group_by(Student.grade)
+            .order_by(Student.grade)
+            .subquery()
         )
-        total_students = students_query.scalar() or 0
-
-        # Count teachers
-        teachers_query = await db.execute(
-            select(func.count(Teacher.id)).filter(Teacher.school_id == school_id)
+        recent = (
+            select(Student.id, Student.first_name, Student.last_name, Student.grade)
+            .filter(Student.school_id == school_id)
+            .order_by(Student.created_at.desc())
+            .limit(RECENT_STUDENTS_LIMIT)
+            .subquery()
         )
-        total_teachers = teachers_query.scalar() or 0
-
-        # Financial Data
-        finance_query = await db.execute(
+        one_row = select(literal(1).label("one")).subquery()
+        stmt = (
             select(
-                func.sum(FinancialRecord.amount).label("total_expected"),
-                func.sum(FinancialRecord.amount).filter(FinancialRecord.status == "paid").label("total_collected"),
-                func.count(FinancialRecord.id).filter(FinancialRecord.status != "paid").label("outstanding_count")
-            ).filter(
-                FinancialRecord.school_id == school_id,
-                FinancialRecord.type == "invoice"
+                TenantStats.student_count,
+                TenantStats.teacher_count,
+                TenantStats.invoice_total,
+                TenantStats.paid_amount,
+                TenantStats.pending_amount,
+                TenantStats.overdue_amount,
+                TenantStats.outstanding_invoices,
+                select(func.json_object_agg(grades.c.grade, grades.c.students, type_=JSON))
+                    .scalar_subquery().label("students_by_grade"),
+                select(func.json_agg(func.json_build_object(
+                    "id", recent.c.id,
+                    "first_name", recent.c.first_name,
+                    "last_name", recent.c.last_name,
+                    "grade", recent.c.grade,
+                ), type_=JSON)).scalar_subquery().label("recent_students"),
             )
+            # LEFT JOIN from a one-row relation so a school without a stats row yet still gets zeros
+            .select_from(one_row)
+            .outerjoin(TenantStats, TenantStats.school_id == school_id)
         )
-        fin_stats = finance_query.first()
-
-        total_expected = float(fin_stats.total_expected or 0.0)
-        total_collected = float(fin_stats.total_collected or 0.0)
-        outstanding_count = fin_stats.outstanding_count or 0
+        row = (await db.execute(stmt)).first()
 
         return DashboardStats(
-            total_students=total_students,
-            total_teachers=total_teachers,
-            total_revenue_expected=total_expected,
-            total_revenue_collected=total_collected,
-            outstanding_invoices_count=outstanding_count
+            total_students=row.student_count or 0,
+            total_teachers=row.teacher_count or 0,
+            total_revenue_expected=float(row.invoice_total or 0.0),
+            total_revenue_collected=float(row.paid_amount or 0.0),
+            outstanding_invoices_count=row.outstanding_invoices or 0,
+            amounts_by_status={
+                "paid": float(row.paid_amount or 0.0),
+                "pending": float(row.pending_amount or 0.0),
+                "overdue": float(row.overdue_amount or 0.0),
+            },
+            students_by_grade=row.students_by_grade or {},
+            recent_students=row.recent_students or [],
+        )
+
+    async def rebuild_tenant_stats(self, db: AsyncSession, school_id: Optional[UUID] = None) -> List[UUID]:
+        """
+        Recompute tenant_stats from the base tables (one school, or all of them).
+        Each school's row is locked first so concurrent trigger updates queue behind
+        the rebuild instead of being overwritten. Returns the schools whose row drifted.
+        """
+        if school_id:
+            school_ids = [school_id]
+        else:
+            school_ids = list((await db.execute(select(School.id))).scalars().all())
+
+        invoices = (FinancialRecord.school_id == School.id, FinancialRecord.type == "invoice")
+        amount, status = FinancialRecord.amount, FinancialRecord.status
+        columns = [
+            "school_id", "student_count", "teacher_count", "invoice_total",
+            "paid_amount", "pending_amount", "overdue_amount", "outstanding_invoices", "updated_at",
+        ]
+        drifted = []
+        for sid in school_ids:
+            before = (await db.execute(
+                select(TenantStats).filter(TenantStats.school_id == sid).with_for_update()
+            )).scalars().first()
+            before_values = tuple(getattr(before, c) for c in columns[1:-1]) if before else None
+
+            finance = (
+                select(
+                    func.coalesce(func.sum(amount), 0),
+                    func.coalesce(func.sum(amount).filter(status == "paid"), 0),
+                    func.coalesce(func.sum(amount).filter(status == "pending"), 0),
+                    func.coalesce(func.sum(amount).filter(status == "overdue"), 0),
+                    func.count(FinancialRecord.id).filter(status != "paid"),
+                )
+                .filter(*invoices)
+                .lateral()
+            )
+            source = (
+                select(
+                    School.id,
+                    select(func.count(Student.id)).filter(Student.school_id == School.id).scalar_subquery(),
+                    select(func.count(Teacher.id)).filter(Teacher.school_id == School.id).scalar_subquery(),
+                    *finance.c,
+                    func.now(),
+                )
+                .select_from(School)
+                .join(finance, true())
+                .filter(School.id == sid)
+            )
+            stmt = insert(TenantStats).from_select(columns, source)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TenantStats.school_id],
+                set_={c: stmt.excluded[c] for c in columns[1:]},
+            ).returning(*[getattr(TenantStats, c) for c in columns[1:-1]])
+            after_values = tuple((await db.execute(stmt)).first())
+            await db.commit()
+            if after_values != before_values:
+                drifted.append(sid)
+        return drifted
+
+    async def get_attendance_trend(
+        self,
+        db: AsyncSession,
+        school_id: UUID,
+        group_by: str = "day",
+        class_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[AttendanceTrendPoint]:
+        """
+        Attendance counts per day, month or class, summed from attendance_daily_rollup
+        (one row per class per school day) rather than the raw attendance_records.
+        """
+        r = AttendanceDailyRollup
+        if group_by == "month":
+            key = func.to_char(r.date, "YYYY-MM")
+        elif group_by == "class":
+            key = func.cast(r.class_id, String)
+        else:
+            key = func.to_char(r.date, "YYYY-MM-DD")
+        stmt = (
+            select(
+                key.label("key"),
+                func.sum(r.present).label("present"),
+                func.sum(r.absent).label("absent"),
+                func.sum(r.late).label("late"),
+                func.sum(r.excused).label("excused"),
+            )
+            .filter(r.school_id == school_id)
+            .group_by(key)
+            .order_by(key)
         )
+        if class_id is not None:
+            stmt = stmt.filter(r.class_id == class_id)
+        if date_from is not None:
+            stmt = stmt.filter(r.date >= date_from)
+        if date_to is not None:
+            stmt = stmt.filter(r.date <= date_to)
+
+        points = []
+        for row in (await db.execute(stmt)).all():
+            total = row.present + row.absent + row.late + row.excused
+            points.append(AttendanceTrendPoint(
+                key=row.key,
+                present=row.present,
+                absent=row.absent,
+                late=row.late,
+                excused=row.excused,
+                total=total,
+                absence_rate=row.absent / total if total else 0.0,
+            ))
+        return points
 
 report = CRUDReport()
@@ -0,0 +1,19 @@
+from typing import List, Type
+
+from pydantic import BaseModel
+from sqlalchemy.engine import Result
+
+# Read paths that feed FastJSONResponse select plain columns shaped like the response
+# schema instead of ORM entities, so no identity map, no attribute instrumentation and
+# no Pydantic validation sit between the driver and the encoder.
+
+
+def columns_for(model, schema: Type[BaseModel]) -> list:
+    """`model`'s columns named like `schema`'s fields, in field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def as_dicts(result: Result) -> List[dict]:
+    """Rows of a column select as plain dicts keyed by column label."""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
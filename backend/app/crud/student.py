@@ -1,9 +1,19 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from decimal import Decimal
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import or_, func, null, JSON
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.crud.pagination import keyset_page, prefix_pattern
+from app.crud.rows import columns_for
 from app.models.student import Student
-from app.schemas.student import StudentCreate, StudentUpdate
+from app.models.finance import FinancialRecord
+from app.models.attendance import AttendanceRecord
+from app.models.academic import Class, ClassEnrollment, Assessment, Grade
+from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse, StudentProfileResponse
+
+RECENT_GRADES_LIMIT = 10
 
 class CRUDStudent:
     async def get_by_id(self, db: AsyncSession, school_id: UUID, student_id: UUID) -> Optional[Student]:
@@ -12,11 +22,121 @@ class CRUDStudent:
         )
         return result.scalars().first()
 
-    async def get_multi(self, db: AsyncSession, school_id: UUID, skip: int = 0, limit: int = 100) -> List[Student]:
-        result = await db.execute(
-            select(Student).filter(Student.school_id == school_id).offset(skip).limit(limit)
+    # Stable list order; backed by ix_students_school_name / ix_students_school_grade_section
+    order_by = (Student.last_name, Student.first_name, Student.id)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        school_id: UUID,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        grade: Optional[str] = None,
+        section: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Keyset-paginated, filtered students. Returns (rows shaped like StudentResponse, next_cursor)."""
+        stmt = select(*columns_for(Student, StudentResponse)).filter(Student.school_id == school_id)
+        if grade is not None:
+            stmt = stmt.filter(Student.grade == grade)
+        if section is not None:
+            stmt = stmt.filter(Student.section == section)
+        if name_prefix:
+            pattern = prefix_pattern(name_prefix)
+            stmt = stmt.filter(or_(
+                Student.first_name.ilike(pattern, escape="\\"),
+                Student.last_name.ilike(pattern, escape="\\"),
+            ))
+        return await keyset_page(db, stmt, self.order_by, cursor, limit, rows_as_dicts=True)
+
+    async def get_profile(
+        self, db: AsyncSession, school_id: UUID, student_id: UUID, include_finance: bool = True
+    ) -> Optional[StudentProfileResponse]:
+        """
+        Student plus attendance summary, financial records, classes and recent grades
+        in one round trip: each part is a scalar subquery over the student's own rows
+        (by indexed student_id), so the cost does not depend on the school's size.
+        """
+        def tenant(model):
+            return model.school_id == school_id, model.student_id == student_id
+
+        attendance = (
+            select(AttendanceRecord.status, func.count().label("n"))
+            .filter(*tenant(AttendanceRecord))
+            .group_by(AttendanceRecord.status)
+            .subquery()
+        )
+        records = select(func.json_agg(aggregate_order_by(
+            func.json_build_object(
+                "id", FinancialRecord.id,
+                "school_id", FinancialRecord.school_id,
+                "student_id", FinancialRecord.student_id,
+                "amount", FinancialRecord.amount,
+                "type", FinancialRecord.type,
+                "status", FinancialRecord.status,
+                "due_date", FinancialRecord.due_date,
+                "description", FinancialRecord.description,
+                "created_at", FinancialRecord.created_at,
+                "updated_at", FinancialRecord.updated_at,
+            ),
+            FinancialRecord.due_date.desc(),
+        ), type_=JSON)).filter(*tenant(FinancialRecord))
+        classes = (
+            select(func.json_agg(aggregate_order_by(
+                func.json_build_object("id", Class.id, "name", Class.name, "subject", Class.subject),
+                Class.name,
+            ), type_=JSON))
+            .select_from(ClassEnrollment)
+            .join(Class, Class.id == ClassEnrollment.class_id)
+            .filter(*tenant(ClassEnrollment))
+        )
+        grades = (
+            select(
+                Grade.assessment_id, Assessment.title, Assessment.type, Class.id.label("class_id"),
+                Class.name.label("class_name"), Grade.score, Assessment.max_score, Grade.created_at,
+            )
+            .join(Assessment, Assessment.id == Grade.assessment_id)
+            .join(Class, Class.id == Assessment.class_id)
+            .filter(*tenant(Grade))
+            .order_by(Grade.created_at.desc())
+            .limit(RECENT_GRADES_LIMIT)
+            .subquery()
+        )
+        stmt = select(
+            Student,
+            select(func.json_object_agg(attendance.c.status, attendance.c.n, type_=JSON))
+                .scalar_subquery().label("attendance"),
+            (records.scalar_subquery() if include_finance else null()).label("financial_records"),
+            classes.scalar_subquery().label("classes"),
+            select(func.json_agg(aggregate_order_by(
+                func.json_build_object(*[x for c in grades.c for x in (c.key, c)]),
+                grades.c.created_at.desc(),
+            ), type_=JSON)).scalar_subquery().label("recent_grades"),
+        ).filter(Student.id == student_id, Student.school_id == school_id)
+
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            return None
+
+        attendance_counts = row.attendance or {}
+        financial_records = row.financial_records or []
+        balance = {"total": 0, "paid": 0, "pending": 0, "overdue": 0}
+        for r in financial_records:
+            amount = Decimal(str(r["amount"]))
+            balance["total"] += amount
+            if r["status"] in balance:
+                balance[r["status"]] += amount
+        balance["outstanding"] = balance["pending"] + balance["overdue"]
+
+        return StudentProfileResponse(
+            student=row.Student,
+            attendance={**attendance_counts, "total": sum(attendance_counts.values())},
+            financial_records=financial_records,
+            balance=balance,
+            classes=row.classes or [],
+            recent_grades=row.recent_grades or [],
         )
-        return list(result.scalars().all())
 
     async def create(self, db: AsyncSession, obj_in: StudentCreate) -> Student:
         db_obj = Student(**obj_in.model_dump())
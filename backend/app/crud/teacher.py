@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.core.cache import response_cache
+from app.crud.pagination import keyset_page
+from app.crud.rows import columns_for
 from app.models.teacher import Teacher
-from app.schemas.teacher import TeacherCreate, TeacherUpdate
+from app.schemas.teacher import TeacherCreate, TeacherUpdate, TeacherResponse
 
 class CRUDTeacher:
     async def get_by_id(self, db: AsyncSession, school_id: UUID, teacher_id: UUID) -> Optional[Teacher]:
@@ -12,16 +15,21 @@ class CRUDTeacher:
         )
         return result.scalars().first()
 
-    async def get_multi(self, db: AsyncSession, school_id: UUID, skip: int = 0, limit: int = 100) -> List[Teacher]:
-        result = await db.execute(
-            select(Teacher).filter(Teacher.school_id == school_id).offset(skip).limit(limit)
-        )
-        return list(result.scalars().all())
+    # Stable list order; backed by ix_teachers_school_name
+    order_by = (Teacher.last_name, Teacher.first_name, Teacher.id)
+
+    async def get_page(
+        self, db: AsyncSession, school_id: UUID, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Keyset-paginated teachers. Returns (rows shaped like TeacherResponse, next_cursor)."""
+        stmt = select(*columns_for(Teacher, TeacherResponse)).filter(Teacher.school_id == school_id)
+        return await keyset_page(db, stmt, self.order_by, cursor, limit, rows_as_dicts=True)
 
     async def create(self, db: AsyncSession, obj_in: TeacherCreate) -> Teacher:
         db_obj = Teacher(**obj_in.model_dump())
         db.add(db_obj)
         await db.commit()
+        await response_cache.invalidate(obj_in.school_id, "teachers")
         await db.refresh(db_obj)
         return db_obj
 
@@ -31,6 +39,7 @@ class CRUDTeacher:
             setattr(db_obj, field, value)
         db.add(db_obj)
         await db.commit()
+        await response_cache.invalidate(school_id, "teachers")
         await db.refresh(db_obj)
         return db_obj
 
@@ -39,6 +48,7 @@ class CRUDTeacher:
         if obj:
             await db.delete(obj)
             await db.commit()
+            await response_cache.invalidate(school_id, "teachers")
         return obj
 
 teacher = CRUDTeacher()
@@ -0,0 +1,33 @@
+from typing import Dict, FrozenSet, Sequence
+from uuid import UUID
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.tenant_versions import TenantVersion
+
+# pg_trigger.tgtype bits for INSERT, DELETE and UPDATE
+_WRITE_EVENTS = 4 | 8 | 16
+
+
+async def get_versions(db: AsyncSession, school_id: UUID, resources: Sequence[str]) -> Dict[str, int]:
+    """Current version of each resource (table name) for a school; 0 if it was never written."""
+    result = await db.execute(
+        select(TenantVersion.resource, TenantVersion.version)
+        .filter(TenantVersion.school_id == school_id, TenantVersion.resource.in_(resources))
+    )
+    versions = dict.fromkeys(resources, 0)
+    versions.update(result.all())
+    return versions
+
+
+async def get_versioned_tables(db: AsyncSession) -> FrozenSet[str]:
+    """Tables whose inserts, updates and deletes all run tenant_versions_bump()."""
+    result = await db.execute(text("""
+        SELECT c.relname
+        FROM pg_trigger t
+        JOIN pg_class c ON c.oid = t.tgrelid
+        JOIN pg_proc p ON p.oid = t.tgfoid
+        WHERE p.proname = 'tenant_versions_bump' AND NOT t.tgisinternal
+        GROUP BY c.relname
+        HAVING bit_or(t.tgtype::int) & :events = :events
+    """), {"events": _WRITE_EVENTS})
+    return frozenset(result.scalars().all())
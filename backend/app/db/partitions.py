@@ -0,0 +1,60 @@
+"""
+Range partitions of attendance_records, one per academic year (see migration 0b6e4d2a9c57).
+
+Partition attendance_records_y<YYYY> holds the academic year starting in
+TERM1_START_MONTH of YYYY. Rows outside every partition land in
+attendance_records_default and are moved out when their partition is created.
+Creation runs under an advisory lock (migration 6c1f8a3d5e27), so workers booting
+together can all call ensure_attendance_partitions.
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+PARENT = "attendance_records"
+PREFIX = "attendance_records_y"
+
+
+def academic_year(day: date) -> int:
+    return day.year if day.month >= settings.TERM1_START_MONTH else day.year - 1
+
+
+async def ensure_attendance_partitions(db: AsyncSession, years_ahead: int = 1, today: Optional[date] = None) -> List[str]:
+    """Create partitions for the current academic year and `years_ahead` after it; returns the new ones."""
+    current = academic_year(today or date.today())
+    created = []
+    for year in range(current, current + years_ahead + 1):
+        name = (await db.execute(
+            select(func.attendance_records_ensure_partition(year, settings.TERM1_START_MONTH))
+        )).scalar()
+        if name:
+            created.append(name)
+    await db.commit()
+    return created
+
+
+async def list_attendance_partitions(db: AsyncSession) -> List[str]:
+    result = await db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass) ORDER BY c.relname"
+    ), {"parent": PARENT})
+    return list(result.scalars().all())
+
+
+async def detach_attendance_partitions(db: AsyncSession, before_year: int) -> List[str]:
+    """
+    Detach yearly partitions older than `before_year`. Detached tables keep their
+    data as standalone tables, ready to be dumped and dropped.
+    """
+    detached = []
+    for name in await list_attendance_partitions(db):
+        if name.startswith(PREFIX) and int(name[len(PREFIX):]) < before_year:
+            await db.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION "{name}"'))
+            detached.append(name)
+    await db.commit()
+    return detached
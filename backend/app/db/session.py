@@ -1,16 +1,162 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import itertools
+import time
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import Histogram
+from app.core.read_pin import client_pinned, note_write
+from app.core.timing import instrument_engine
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+class PoolMetrics:
+    """Per-worker connection pool counters (module state, so one per process)."""
+
+    def __init__(self):
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_latency = Histogram()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each successful checkout waits
+    (including pre-ping). Timeouts are counted apart and stay out of the histogram.
+    """
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        self.metrics.waiting += 1
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.waiting -= 1
+        self.metrics.checkouts += 1
+        self.metrics.checkout_latency.observe(time.perf_counter() - start)
+        return connection
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the pool settings from `Settings`."""
+    metrics = PoolMetrics()
+    # Metrics live on a per-engine subclass so they survive pool.recreate() on dispose().
+    pool_class = type("InstrumentedPool", (InstrumentedPool,), {"metrics": metrics})
+    kwargs = dict(
+        echo=False,
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    db_url = make_url(url)
+    if db_url.drivername == "postgresql+asyncpg":
+        # asyncpg's own cache plus SQLAlchemy's prepared-statement cache; both must be 0
+        # behind a transaction-mode pooler (e.g. Supabase pgbouncer on port 6543).
+        kwargs["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+        db_url = db_url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+    engine = create_async_engine(db_url, **kwargs)
+    instrument_engine(engine)
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    metrics: PoolMetrics = pool.metrics
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "waiting": metrics.waiting,
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "checkout_latency_seconds": metrics.checkout_latency.snapshot(),
+    }
+
+
+# school_id -> monotonic time of its last committed write on the primary. Per worker:
+# other workers learn about the write only from the client's pin (app.core.read_pin)
+_last_write: dict = {}
+
+
+class PrimarySession(Session):
+    """Session bound to the primary; remembers which tenants it committed writes for."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _collect_written_tenants(session, flush_context):
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        school_id = getattr(obj, "school_id", None)
+        if school_id is not None:
+            session.info.setdefault("tenants_written", set()).add(str(school_id))
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_tenant_writes(session):
+    now = time.monotonic()
+    for school_id in session.info.pop("tenants_written", ()):
+        _last_write[school_id] = now
+        note_write(school_id)
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _discard_tenant_writes(session):
+    session.info.pop("tenants_written", None)
+
+
+def mark_write(db: AsyncSession, school_id) -> None:
+    """Record a Core-level write (insert()/update()/delete() statements bypass the flush hook)."""
+    db.info.setdefault("tenants_written", set()).add(str(school_id))
+
+
+engine = create_engine(settings.DATABASE_URL)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
+# Read replicas, used round-robin by read-only routes (see get_db_read in app.api.dependencies)
+read_engines = [create_engine(url.strip()) for url in settings.DATABASE_READ_URLS.split(",") if url.strip()]
+_read_sessionmakers = itertools.cycle([
+    async_sessionmaker(bind=e, class_=AsyncSession, expire_on_commit=False, autocommit=False, autoflush=False)
+    for e in read_engines
+])
+
+
+def read_session(school_id: Optional[str] = None) -> AsyncSession:
+    """
+    Next replica session, or a primary session when no replicas are configured or
+    the tenant wrote within DATABASE_READ_PIN_SECONDS (read-your-writes): through
+    this worker, or through any worker if the request carries the client's read pin.
+    """
+    if not read_engines:
+        return AsyncSessionLocal()
+    if school_id and client_pinned(school_id):
+        return AsyncSessionLocal()
+    last = _last_write.get(str(school_id)) if school_id else None
+    if last is not None and time.monotonic() - last < settings.DATABASE_READ_PIN_SECONDS:
+        return AsyncSessionLocal()
+    return next(_read_sessionmakers)()
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
@@ -1,15 +1,30 @@
+import hmac
 import logging
-from fastapi import FastAPI
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.v1.router import api_router
+from app.api.responses import FastJSONResponse
+from app.api.dependencies import init_hs_secret
+from app.services.invalidation import invalidation_bus
+from app.services.jwks import jwks_manager
+from app.core.cache import response_cache
+from app.crud.versions import get_versioned_tables
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.read_pin import ReadPinMiddleware
+from app.core.timing import TimingMiddleware, instrument_routes, render_prometheus
+from app.db.session import AsyncSessionLocal, engine, read_engines
+from app.db.partitions import ensure_attendance_partitions
 
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=FastJSONResponse,
 )
 
 # Set all CORS enabled origins
@@ -20,8 +35,40 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "X-Read-Pin"],
     )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        encodings=[e.strip() for e in settings.COMPRESSION_ENCODINGS.split(",") if e.strip()],
+        levels={
+            "gzip": settings.COMPRESSION_GZIP_LEVEL,
+            "br": settings.COMPRESSION_BROTLI_QUALITY,
+            "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+        },
+    )
+
+# Read-your-writes across workers; without replicas every read is on the primary anyway
+if settings.DATABASE_READ_URLS.strip():
+    app.add_middleware(ReadPinMiddleware, pin_seconds=settings.DATABASE_READ_PIN_SECONDS)
+
+# Added last so it is outermost and times the whole stack, CORS included
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        TimingMiddleware,
+        server_timing=settings.SERVER_TIMING_HEADER,
+        access_log=settings.ACCESS_LOG,
+        repeat_threshold=settings.SQL_REPEAT_WARN_THRESHOLD,
+    )
+    if settings.ACCESS_LOG:
+        # uvicorn only configures its own loggers; run it with --no-access-log to avoid two lines per request
+        access_handler = logging.StreamHandler()
+        access_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logging.getLogger("app.access").addHandler(access_handler)
+        logging.getLogger("app.access").setLevel(logging.INFO)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.on_event("startup")
@@ -37,8 +84,56 @@ async def startup_checks():
         )
     else:
         logger.info("✅ SUPABASE_JWT_SECRET is set (length: %d)", len(jwt_secret))
+        if not init_hs_secret():
+            logger.info("HS secret form not detected from SUPABASE_KEY; it will be pinned on the first valid token")
+
+    if settings.METRICS_ENABLED and not settings.METRICS_TOKEN:
+        logger.warning("METRICS_TOKEN is not set: /metrics is not served (request timing is still collected)")
+
+    if settings.SUPABASE_URL or settings.SUPABASE_JWKS_URL:
+        await jwks_manager.start()
+
+    # Per-worker response cache: hear about other workers' writes (retries in the background)
+    if settings.CACHE_NOTIFY_ENABLED and response_cache.needs_notifications:
+        invalidation_bus.subscribe(response_cache.on_notification, on_reconnect=response_cache.on_reconnect)
+        await invalidation_bus.start()
+
+    # Keep attendance partitions created ahead of time (also: maintenance.py attendance-partitions)
+    try:
+        async with AsyncSessionLocal() as db:
+            created = await ensure_attendance_partitions(db, years_ahead=settings.ATTENDANCE_PARTITION_YEARS_AHEAD)
+        if created:
+            logger.info("Created attendance partitions: %s", ", ".join(created))
+    except Exception as e:
+        logger.warning("Could not ensure attendance partitions: %s", e)
+
+    # Cached reads must only depend on tables whose writes bump tenant_versions
+    if response_cache.enabled:
+        try:
+            async with AsyncSessionLocal() as db:
+                response_cache.versioned_tables = await get_versioned_tables(db)
+        except Exception as e:
+            logger.warning("Could not check tenant_versions triggers, caching unchecked: %s", e)
+
+@app.on_event("shutdown")
+async def shutdown():
+    await jwks_manager.stop()
+    await invalidation_bus.stop()
 
 @app.get("/")
 def root():
     return {"message": "Welcome to School Management SaaS API"}
 
+# Only mounted with a token: it shares the public API port and exposes traffic, pool and cache state
+if settings.METRICS_ENABLED and settings.METRICS_TOKEN:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics(authorization: Optional[str] = Header(None)):
+        """Per-worker request and DB pool metrics in the Prometheus text format."""
+        if not hmac.compare_digest((authorization or "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        pools = {"primary": engine, **{f"replica{i}": e for i, e in enumerate(read_engines)}}
+        body = render_prometheus(pools) + "\n".join(response_cache.prometheus() + invalidation_bus.prometheus()) + "\n"
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+if settings.METRICS_ENABLED:
+    instrument_routes(app)
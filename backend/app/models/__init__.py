@@ -6,8 +6,10 @@ from .teacher import Teacher
 from .finance import FinancialRecord
 from .academic import Class, ClassEnrollment, Curriculum, Assessment, Grade
 from .schedule import ScheduleSlot
-from .attendance import AttendanceRecord
+from .attendance import AttendanceRecord, AttendanceDailyRollup
 from .announcement import Announcement
 from .calendar import CalendarEvent
+from .tenant_stats import TenantStats
+from .tenant_versions import TenantVersion
 
 # Ensure all models are imported before Alembic reads Base.metadata
@@ -1,10 +1,13 @@
 import uuid
-from sqlalchemy import Column, String, Numeric, Boolean, Text, ForeignKey
+from sqlalchemy import Column, String, Numeric, Boolean, Text, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class Class(Base, TimestampMixin):
     __tablename__ = "classes"
+    __table_args__ = (
+        Index("ix_classes_school_teacher", "school_id", "teacher_id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
@@ -13,6 +16,10 @@ class Class(Base, TimestampMixin):
 
 class ClassEnrollment(Base, TimestampMixin):
     __tablename__ = "class_enrollments"
+    __table_args__ = (
+        UniqueConstraint("class_id", "student_id", name="uq_class_enrollments_class_student"),
+        Index("ix_class_enrollments_school_class_student", "school_id", "class_id", "student_id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
     class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False, index=True)
@@ -20,6 +27,9 @@ class ClassEnrollment(Base, TimestampMixin):
 
 class Curriculum(Base, TimestampMixin):
     __tablename__ = "curriculums"
+    __table_args__ = (
+        Index("ix_curriculums_school_class", "school_id", "class_id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
     class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False, index=True)
@@ -30,6 +40,9 @@ class Curriculum(Base, TimestampMixin):
 
 class Assessment(Base, TimestampMixin):
     __tablename__ = "assessments"
+    __table_args__ = (
+        Index("ix_assessments_school_class", "school_id", "class_id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
     class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False, index=True)
@@ -42,6 +55,11 @@ class Assessment(Base, TimestampMixin):
 
 class Grade(Base, TimestampMixin):
     __tablename__ = "grades"
+    __table_args__ = (
+        # One grade per student per assessment; conflict target of the grade upserts
+        UniqueConstraint("assessment_id", "student_id", name="uq_grades_assessment_student"),
+        Index("ix_grades_school_student_created", "school_id", "student_id", text("created_at DESC")),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
     student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"), nullable=False, index=True)
@@ -1,10 +1,13 @@
 import uuid
-from sqlalchemy import Column, String, Text, Date, ForeignKey
+from sqlalchemy import Column, String, Text, Date, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class Announcement(Base, TimestampMixin):
     __tablename__ = "announcements"
+    __table_args__ = (
+        Index("ix_announcements_school_created", "school_id", text("created_at DESC")),
+    )
 
     id        = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
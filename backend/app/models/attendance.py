@@ -1,18 +1,50 @@
 import uuid
-from sqlalchemy import Column, String, Date, Text, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, String, Date, DateTime, Integer, Text, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class AttendanceRecord(Base, TimestampMixin):
     __tablename__ = "attendance_records"
+    __table_args__ = (
+        # One mark per student per class per day; conflict target of bulk_upsert_attendance
+        UniqueConstraint("school_id", "class_id", "student_id", "date", name="uq_attendance_records_student_day"),
+        Index("ix_attendance_records_school_date", "school_id", "date"),
+        Index("ix_attendance_records_school_class_date", "school_id", "class_id", "date"),
+        Index("ix_attendance_records_student_date", "student_id", "date"),
+        # Yearly range partitions, managed by app.db.partitions
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
     id         = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    school_id  = Column(UUID(as_uuid=True), ForeignKey("schools.id"),   nullable=False, index=True)
-    class_id   = Column(UUID(as_uuid=True), ForeignKey("classes.id"),   nullable=False, index=True)
-    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"),  nullable=False, index=True)
+    school_id  = Column(UUID(as_uuid=True), ForeignKey("schools.id"),   nullable=False)
+    class_id   = Column(UUID(as_uuid=True), ForeignKey("classes.id"),   nullable=False)
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"),  nullable=False)
     teacher_id = Column(UUID(as_uuid=True), ForeignKey("teachers.id"),  nullable=True)
 
-    date   = Column(Date, nullable=False, index=True)
+    date   = Column(Date, primary_key=True)  # partition key, so part of the primary key
     # present | absent | late | excused
     status = Column(String(20), nullable=False, default="present")
     notes  = Column(Text, nullable=True)
+
+
+class AttendanceDailyRollup(Base):
+    """
+    Status counts per class per day, kept current by bulk_upsert_attendance.
+    Rebuild with `python maintenance.py rebuild-attendance-rollup`.
+    """
+    __tablename__ = "attendance_daily_rollup"
+    __table_args__ = (
+        Index("ix_attendance_daily_rollup_school_date", "school_id", "date"),
+    )
+
+    school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), primary_key=True)
+    class_id  = Column(UUID(as_uuid=True), ForeignKey("classes.id", ondelete="CASCADE"), primary_key=True)
+    date      = Column(Date, primary_key=True)
+
+    present = Column(Integer, nullable=False, default=0)
+    absent  = Column(Integer, nullable=False, default=0)
+    late    = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
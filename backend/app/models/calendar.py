@@ -1,10 +1,13 @@
 import uuid
-from sqlalchemy import Column, String, Text, Date, ForeignKey
+from sqlalchemy import Column, String, Text, Date, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class CalendarEvent(Base, TimestampMixin):
     __tablename__ = "calendar_events"
+    __table_args__ = (
+        Index("ix_calendar_events_school_start_end", "school_id", "start_date", "end_date"),
+    )
 
     id        = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"),  nullable=False, index=True)
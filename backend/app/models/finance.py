@@ -1,10 +1,16 @@
 import uuid
-from sqlalchemy import Column, String, Date, Numeric, ForeignKey
+from sqlalchemy import Column, String, Date, Numeric, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class FinancialRecord(Base, TimestampMixin):
     __tablename__ = "financial_records"
+    __table_args__ = (
+        # Keyset pagination / filters in crud.finance.get_page
+        Index("ix_financial_records_school_due", "school_id", "due_date", "id"),
+        Index("ix_financial_records_school_status_due", "school_id", "status", "due_date", "id"),
+        Index("ix_financial_records_school_student_due", "school_id", "student_id", "due_date", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
@@ -1,10 +1,13 @@
 import uuid
-from sqlalchemy import Column, String, Time, Integer, ForeignKey
+from sqlalchemy import Column, String, Time, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class ScheduleSlot(Base, TimestampMixin):
     __tablename__ = "schedule_slots"
+    __table_args__ = (
+        Index("ix_schedule_slots_school_day_period", "school_id", "day_of_week", "period"),
+    )
 
     id         = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id  = Column(UUID(as_uuid=True), ForeignKey("schools.id"),   nullable=False, index=True)
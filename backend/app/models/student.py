@@ -1,10 +1,15 @@
 import uuid
-from sqlalchemy import Column, String, Date, ForeignKey
+from sqlalchemy import Column, String, Date, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class Student(Base, TimestampMixin):
     __tablename__ = "students"
+    __table_args__ = (
+        # Keyset pagination / filters in crud.student.get_page
+        Index("ix_students_school_name", "school_id", "last_name", "first_name", "id"),
+        Index("ix_students_school_grade_section", "school_id", "grade", "section", "last_name", "first_name", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
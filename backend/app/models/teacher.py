@@ -1,10 +1,13 @@
 import uuid
-from sqlalchemy import Column, String, Date, ForeignKey
+from sqlalchemy import Column, String, Date, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TimestampMixin
 
 class Teacher(Base, TimestampMixin):
     __tablename__ = "teachers"
+    __table_args__ = (
+        Index("ix_teachers_school_name", "school_id", "last_name", "first_name", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False, index=True)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+class TenantStats(Base):
+    """
+    One summary row per school, maintained by triggers on students, teachers and
+    financial_records (see migration d85112b99520). Repair drift with
+    `python maintenance.py rebuild-tenant-stats`.
+    """
+    __tablename__ = "tenant_stats"
+
+    school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), primary_key=True)
+
+    student_count = Column(Integer, nullable=False, default=0)
+    teacher_count = Column(Integer, nullable=False, default=0)
+
+    # Invoices only (financial_records.type = 'invoice')
+    invoice_total        = Column(Numeric(14, 2), nullable=False, default=0)
+    paid_amount          = Column(Numeric(14, 2), nullable=False, default=0)
+    pending_amount       = Column(Numeric(14, 2), nullable=False, default=0)
+    overdue_amount       = Column(Numeric(14, 2), nullable=False, default=0)
+    outstanding_invoices = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
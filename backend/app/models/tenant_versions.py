@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+class TenantVersion(Base):
+    """
+    Change counter per (school, resource), where a resource is a table name. Statement-level
+    triggers bump it on every insert, update or delete (see migration 8e2c4a7b1f05), so
+    list endpoints can answer If-None-Match with 304 from this table alone.
+
+    Versions come from one global sequence and never repeat, even after a row is
+    deleted. school_id has no foreign key, so the triggers can never make a write fail.
+    """
+    __tablename__ = "tenant_versions"
+
+    school_id = Column(UUID(as_uuid=True), primary_key=True)
+    resource = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
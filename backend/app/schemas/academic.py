@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -31,6 +31,23 @@ class EnrollmentCreate(BaseModel):
     class_id: UUID
     student_ids: List[UUID]
 
+class EnrollmentResult(BaseModel):
+    status: str = "success"
+    message: str
+    class_id: UUID
+    enrolled: List[UUID]  # newly enrolled; already-enrolled students are skipped
+
+class CohortEnrollmentCreate(BaseModel):
+    school_id: UUID
+    class_ids: List[UUID]
+    grade: str
+    section: Optional[str] = None
+
+class CohortEnrollmentResult(BaseModel):
+    status: str = "success"
+    message: str
+    enrolled: Dict[UUID, List[UUID]]  # class_id -> newly enrolled student IDs
+
 # -- Curriculum --
 class CurriculumBase(BaseModel):
     title: str
@@ -88,3 +105,21 @@ class GradeResponse(GradeBase):
     created_at: datetime
     class Config:
         from_attributes = True
+
+class GradeEntry(GradeBase):
+    student_id: UUID
+
+class GradeBulkCreate(BaseModel):
+    school_id: UUID
+    assessment_id: UUID
+    grades: List[GradeEntry]
+
+class GradeRowError(BaseModel):
+    student_id: UUID
+    detail: str
+
+class GradeBulkResponse(BaseModel):
+    assessment_id: UUID
+    inserted: int = 0
+    updated: int = 0
+    errors: List[GradeRowError] = []
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Literal, Optional, List
 from uuid import UUID
-from datetime import time, datetime
+from datetime import date as date_type, time, datetime
 
 # ─── Schedule ───────────────────────────────────────────────────────────────
 class ScheduleSlotBase(BaseModel):
@@ -25,6 +25,21 @@ class ScheduleSlotResponse(ScheduleSlotBase):
     class Config:
         from_attributes = True
 
+class ScheduleSlotRow(BaseModel):
+    """GET /schedule/ item (built from a column select, not validated)."""
+    id:           UUID
+    school_id:    UUID
+    class_id:     UUID
+    teacher_id:   UUID
+    day_of_week:  str
+    period:       int
+    start_time:   time
+    end_time:     time
+    room:         Optional[str] = None
+    class_name:   str
+    subject:      Optional[str] = None
+    teacher_name: str
+
 
 # ─── Attendance ─────────────────────────────────────────────────────────────
 class AttendanceRecordBase(BaseModel):
@@ -38,12 +53,26 @@ class AttendanceRecordCreate(AttendanceRecordBase):
     school_id:  UUID
     teacher_id: Optional[UUID] = None
 
+AttendanceStatus = Literal["present", "absent", "late", "excused"]
+
+class AttendanceEntry(BaseModel):
+    student_id: UUID
+    status:     AttendanceStatus = "present"
+    notes:      Optional[str] = None
+
 class AttendanceBulkCreate(BaseModel):
     school_id:  UUID
     class_id:   UUID
     teacher_id: Optional[UUID] = None
-    date:       str
-    records:    List[dict]  # [{student_id, status, notes}]
+    date:       date_type
+    records:    List[AttendanceEntry]
+
+class AttendanceBulkResult(BaseModel):
+    saved:     int   # inserted + updated + unchanged
+    inserted:  int
+    updated:   int
+    unchanged: int
+    skipped:   int   # students not in this school
 
 class AttendanceRecordResponse(AttendanceRecordBase):
     id:          UUID
@@ -54,6 +83,15 @@ class AttendanceRecordResponse(AttendanceRecordBase):
     class Config:
         from_attributes = True
 
+class AttendanceRow(BaseModel):
+    """GET /attendance/{class_id} item."""
+    id:           UUID
+    student_id:   UUID
+    student_name: str
+    date:         date_type
+    status:       str
+    notes:        Optional[str] = None
+
 
 # ─── Announcement ────────────────────────────────────────────────────────────
 class AnnouncementBase(BaseModel):
@@ -75,6 +113,16 @@ class AnnouncementResponse(AnnouncementBase):
     class Config:
         from_attributes = True
 
+class AnnouncementRow(BaseModel):
+    """GET /announcements/ item."""
+    id:         UUID
+    title:      str
+    body:       str
+    audience:   str
+    priority:   str
+    expires_at: Optional[date_type] = None
+    created_at: datetime
+
 
 # ─── Calendar ────────────────────────────────────────────────────────────────
 class CalendarEventBase(BaseModel):
@@ -94,3 +142,13 @@ class CalendarEventResponse(CalendarEventBase):
     created_at: datetime
     class Config:
         from_attributes = True
+
+class CalendarEventRow(BaseModel):
+    """GET /calendar/ item."""
+    id:          UUID
+    title:       str
+    description: Optional[str] = None
+    event_type:  str
+    start_date:  date_type
+    end_date:    date_type
+    class_id:    Optional[UUID] = None
@@ -1,5 +1,12 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
+from uuid import UUID
+
+class RecentStudent(BaseModel):
+    id: UUID
+    first_name: str
+    last_name: str
+    grade: Optional[str] = None
 
 class DashboardStats(BaseModel):
     total_students: int
@@ -7,3 +14,15 @@ class DashboardStats(BaseModel):
     total_revenue_expected: float
     total_revenue_collected: float
     outstanding_invoices_count: int
+    amounts_by_status: Dict[str, float] = {}   # invoice amounts: paid | pending | overdue
+    students_by_grade: Dict[str, int] = {}
+    recent_students: List[RecentStudent] = []
+
+class AttendanceTrendPoint(BaseModel):
+    key: str          # day (YYYY-MM-DD), month (YYYY-MM) or class_id, depending on group_by
+    present: int
+    absent: int
+    late: int
+    excused: int
+    total: int
+    absence_rate: float  # absent / total
@@ -1,7 +1,9 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime
+from decimal import Decimal
+from app.schemas.finance import FinancialRecordResponse
 
 class StudentBase(BaseModel):
     first_name: str
@@ -35,3 +37,40 @@ class StudentResponse(StudentBase):
 
     class Config:
         from_attributes = True
+
+class AttendanceSummary(BaseModel):
+    present: int = 0
+    absent: int = 0
+    late: int = 0
+    excused: int = 0
+    total: int = 0
+
+class FinanceBalance(BaseModel):
+    total: Decimal = Decimal(0)
+    paid: Decimal = Decimal(0)
+    pending: Decimal = Decimal(0)
+    overdue: Decimal = Decimal(0)
+    outstanding: Decimal = Decimal(0)  # pending + overdue
+
+class StudentClass(BaseModel):
+    id: UUID
+    name: str
+    subject: Optional[str] = None
+
+class StudentRecentGrade(BaseModel):
+    assessment_id: UUID
+    title: str
+    type: str
+    class_id: UUID
+    class_name: str
+    score: Decimal
+    max_score: Decimal
+    created_at: datetime
+
+class StudentProfileResponse(BaseModel):
+    student: StudentResponse
+    attendance: AttendanceSummary
+    financial_records: List[FinancialRecordResponse] = []
+    balance: FinanceBalance
+    classes: List[StudentClass] = []
+    recent_grades: List[StudentRecentGrade] = []
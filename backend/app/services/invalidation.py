@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.metrics import prometheus_family
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "tenant_versions"  # filled by the tenant_versions_bump() trigger (migration 3f9a6d2e8b14)
+
+Handler = Callable[[UUID, str, int], None]
+
+
+class InvalidationBus:
+    """
+    Cross-worker invalidation over Postgres LISTEN/NOTIFY.
+
+    - Every committed write to a versioned table notifies (school_id, resource, version);
+      the trigger publishes, so writes from any worker, script or psql are seen.
+    - Each worker LISTENs on one dedicated asyncpg connection (outside the SQLAlchemy
+      pools) and passes notifications to the subscribed handlers.
+    - A lost connection is retried with backoff. Until it is back, caches rely on their
+      TTL alone; once it is, `on_reconnect` callbacks drop whatever might have been
+      missed meanwhile.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        ping_interval: float = 30.0,
+        reconnect_min: float = 1.0,
+        reconnect_max: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.ping_interval = ping_interval
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self._handlers: List[Handler] = []
+        self._reconnect_handlers: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.metrics = {
+            "notifications": 0,
+            "bad_payloads": 0,
+            "connects": 0,
+            "disconnects": 0,
+        }
+
+    def subscribe(self, handler: Handler, on_reconnect: Optional[Callable[[], None]] = None) -> None:
+        """`handler(school_id, resource, version)` runs for every notification, in the event loop."""
+        self._handlers.append(handler)
+        if on_reconnect is not None:
+            self._reconnect_handlers.append(on_reconnect)
+
+    # -- Listening --
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        try:
+            school_id, resource, version = payload.split(":")
+            school_id, version = UUID(school_id), int(version)
+        except ValueError:
+            self.metrics["bad_payloads"] += 1
+            logger.warning("Ignoring malformed %s notification: %r", channel, payload)
+            return
+        self.metrics["notifications"] += 1
+        for handler in self._handlers:
+            try:
+                handler(school_id, resource, version)
+            except Exception:
+                logger.exception("Invalidation handler failed for %s", payload)
+
+    async def _listen(self) -> None:
+        """Hold one LISTEN connection until it is lost."""
+        conn = await asyncpg.connect(self.dsn, statement_cache_size=0)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        try:
+            await conn.add_listener(CHANNEL, self._on_notify)
+            self.connected = True
+            self.metrics["connects"] += 1
+            # Notifications sent while no connection was listening are gone
+            for callback in self._reconnect_handlers:
+                callback()
+            logger.info("Listening for %s notifications", CHANNEL)
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=self.ping_interval)
+                except asyncio.TimeoutError:
+                    # A half-open TCP connection never terminates on its own
+                    await asyncio.wait_for(conn.execute("SELECT 1"), timeout=self.ping_interval)
+        finally:
+            self.connected = False
+            if not conn.is_closed():
+                conn.terminate()
+
+    async def _run(self) -> None:
+        delay = self.reconnect_min
+        while True:
+            connects = self.metrics["connects"]
+            try:
+                await self._listen()
+                reason = "connection lost"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reason = str(e) or type(e).__name__
+            self.metrics["disconnects"] += 1
+            if self.metrics["connects"] > connects:
+                delay = self.reconnect_min  # it was up: back off from the start again
+            logger.warning("%s listener down (%s); caches are TTL-only, retrying in %.1fs", CHANNEL, reason, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max)
+
+    # -- Lifecycle --
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def prometheus(self) -> List[str]:
+        lines = prometheus_family(
+            "invalidation_listener_connected", "gauge", "1 while the LISTEN connection is up (else caches are TTL-only).",
+            [f"invalidation_listener_connected {int(self.connected)}"],
+        )
+        for key, help_text in (
+            ("notifications", "Invalidation notifications received."),
+            ("disconnects", "LISTEN connections that failed or were lost."),
+        ):
+            name = f"invalidation_{key}_total"
+            lines += prometheus_family(name, "counter", help_text, [f"{name} {self.metrics[key]}"])
+        return lines
+
+
+def _listen_dsn() -> str:
+    """Plain libpq URL for asyncpg; LISTEN needs a session, so not a transaction-mode pooler."""
+    url = make_url(settings.CACHE_NOTIFY_URL or settings.DATABASE_URL)
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+invalidation_bus = InvalidationBus(_listen_dsn(), ping_interval=settings.CACHE_NOTIFY_PING_SECONDS)
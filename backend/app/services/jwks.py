@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import httpx
+import jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSManager:
+    """
+    Async cache of Supabase JWKS public keys (keyed by kid).
+
+    - Warmed at startup and refreshed in the background, so key rotation is
+      picked up before tokens signed with the new kid arrive.
+    - Unknown kids trigger at most one in-flight fetch; concurrent callers
+      await the same task instead of fetching in parallel.
+    - On-demand fetches are at least `min_refresh_interval` seconds apart, so
+      tokens with made-up kids cannot make every request fetch; until then,
+      unknown kids are answered from the current key set.
+    - Kids still missing after a fetch (or a failed fetch) are negatively
+      cached for `miss_ttl` seconds, at most `max_misses` of them.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        refresh_interval: float = 600.0,
+        miss_ttl: float = 30.0,
+        min_refresh_interval: float = 30.0,
+        max_misses: int = 1024,
+        timeout: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.miss_ttl = miss_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.max_misses = max_misses
+        self.timeout = timeout
+        self._client = client
+        self._keys: dict = {}
+        self._misses: dict = {}  # kid -> monotonic time the negative entry expires
+        self._inflight: Optional[asyncio.Task] = None
+        self._last_fetch: Optional[float] = None  # monotonic time the last fetch started
+        self._refresher: Optional[asyncio.Task] = None
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "throttled": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+        }
+
+    # -- Lookup --
+    async def get_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None:
+            self.metrics["hits"] += 1
+            return key
+
+        expires = self._misses.get(kid)
+        if expires is not None:
+            if expires > time.monotonic():
+                self.metrics["negative_hits"] += 1
+                return None
+            del self._misses[kid]
+
+        self.metrics["misses"] += 1
+        if not self._refresh_allowed():
+            self.metrics["throttled"] += 1
+            return None
+        await self.refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            self._remember_miss(kid)
+        return key
+
+    def _refresh_allowed(self) -> bool:
+        """An on-demand fetch may start (or one is already running and can be joined)."""
+        if self._inflight is not None and not self._inflight.done():
+            return True
+        return self._last_fetch is None or time.monotonic() - self._last_fetch >= self.min_refresh_interval
+
+    def _remember_miss(self, kid: str) -> None:
+        now = time.monotonic()
+        if len(self._misses) >= self.max_misses:
+            self._misses = {k: expires for k, expires in self._misses.items() if expires > now}
+            # Same TTL for every entry, so insertion order is expiry order
+            while len(self._misses) >= self.max_misses:
+                del self._misses[next(iter(self._misses))]
+        self._misses[kid] = now + self.miss_ttl
+
+    async def refresh(self) -> bool:
+        """Fetch the JWKS document, joining an in-flight fetch if there is one."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._fetch())
+        return await asyncio.shield(self._inflight)
+
+    async def _fetch(self) -> bool:
+        self.metrics["fetches"] += 1
+        self._last_fetch = time.monotonic()
+        try:
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=self.timeout)
+            resp = await self._client.get(self.url)
+            resp.raise_for_status()
+            keys = {}
+            for key_data in resp.json().get("keys", []):
+                key_id = key_data.get("kid", "")
+                kty = key_data.get("kty", "RSA")
+                if kty == "EC":
+                    keys[key_id] = jwt.algorithms.ECAlgorithm.from_jwk(key_data)
+                else:
+                    keys[key_id] = jwt.algorithms.RSAAlgorithm.from_jwk(key_data)
+        except Exception as e:
+            self.metrics["fetch_errors"] += 1
+            logger.error("Failed to fetch JWKS from %s: %s", self.url, e)
+            return False
+
+        added = keys.keys() - self._keys.keys()
+        self._keys = keys
+        for key_id in keys:
+            self._misses.pop(key_id, None)
+        if added:
+            logger.info("Loaded JWKS keys: %s", ", ".join(sorted(added)))
+        return True
+
+    # -- Lifecycle --
+    async def start(self) -> None:
+        """Warm the cache and start background rotation."""
+        await self.refresh()
+        if self._refresher is None:
+            self._refresher = asyncio.ensure_future(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def stop(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {**self.metrics, "keys": len(self._keys), "negative_entries": len(self._misses)}
+
+
+def _jwks_url() -> str:
+    return settings.SUPABASE_JWKS_URL or f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json"
+
+
+jwks_manager = JWKSManager(
+    _jwks_url(),
+    refresh_interval=settings.JWKS_REFRESH_SECONDS,
+    miss_ttl=settings.JWKS_MISS_TTL_SECONDS,
+    min_refresh_interval=settings.JWKS_MIN_REFRESH_SECONDS,
+    timeout=settings.JWKS_TIMEOUT_SECONDS,
+)
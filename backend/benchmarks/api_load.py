@@ -0,0 +1,250 @@
+"""
+API load test: latency percentiles and throughput for representative endpoints.
+
+Mints local HS256 tokens for a seeded school (see benchmarks.seed_tenants) and drives
+the real FastAPI app with --concurrency async clients per scenario: in process through
+httpx's ASGI transport by default, or a running server with --url (which must share
+SUPABASE_JWT_SECRET). Each scenario reports p50/p95/p99 latency and requests/second.
+
+Results can be stored as a JSON baseline and compared on the next run; a scenario
+regresses when its p95 grows, or its throughput drops, by more than --threshold.
+
+Run from backend/ against a seeded database (DATABASE_URL):
+    python -m benchmarks.api_load [--requests 500] [--concurrency 20] [--only dashboard,schedule]
+                                  [--save benchmarks/baselines/api_load.json]
+                                  [--baseline benchmarks/baselines/api_load.json] [--threshold 0.2]
+
+Exit status is 1 when a scenario regresses or returns errors, so it can gate a deploy.
+Note the write scenarios (attendance_bulk, bulk_import) change the school's data;
+bulk_import adds --import-rows students per request.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import secrets
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+from uuid import UUID
+
+import httpx
+import jwt
+from sqlalchemy import select
+
+from app.api import dependencies
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.academic import ClassEnrollment
+from benchmarks.query_plans import Sample, pick_sample
+
+STATUSES = ("present", "present", "present", "present", "absent", "late")
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    json: Optional[dict] = None
+    files: Optional[dict] = None
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    rps: float
+
+
+def attendance_body(sample: Sample, student_ids: List[UUID], n: int) -> dict:
+    return {
+        "school_id": str(sample.school_id),
+        "class_id": str(sample.class_id),
+        "teacher_id": str(sample.teacher_id),
+        "date": sample.day.isoformat(),
+        # Rotate statuses so each request really updates rows instead of hitting the no-op path
+        "records": [
+            {"student_id": str(sid), "status": STATUSES[(i + n) % len(STATUSES)]}
+            for i, sid in enumerate(student_ids)
+        ],
+    }
+
+
+def import_file(rows: int, n: int) -> dict:
+    lines = ["first_name,last_name,grade,section"]
+    lines += [f"طالب{n}_{i},اختبار الأداء,الأول الابتدائي,أ" for i in range(rows)]
+    return {"file": ("students.csv", "\n".join(lines).encode(), "text/csv")}
+
+
+def scenarios(sample: Sample, student_ids: List[UUID], import_rows: int) -> dict:
+    """name -> function(request number) -> Request. Paths are relative to API_V1_STR."""
+    return {
+        "dashboard": lambda n: Request("GET", "/reports/dashboard"),
+        "classes_matrix": lambda n: Request("GET", "/academic/classes/matrix"),
+        "schedule": lambda n: Request("GET", "/schedule/"),
+        "students_page": lambda n: Request("GET", "/students/?limit=50"),
+        "student_profile": lambda n: Request("GET", f"/students/{sample.student_id}/profile"),
+        "enrollment_map": lambda n: Request("GET", "/academic/enrollments"),
+        "attendance_summary": lambda n: Request("GET", f"/attendance/summary?class_id={sample.class_id}"),
+        "attendance_bulk": lambda n: Request("POST", "/attendance/bulk", json=attendance_body(sample, student_ids, n)),
+        "bulk_import": lambda n: Request("POST", "/students/bulk-import", files=import_file(import_rows, n)),
+    }
+
+
+def mint_token(secret: str, school_id: UUID, role: str = "Admin") -> str:
+    claims = {
+        "sub": "00000000-0000-0000-0000-00000000beef",
+        "role": "authenticated",
+        "exp": int(time.time()) + 3600,
+        "user_metadata": {"role": role, "school_id": str(school_id)},
+    }
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)]
+
+
+async def drive(client: httpx.AsyncClient, build: Callable[[int], Request],
+                total: int, concurrency: int, warmup: int) -> Result:
+    async def send(n: int) -> bool:
+        req = build(n)
+        resp = await client.request(req.method, settings.API_V1_STR + req.path, json=req.json, files=req.files)
+        return resp.is_success
+
+    for n in range(warmup):
+        await send(-1 - n)
+
+    latencies, errors = [], 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for n in counter:
+            start = time.perf_counter()
+            ok = await send(n)
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    ms = [x * 1000 for x in latencies]
+    return Result(
+        requests=len(ms),
+        errors=errors,
+        p50_ms=round(percentile(ms, 50), 2),
+        p95_ms=round(percentile(ms, 95), 2),
+        p99_ms=round(percentile(ms, 99), 2),
+        mean_ms=round(sum(ms) / len(ms), 2) if ms else 0.0,
+        rps=round(len(ms) / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> dict:
+    """name -> reason, for scenarios worse than the baseline by more than `threshold`."""
+    found = {}
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        reasons = []
+        if result["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            reasons.append(f"p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+        if result["rps"] < before["rps"] * (1 - threshold):
+            reasons.append(f"rps {before['rps']} -> {result['rps']}")
+        if reasons:
+            found[name] = ", ".join(reasons)
+    return found
+
+
+async def run(args) -> int:
+    async with AsyncSessionLocal() as db:
+        sample = await pick_sample(db, args.school_id)
+        student_ids = list((await db.execute(
+            select(ClassEnrollment.student_id).filter(ClassEnrollment.class_id == sample.class_id)
+        )).scalars().all())
+
+    if args.url:
+        secret = settings.SUPABASE_JWT_SECRET
+        if not secret:
+            raise SystemExit("--url needs SUPABASE_JWT_SECRET (the server's) to mint tokens")
+        transport, base_url = None, args.url
+    else:
+        from app.main import app
+        # Local secret: tokens minted here are the only ones the in-process app has to accept
+        secret = settings.SUPABASE_JWT_SECRET = secrets.token_urlsafe(32)
+        dependencies._hs_secrets = None
+        dependencies._token_cache.clear()
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+
+    headers = {"Authorization": f"Bearer {mint_token(secret, sample.school_id)}"}
+    selected = scenarios(sample, student_ids, args.import_rows)
+    if args.only:
+        selected = {name: selected[name] for name in args.only.split(",")}
+
+    print(f"school {sample.school_id}, class {sample.class_id} ({len(student_ids)} students), "
+          f"{args.requests} requests x {args.concurrency} clients\n")
+    print(f"{'scenario':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>10}{'errors':>8}")
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, headers=headers,
+                                 limits=limits, timeout=60) as client:
+        for name, build in selected.items():
+            result = await drive(client, build, args.requests, args.concurrency, args.warmup)
+            results[name] = asdict(result)
+            print(f"{name:<22}{result.p50_ms:>10}{result.p95_ms:>10}{result.p99_ms:>10}"
+                  f"{result.mean_ms:>10}{result.rps:>10}{result.errors:>8}")
+
+    failed = {name: f"{r['errors']} error(s)" for name, r in results.items() if r["errors"]}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        failed.update(regressions(results, baseline, args.threshold))
+        print(f"\ncompared with {args.baseline} ({baseline['meta']['recorded_at']}), threshold {args.threshold:.0%}")
+    for name, reason in failed.items():
+        print(f"  REGRESSION {name}: {reason}")
+
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "target": args.url or "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "school_students": len(student_ids),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        }
+        path.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+        print(f"\nbaseline saved to {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Base URL of a running server (default: drive the app in process)")
+    parser.add_argument("--school-id", type=UUID, help="School to test (default: the one with most students)")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests before each scenario")
+    parser.add_argument("--import-rows", type=int, default=200, help="Rows per bulk_import CSV")
+    parser.add_argument("--only", help="Comma-separated scenario names")
+    parser.add_argument("--save", help="Write results to this JSON baseline")
+    parser.add_argument("--baseline", help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p95/throughput change (0.2 = 20%%)")
+    sys.exit(asyncio.run(run(parser.parse_args())))
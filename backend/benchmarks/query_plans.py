@@ -0,0 +1,184 @@
+"""
+Query-plan regression check for the tenant-scoped read paths in app/crud/.
+
+Runs each CRUD read against a seeded Postgres (DATABASE_URL), captures the SQL
+it emits, EXPLAINs it with the same parameters and fails if any plan falls back
+to a sequential scan on a table (or partition) with at least --min-rows rows.
+
+Run from backend/ against a seeded database (see benchmarks.seed_tenants):
+    python -m benchmarks.query_plans [--school-id UUID] [--min-rows 10000] [--analyze] [--verbose]
+
+Exit status is 1 when a plan regresses, so it can gate CI.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import event, func, select, text
+
+from app.db.session import AsyncSessionLocal, engine
+from app.crud import new_modules
+from app.crud.academic import academic
+from app.crud.finance import financial_record
+from app.crud.report import report
+from app.crud.student import student
+from app.crud.teacher import teacher
+from app.models.academic import Assessment, Class, ClassEnrollment
+from app.models.attendance import AttendanceRecord
+from app.models.student import Student
+
+
+@dataclass
+class Sample:
+    """Representative IDs from the school under test."""
+    school_id: UUID
+    class_id: UUID
+    teacher_id: UUID
+    student_id: UUID
+    last_name: str
+    grade: Optional[str]
+    assessment_id: Optional[UUID]
+    day: date
+
+
+QUERIES = [
+    ("student.get_page", lambda db, s: student.get_page(db, s.school_id, limit=50)),
+    ("student.get_page(grade)", lambda db, s: student.get_page(db, s.school_id, limit=50, grade=s.grade)),
+    ("student.get_page(name_prefix)", lambda db, s: student.get_page(db, s.school_id, limit=50, name_prefix=s.last_name[:2])),
+    ("student.get_profile", lambda db, s: student.get_profile(db, s.school_id, s.student_id)),
+    ("teacher.get_page", lambda db, s: teacher.get_page(db, s.school_id, limit=50)),
+    ("finance.get_page", lambda db, s: financial_record.get_page(db, s.school_id, limit=50)),
+    ("finance.get_page(status)", lambda db, s: financial_record.get_page(db, s.school_id, limit=50, status="overdue")),
+    ("finance.get_by_student", lambda db, s: financial_record.get_by_student(db, s.school_id, s.student_id)),
+    ("academic.get_classes_matrix", lambda db, s: academic.get_classes_matrix(db, s.school_id)),
+    ("academic.get_classes_by_teacher", lambda db, s: academic.get_classes_by_teacher(db, s.school_id, s.teacher_id)),
+    ("academic.get_enrollment_map", lambda db, s: academic.get_enrollment_map(db, s.school_id)),
+    ("academic.get_students_in_class", lambda db, s: academic.get_students_in_class(db, s.school_id, s.class_id)),
+    ("academic.get_curriculum", lambda db, s: academic.get_curriculum(db, s.school_id, s.class_id)),
+    ("academic.get_assessments", lambda db, s: academic.get_assessments(db, s.school_id, s.class_id)),
+    ("academic.get_grades", lambda db, s: academic.get_grades(db, s.school_id, s.assessment_id)),
+    ("schedule.get_school_schedule", lambda db, s: new_modules.get_school_schedule(db, s.school_id)),
+    ("attendance.get_class_attendance", lambda db, s: new_modules.get_class_attendance(db, s.school_id, s.class_id, s.day.isoformat())),
+    ("attendance.get_student_attendance_summary", lambda db, s: new_modules.get_student_attendance_summary(db, s.school_id, s.student_id)),
+    ("attendance.get_attendance_summaries(class)", lambda db, s: new_modules.get_attendance_summaries(db, s.school_id, class_id=s.class_id)),
+    ("announcements.get_announcements", lambda db, s: new_modules.get_announcements(db, s.school_id)),
+    ("calendar.get_calendar_events", lambda db, s: new_modules.get_calendar_events(db, s.school_id, s.day.year, s.day.month)),
+    ("report.get_dashboard_stats", lambda db, s: report.get_dashboard_stats(db, s.school_id)),
+    ("report.get_attendance_trend(month)", lambda db, s: report.get_attendance_trend(db, s.school_id, group_by="month")),
+]
+
+
+class StatementRecorder:
+    """Collects (statement, parameters) sent to the driver while `active`."""
+
+    def __init__(self):
+        self.active = False
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.statements.append((statement, parameters))
+
+
+async def pick_sample(db, school_id: Optional[UUID]) -> Sample:
+    if school_id is None:
+        school_id = (await db.execute(
+            select(Student.school_id).group_by(Student.school_id).order_by(func.count().desc()).limit(1)
+        )).scalar()
+        if school_id is None:
+            raise SystemExit("No students found; seed the database first")
+
+    busiest_class = (await db.execute(
+        select(Class.id, Class.teacher_id)
+        .join(ClassEnrollment, ClassEnrollment.class_id == Class.id)
+        .filter(Class.school_id == school_id)
+        .group_by(Class.id).order_by(func.count().desc()).limit(1)
+    )).first()
+    if busiest_class is None:
+        raise SystemExit(f"School {school_id} has no enrolled classes")
+    some_student = (await db.execute(
+        select(Student.id, Student.last_name, Student.grade)
+        .join(ClassEnrollment, ClassEnrollment.student_id == Student.id)
+        .filter(ClassEnrollment.class_id == busiest_class.id).limit(1)
+    )).first()
+    assessment_id = (await db.execute(
+        select(Assessment.id).filter(Assessment.school_id == school_id, Assessment.class_id == busiest_class.id).limit(1)
+    )).scalar()
+    day = (await db.execute(
+        select(func.max(AttendanceRecord.date))
+        .filter(AttendanceRecord.school_id == school_id, AttendanceRecord.class_id == busiest_class.id)
+    )).scalar() or date.today()
+    return Sample(
+        school_id=school_id,
+        class_id=busiest_class.id,
+        teacher_id=busiest_class.teacher_id,
+        student_id=some_student.id,
+        last_name=some_student.last_name,
+        grade=some_student.grade,
+        assessment_id=assessment_id,
+        day=day,
+    )
+
+
+def seq_scans(plan: dict):
+    """Yield the relation of every Seq Scan node in a JSON plan tree."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+async def check(school_id: Optional[UUID], min_rows: int, analyze: bool, verbose: bool) -> int:
+    recorder = StatementRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+    failures = 0
+    async with AsyncSessionLocal() as db:
+        if analyze:
+            await db.execute(text("ANALYZE"))
+        sample = await pick_sample(db, school_id)
+        print(f"school {sample.school_id}, class {sample.class_id}, day {sample.day}\n")
+        conn = await db.connection()
+        row_counts = dict((await db.execute(text(
+            "SELECT relname, reltuples::bigint FROM pg_class WHERE relkind IN ('r', 'p')"
+        ))).all())
+
+        print(f"{'query':<48}{'cost':>12}  result")
+        for name, run in QUERIES:
+            recorder.statements.clear()
+            recorder.active = True
+            try:
+                await run(db, sample)
+            finally:
+                recorder.active = False
+
+            worst_cost, offenders = 0.0, set()
+            for statement, parameters in list(recorder.statements):
+                explained = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+                plan = (json.loads(explained) if isinstance(explained, str) else explained)[0]["Plan"]
+                worst_cost = max(worst_cost, plan["Total Cost"])
+                offenders.update(r for r in seq_scans(plan) if row_counts.get(r, 0) >= min_rows)
+                if verbose:
+                    print(json.dumps(plan, indent=2))
+
+            status = "ok" if not offenders else "SEQ SCAN on " + ", ".join(sorted(offenders))
+            failures += bool(offenders)
+            print(f"{name:<48}{worst_cost:>12.1f}  {status}")
+
+    event.remove(engine.sync_engine, "before_cursor_execute", recorder)
+    print(f"\n{failures} regression(s) (seq scans on tables with >= {min_rows} rows)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--school-id", type=UUID, help="School to test (default: the one with most students)")
+    parser.add_argument("--min-rows", type=int, default=10000, help="Seq scans below this table size are fine")
+    parser.add_argument("--analyze", action="store_true", help="Run ANALYZE first so plans use fresh statistics")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(check(args.school_id, args.min_rows, args.analyze, args.verbose)))
@@ -0,0 +1,425 @@
+"""
+Synthetic tenant generator: fills Postgres with production-sized schools for benchmarking.
+
+Each school gets an admin user, teachers, students spread over grades and sections,
+one class per (grade, section, subject), enrollments, a weekly schedule, daily roll
+calls for every class over the last --years academic years, graded assessments and
+tuition invoices. Rows are streamed with binary COPY (asyncpg) from --jobs worker
+processes, one school at a time per worker; attendance_daily_rollup is rebuilt for
+every seeded school afterwards.
+
+Output is deterministic for a given --seed, school index and --until date, so two
+runs against empty databases produce identical rows (IDs included). Use --offset to
+add more schools to an already seeded database without colliding with earlier ones.
+
+Run from backend/ against a migrated database (DATABASE_URL):
+    python -m benchmarks.seed_tenants --schools 10 [--students-per-school 800] [--years 2] [--seed 42] [--jobs 4]
+
+With the defaults each school is about 1.6M rows, almost all of them attendance.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as time_of_day, timedelta
+from decimal import Decimal
+from typing import List
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.terms import term_bounds
+from app.crud import new_modules
+from app.crud.report import report
+from app.db.partitions import academic_year
+from app.db.session import AsyncSessionLocal, engine
+
+MALE_NAMES = [
+    "محمد", "أحمد", "علي", "حسن", "حسين", "عمر", "خالد", "يوسف", "إبراهيم", "كريم",
+    "مصطفى", "سامر", "رامي", "طارق", "زياد", "وسيم", "جاد", "هادي", "باسل", "نبيل",
+    "فادي", "ماهر", "وليد", "عادل", "سليم", "رياض", "مازن", "أيمن", "جهاد", "بلال",
+]
+FEMALE_NAMES = [
+    "فاطمة", "زينب", "مريم", "نور", "سارة", "ليلى", "هدى", "رنا", "ريم", "لينا",
+    "دانا", "جنى", "ملك", "ياسمين", "سلمى", "هبة", "رشا", "نادين", "آية", "رهف",
+    "غنى", "تالا", "لمى", "سحر", "منى", "دينا", "رولا", "ميرا", "شهد", "بتول",
+]
+FAMILY_NAMES = [
+    "الحسيني", "الخطيب", "حداد", "نصر الله", "شمس الدين", "العلي", "الأمين", "فرحات",
+    "عيسى", "منصور", "حمدان", "الزين", "سلامة", "يونس", "عبد الله", "الموسوي", "جابر",
+    "قاسم", "صالح", "الحاج", "بزي", "شريف", "عواضة", "ناصر", "حيدر", "طالب", "كرم",
+    "سعد", "مراد", "الشامي", "البيروتي", "الصباغ", "عثمان", "الديراني", "حمادة", "مكي",
+]
+SCHOOL_NAMES = [
+    "الأمل", "النور", "الإيمان", "الرواد", "المستقبل", "الفجر", "الحكمة", "الأرز",
+    "الشروق", "القلم", "دار العلوم", "الكرامة", "الإشراق", "المعرفة", "الرسالة", "الأجيال",
+]
+SCHOOL_KINDS = ["الأهلية", "الرسمية", "الخاصة", "الدولية", "النموذجية"]
+CITIES = ["بيروت", "طرابلس", "صيدا", "صور", "زحلة", "جبيل", "النبطية", "بعلبك", "عاليه", "جونيه"]
+
+# Same labels the dashboard forms offer (AddStudentModal, AddClassModal)
+GRADES = [
+    "الأول الابتدائي", "الثاني الابتدائي", "الثالث الابتدائي",
+    "الرابع الابتدائي", "الخامس الابتدائي", "السادس الابتدائي",
+    "السابع المتوسط", "الثامن المتوسط", "التاسع المتوسط",
+    "العاشر الثانوي", "الحادي عشر الثانوي", "الثاني عشر الثانوي",
+]
+SECTIONS = ["أ", "ب", "ج", "د", "هـ"]
+SUBJECTS = [
+    "الرياضيات", "اللغة العربية", "اللغة الإنجليزية", "العلوم", "التاريخ", "الجغرافيا",
+    "التربية الدينية", "التربية الوطنية", "اللغة الفرنسية", "الفيزياء", "الكيمياء", "الأحياء",
+]
+
+SCHOOL_DAYS = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday")
+TEACHING_WEEKDAYS = {6, 0, 1, 2, 3}  # date.weekday() of SCHOOL_DAYS
+PERIODS = 7
+FIRST_PERIOD = time_of_day(8, 0)
+SUMMER_BREAK = (6, 20)  # (month, day) the last term stops holding classes
+
+# Per term: (type, title, max_score), spread evenly over the term's school days
+TERM_ASSESSMENTS = [
+    ("quiz", "اختبار قصير 1", Decimal(20)),
+    ("assignment", "واجب منزلي", Decimal(10)),
+    ("quiz", "اختبار قصير 2", Decimal(20)),
+    (None, None, Decimal(100)),  # midterm in term 1, final in term 2
+]
+TUITION_BY_STAGE = (Decimal(3000), Decimal(3600), Decimal(4200))  # primary, middle, secondary
+INSTALLMENTS = [("القسط الأول", 10, 1), ("القسط الثاني", 1, 15), ("القسط الثالث", 4, 1)]
+
+COLUMNS = {
+    "schools": ("id", "name", "domain", "subscription_plan", "status", "created_at", "updated_at"),
+    "users": ("id", "school_id", "email", "full_name", "role", "created_at", "updated_at"),
+    "teachers": ("id", "school_id", "specialization", "hire_date", "first_name", "last_name",
+                 "email", "phone", "created_at", "updated_at"),
+    "students": ("id", "school_id", "first_name", "last_name", "grade", "section", "enrollment_date",
+                 "date_of_birth", "email", "phone", "created_at", "updated_at"),
+    "classes": ("id", "school_id", "name", "subject", "teacher_id", "created_at", "updated_at"),
+    "class_enrollments": ("id", "school_id", "class_id", "student_id", "created_at", "updated_at"),
+    "schedule_slots": ("id", "school_id", "class_id", "teacher_id", "day_of_week", "period",
+                       "start_time", "end_time", "room", "created_at", "updated_at"),
+    "attendance_records": ("id", "school_id", "class_id", "student_id", "teacher_id", "date",
+                           "status", "notes", "created_at", "updated_at"),
+    "assessments": ("id", "school_id", "class_id", "teacher_id", "type", "title", "max_score",
+                    "methodology", "ai_generated", "created_at", "updated_at"),
+    "grades": ("id", "school_id", "student_id", "assessment_id", "score", "remarks",
+               "created_at", "updated_at"),
+    "financial_records": ("id", "school_id", "student_id", "amount", "type", "status", "due_date",
+                          "description", "created_at", "updated_at"),
+}
+
+
+@dataclass
+class Options:
+    seed: int
+    until: date
+    years: int
+    students: int
+    teachers: int
+    sections: int
+    subjects: int
+    skip_fk_checks: bool
+
+
+@dataclass
+class SeedStudent:
+    id: uuid.UUID
+    absence_rate: float
+    ability: float
+    late_payer: bool
+
+
+@dataclass
+class SeedClass:
+    id: uuid.UUID
+    teacher_id: uuid.UUID
+    students: List[SeedStudent] = field(default_factory=list)
+
+
+def dsn() -> str:
+    """DATABASE_URL as a plain libpq URL that asyncpg.connect() accepts."""
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def academic_years(opts: Options) -> List[int]:
+    current = academic_year(opts.until)
+    return list(range(current - opts.years + 1, current + 1))
+
+
+def school_days(year: int, until: date) -> List[date]:
+    """Sunday-Thursday teaching days of one academic year, up to `until`."""
+    first, _ = term_bounds(f"{year}-1")
+    last = min(date(year + 1, *SUMMER_BREAK), until)
+    days, day = [], first
+    while day <= last:
+        if day.weekday() in TEACHING_WEEKDAYS:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+class SchoolGenerator:
+    """Rows for one school. Every random draw comes from an RNG seeded by (seed, index)."""
+
+    def __init__(self, index: int, opts: Options):
+        self.opts = opts
+        self.rng = random.Random(f"{opts.seed}:{index}")
+        self.now = datetime.combine(opts.until, time_of_day(0, 0))
+        self.school_id = self.uuid()
+        self.domain = f"s{opts.seed}-{index}.bench.local"
+        self.subjects = SUBJECTS[:opts.subjects]
+        self.homerooms = [(g, s) for g in range(len(GRADES)) for s in SECTIONS[:opts.sections]]
+        self.teachers = []  # (id, subject)
+        self.classes = {}   # (grade index, section) -> [SeedClass per subject]
+        self.students = []  # (SeedStudent, grade index)
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def person(self) -> tuple:
+        first = self.rng.choice(MALE_NAMES if self.rng.random() < 0.5 else FEMALE_NAMES)
+        return first, self.rng.choice(FAMILY_NAMES)
+
+    def phone(self) -> str:
+        return f"+961 {self.rng.choice(('3', '70', '71', '76', '81'))} {self.rng.randint(100000, 999999)}"
+
+    def school(self):
+        rng = self.rng
+        name = f"مدرسة {rng.choice(SCHOOL_NAMES)} {rng.choice(SCHOOL_KINDS)} - {rng.choice(CITIES)}"
+        plan = rng.choice(("free", "basic", "premium"))
+        yield (self.school_id, name, self.domain, plan, "active", self.now, self.now)
+
+    def users(self):
+        first, last = self.person()
+        yield (self.uuid(), self.school_id, f"admin@{self.domain}", f"{first} {last}", "Admin", self.now, self.now)
+
+    def teacher_rows(self):
+        count = max(self.opts.teachers, len(self.subjects))
+        for k in range(count):
+            teacher_id, subject = self.uuid(), self.subjects[k % len(self.subjects)]
+            self.teachers.append((teacher_id, subject))
+            first, last = self.person()
+            hired = self.opts.until - timedelta(days=self.rng.randint(90, 365 * 20))
+            yield (teacher_id, self.school_id, subject, hired, first, last,
+                   f"teacher{k}@{self.domain}", self.phone(), self.now, self.now)
+
+    def class_rows(self):
+        by_subject = {s: [t for t, subject in self.teachers if subject == s] for s in self.subjects}
+        for n, (grade, section) in enumerate(self.homerooms):
+            classes = []
+            for subject in self.subjects:
+                candidates = by_subject[subject]
+                cls = SeedClass(self.uuid(), candidates[n % len(candidates)])
+                classes.append(cls)
+                yield (cls.id, self.school_id, f"{GRADES[grade]} - {section}", subject,
+                       cls.teacher_id, self.now, self.now)
+            self.classes[(grade, section)] = classes
+
+    def student_rows(self):
+        rng, current = self.rng, academic_year(self.opts.until)
+        per_room, extra = divmod(self.opts.students, len(self.homerooms))
+        for n, (grade, section) in enumerate(self.homerooms):
+            for k in range(per_room + (n < extra)):
+                # Most students are rarely absent; a long tail is absent a lot
+                student = SeedStudent(
+                    id=self.uuid(),
+                    absence_rate=min(rng.betavariate(1.2, 18), 0.6),
+                    ability=min(max(rng.gauss(0.72, 0.13), 0.2), 1.0),
+                    late_payer=rng.random() < 0.12,
+                )
+                self.students.append((student, grade))
+                for cls in self.classes[(grade, section)]:
+                    cls.students.append(student)
+                first, last = self.person()
+                born = date(current - 6 - grade, rng.randint(1, 12), rng.randint(1, 28))
+                enrolled = date(current - rng.randint(0, grade), settings.TERM1_START_MONTH, 1)
+                yield (student.id, self.school_id, first, last, GRADES[grade], section, enrolled, born,
+                       f"student{len(self.students)}@{self.domain}", self.phone(), self.now, self.now)
+
+    def enrollment_rows(self):
+        for classes in self.classes.values():
+            for cls in classes:
+                for student in cls.students:
+                    yield (self.uuid(), self.school_id, cls.id, student.id, self.now, self.now)
+
+    def schedule_rows(self):
+        for (grade, section), classes in self.classes.items():
+            room = f"قاعة {grade + 1}-{section}"
+            for d, day in enumerate(SCHOOL_DAYS):
+                for period in range(1, PERIODS + 1):
+                    cls = classes[(d * PERIODS + period) % len(classes)]
+                    start = datetime.combine(date.min, FIRST_PERIOD) + timedelta(minutes=50 * (period - 1))
+                    end = start + timedelta(minutes=45)
+                    yield (self.uuid(), self.school_id, cls.id, cls.teacher_id, day, period,
+                           start.time(), end.time(), room, self.now, self.now)
+
+    def attendance_rows(self):
+        rng, school_id = self.rng, self.school_id
+        all_classes = [cls for classes in self.classes.values() for cls in classes]
+        for year in academic_years(self.opts):
+            for day in school_days(year, self.opts.until):
+                taken = datetime.combine(day, FIRST_PERIOD)
+                for cls in all_classes:
+                    for student in cls.students:
+                        r, rate = rng.random(), student.absence_rate
+                        if r >= rate:
+                            status = "present"
+                        elif r < rate * 0.6:
+                            status = "absent"
+                        elif r < rate * 0.9:
+                            status = "late"
+                        else:
+                            status = "excused"
+                        yield (uuid.UUID(int=rng.getrandbits(128), version=4), school_id, cls.id,
+                               student.id, cls.teacher_id, day, status, None, taken, taken)
+
+    def assessment_and_grade_rows(self):
+        """Two generators sharing state: assessments must be copied before their grades."""
+        assessments, grades = [], []
+        for year in academic_years(self.opts):
+            term2_start, _ = term_bounds(f"{year}-2")
+            year_days = school_days(year, self.opts.until)
+            for term in (1, 2):
+                days = [d for d in year_days if (d >= term2_start) == (term == 2)]
+                for n, (kind, title, max_score) in enumerate(TERM_ASSESSMENTS):
+                    position = (n + 1) * len(days) // len(TERM_ASSESSMENTS) - 1
+                    if position < 0:
+                        continue
+                    held = datetime.combine(days[position], FIRST_PERIOD)
+                    if kind is None:
+                        kind, title = ("midterm", "امتحان نصفي") if term == 1 else ("final", "امتحان نهائي")
+                    for classes in self.classes.values():
+                        for cls in classes:
+                            assessment_id = self.uuid()
+                            assessments.append((assessment_id, self.school_id, cls.id, cls.teacher_id, kind,
+                                                f"{title} {year}/{year + 1}", max_score, None, False, held, held))
+                            for student in cls.students:
+                                share = min(max(self.rng.gauss(student.ability, 0.1), 0.0), 1.0)
+                                score = Decimal(round(share * float(max_score) * 2) / 2).quantize(Decimal("0.01"))
+                                grades.append((self.uuid(), self.school_id, student.id, assessment_id,
+                                               score, None, held, held))
+        return assessments, grades
+
+    def finance_rows(self):
+        rng, until = self.rng, self.opts.until
+        for year in academic_years(self.opts):
+            for student, grade in self.students:
+                tuition = TUITION_BY_STAGE[min(grade // 6 + (grade >= 9), 2)]
+                amount = (tuition / len(INSTALLMENTS)).quantize(Decimal("0.01"))
+                for label, month, day in INSTALLMENTS:
+                    due = date(year + (month < settings.TERM1_START_MONTH), month, day)
+                    if due > until:
+                        status = "pending"
+                    else:
+                        paid_odds = 0.55 if student.late_payer else 0.97
+                        status = "paid" if rng.random() < paid_odds else "overdue"
+                    issued = datetime.combine(due - timedelta(days=30), time_of_day(9, 0))
+                    yield (self.uuid(), self.school_id, student.id, amount, "invoice", status, due,
+                           f"{label} - {year}/{year + 1}", issued, issued)
+
+
+async def copy(conn: asyncpg.Connection, table: str, records) -> int:
+    result = await conn.copy_records_to_table(table, records=records, columns=COLUMNS[table])
+    return int(result.split()[-1])
+
+
+async def seed_school(index: int, opts: Options) -> dict:
+    """Load one school in a single transaction; returns rows written per table."""
+    gen = SchoolGenerator(index, opts)
+    counts = {}
+    conn = await asyncpg.connect(dsn())
+    try:
+        async with conn.transaction():
+            if opts.skip_fk_checks:
+                # Skips FK and tenant_stats triggers (superuser only); tenant_stats is rebuilt below
+                await conn.execute("SET LOCAL session_replication_role = replica")
+            counts["schools"] = await copy(conn, "schools", gen.school())
+            counts["users"] = await copy(conn, "users", gen.users())
+            counts["teachers"] = await copy(conn, "teachers", gen.teacher_rows())
+            counts["classes"] = await copy(conn, "classes", gen.class_rows())
+            counts["students"] = await copy(conn, "students", gen.student_rows())
+            counts["class_enrollments"] = await copy(conn, "class_enrollments", gen.enrollment_rows())
+            counts["schedule_slots"] = await copy(conn, "schedule_slots", gen.schedule_rows())
+            counts["financial_records"] = await copy(conn, "financial_records", gen.finance_rows())
+            assessments, grades = gen.assessment_and_grade_rows()
+            counts["assessments"] = await copy(conn, "assessments", assessments)
+            counts["grades"] = await copy(conn, "grades", grades)
+            counts["attendance_records"] = await copy(conn, "attendance_records", gen.attendance_rows())
+    finally:
+        await conn.close()
+
+    # Derived tables go through the app's own rebuild paths
+    async with AsyncSessionLocal() as db:
+        counts["attendance_daily_rollup"] = await new_modules.rebuild_attendance_rollup(db, gen.school_id)
+        if opts.skip_fk_checks:
+            await report.rebuild_tenant_stats(db, gen.school_id)
+    await engine.dispose()
+    return counts
+
+
+def _worker(index: int, opts: Options) -> dict:
+    return asyncio.run(seed_school(index, opts))
+
+
+async def prepare(opts: Options) -> None:
+    """Create attendance partitions up front so workers never race on DDL."""
+    conn = await asyncpg.connect(dsn())
+    try:
+        for year in academic_years(opts):
+            await conn.fetchval("SELECT attendance_records_ensure_partition($1, $2)",
+                                year, settings.TERM1_START_MONTH)
+    finally:
+        await conn.close()
+
+
+def run(schools: int, offset: int, jobs: int, opts: Options) -> None:
+    asyncio.run(prepare(opts))
+    totals = dict.fromkeys(COLUMNS, 0)
+    totals["attendance_daily_rollup"] = 0
+    start = time.perf_counter()
+    # spawn: each worker builds its own engine and event loop
+    with multiprocessing.get_context("spawn").Pool(jobs) as pool:
+        results = [pool.apply_async(_worker, (i, opts)) for i in range(offset, offset + schools)]
+        for done, result in enumerate(results, 1):
+            for table, n in result.get().items():
+                totals[table] += n
+            elapsed = time.perf_counter() - start
+            print(f"[{done}/{schools}] {sum(totals.values()):,} rows in {elapsed:.0f}s")
+
+    elapsed = time.perf_counter() - start
+    print()
+    for table, n in totals.items():
+        print(f"{table:<26}{n:>14,}")
+    rows = sum(totals.values())
+    print(f"{'total':<26}{rows:>14,}  ({rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--schools", type=int, default=1)
+    parser.add_argument("--offset", type=int, default=0, help="Index of the first school (extends an earlier run)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--until", type=date.fromisoformat, default=date.today(),
+                        help="Last day of generated history (YYYY-MM-DD); part of the determinism key")
+    parser.add_argument("--years", type=int, default=2, help="Academic years of attendance, grades and invoices")
+    parser.add_argument("--students-per-school", type=int, default=800)
+    parser.add_argument("--teachers-per-school", type=int, default=40)
+    parser.add_argument("--sections", type=int, default=2, choices=range(1, len(SECTIONS) + 1))
+    parser.add_argument("--subjects", type=int, default=8, choices=range(1, len(SUBJECTS) + 1))
+    parser.add_argument("--jobs", type=int, default=multiprocessing.cpu_count(), help="Schools loaded in parallel")
+    parser.add_argument("--skip-fk-checks", action="store_true",
+                        help="Disable FK/trigger checks while copying (needs superuser); much faster")
+    args = parser.parse_args()
+    run(args.schools, args.offset, args.jobs, Options(
+        seed=args.seed,
+        until=args.until,
+        years=args.years,
+        students=args.students_per_school,
+        teachers=args.teachers_per_school,
+        sections=args.sections,
+        subjects=args.subjects,
+        skip_fk_checks=args.skip_fk_checks,
+    ))
@@ -0,0 +1,70 @@
+"""
+Maintenance commands for derived tables.
+
+Usage (from backend/):
+    python maintenance.py rebuild-tenant-stats [--school-id UUID]
+    python maintenance.py rebuild-attendance-rollup [--school-id UUID] [--from DATE] [--to DATE]
+    python maintenance.py attendance-partitions [--years-ahead N] [--detach-before YEAR]
+"""
+import argparse
+import asyncio
+from datetime import date
+from uuid import UUID
+
+from app.db.session import AsyncSessionLocal
+from app.crud.report import report
+from app.crud import new_modules
+from app.db import partitions
+
+
+async def rebuild_tenant_stats(school_id: UUID = None):
+    async with AsyncSessionLocal() as db:
+        drifted = await report.rebuild_tenant_stats(db, school_id=school_id)
+    print(f"tenant_stats rebuilt; {len(drifted)} school(s) had drifted")
+    for sid in drifted:
+        print(f"  - {sid}")
+
+
+async def rebuild_attendance_rollup(school_id: UUID = None, date_from: date = None, date_to: date = None):
+    async with AsyncSessionLocal() as db:
+        written = await new_modules.rebuild_attendance_rollup(db, school_id, date_from, date_to)
+    print(f"attendance_daily_rollup rebuilt; {written} row(s) written")
+
+
+async def attendance_partitions(years_ahead: int, detach_before: int = None):
+    async with AsyncSessionLocal() as db:
+        created = await partitions.ensure_attendance_partitions(db, years_ahead=years_ahead)
+        detached = await partitions.detach_attendance_partitions(db, detach_before) if detach_before else []
+        current = await partitions.list_attendance_partitions(db)
+    print(f"created: {', '.join(created) or '-'}")
+    print(f"detached: {', '.join(detached) or '-'}")
+    print(f"attached: {', '.join(current)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="School Management SaaS maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-tenant-stats", help="Recompute tenant_stats from base tables")
+    rebuild.add_argument("--school-id", type=UUID, help="Only rebuild this school")
+
+    rollup = commands.add_parser("rebuild-attendance-rollup", help="Recompute attendance_daily_rollup from attendance_records")
+    rollup.add_argument("--school-id", type=UUID, help="Only rebuild this school")
+    rollup.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    rollup.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD)")
+
+    parts = commands.add_parser("attendance-partitions", help="Create upcoming attendance_records partitions, detach old ones")
+    parts.add_argument("--years-ahead", type=int, default=1, help="Academic years to create past the current one")
+    parts.add_argument("--detach-before", type=int, metavar="YEAR", help="Detach partitions of academic years before YEAR")
+
+    args = parser.parse_args()
+    if args.command == "rebuild-tenant-stats":
+        asyncio.run(rebuild_tenant_stats(args.school_id))
+    elif args.command == "rebuild-attendance-rollup":
+        asyncio.run(rebuild_attendance_rollup(args.school_id, args.date_from, args.date_to))
+    elif args.command == "attendance-partitions":
+        asyncio.run(attendance_partitions(args.years_ahead, args.detach_before))
+
+
+if __name__ == "__main__":
+    main()
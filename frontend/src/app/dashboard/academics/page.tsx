@@ -42,16 +42,13 @@ export default async function AcademicsPage() {
 
     let enrollmentMap: Record<string, string[]> = {}
     if (userRole === "Admin" || userRole === "SuperAdmin") {
-        await Promise.all(
-            classes.map(async (cls: any) => {
-                try {
-                    const enrolled = await fetchApi(`/academic/enrollments/${cls.id}`) || []
-                    enrollmentMap[cls.id] = enrolled.map((s: any) => s.id)
-                } catch {
-                    enrollmentMap[cls.id] = []
-                }
-            })
-        )
+        try {
+            // One request for the whole school: { class_id: [student_id, ...] }
+            enrollmentMap = await fetchApi('/academic/enrollments') || {}
+        } catch (e: any) {
+            console.error("Enrollments error:", e?.message || e)
+        }
+        for (const cls of classes) enrollmentMap[cls.id] ??= []
     }
 
     return (
@@ -76,26 +76,26 @@ export function GradeBookClient({ schoolId, classes, userRole }: Props) {
             assessmentId = assessData.id
         } catch { }
 
-        // 2. Submit grades for each student
+        // 2. Submit all grades in one request
         let saved = 0
-        for (const student of students) {
-            const score = parseFloat(scores[student.id] || '0')
-            if (assessmentId && !isNaN(score)) {
-                try {
-                    await fetch('/api/submit-grade', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify({
-                            school_id: schoolId,
-                            student_id: student.id,
-                            assessment_id: assessmentId,
-                            score,
-                            remarks: remarks[student.id] || null,
-                        }),
-                    })
-                    saved++
-                } catch { }
-            }
+        const grades = students
+            .map(student => ({
+                student_id: student.id,
+                score: parseFloat(scores[student.id] || '0'),
+                remarks: remarks[student.id] || null,
+            }))
+            .filter(g => !isNaN(g.score))
+        if (assessmentId && grades.length > 0) {
+            try {
+                const res = await fetch('/api/submit-grades', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ school_id: schoolId, assessment_id: assessmentId, grades }),
+                })
+                const result = await res.json()
+                saved = (result.inserted || 0) + (result.updated || 0)
+                if (result.errors?.length) console.error('[gradebook] rejected rows:', result.errors)
+            } catch { }
         }
         setSavedCount(saved)
         setSaving(false)
@@ -80,12 +80,10 @@ export default async function DashboardPage() {
     const { data: { user } } = await supabase.auth.getUser()
     if (!user) redirect('/login')
 
-    let students: any[] = [], teachers: any[] = [], finances: any[] = [], classes: any[] = [], announcements: any[] = [], events: any[] = []
+    let stats: any = null, classes: any[] = [], announcements: any[] = [], events: any[] = []
     try {
-        [students, teachers, finances, classes, announcements] = await Promise.all([
-            fetchApiCached('/students/', 30).then(d => d || []),
-            fetchApiCached('/teachers/', 30).then(d => d || []),
-            fetchApiCached('/finance/', 30).then(d => d || []),
+        [stats, classes, announcements] = await Promise.all([
+            fetchApiCached('/reports/dashboard', 30),
             fetchApiCached('/academic/classes/matrix', 60).then(d => d || []),
             fetchApiCached('/announcements/', 60).then(d => d || []),
         ])
@@ -93,16 +91,20 @@ export default async function DashboardPage() {
         events = await fetchApiCached(`/calendar/?year=${now.getFullYear()}&month=${now.getMonth() + 1}`, 60).then(d => d || [])
     } catch { }
 
+    // Aggregates computed server-side in one query (/reports/dashboard)
+    const totalStudents: number = stats?.total_students ?? 0
+    const totalTeachers: number = stats?.total_teachers ?? 0
+    const recentStudents: any[] = stats?.recent_students || []
+
     // Financial calculations
-    const paid = finances.filter(f => f.status === 'paid').reduce((s, f) => s + parseFloat(f.amount || 0), 0)
-    const pending = finances.filter(f => f.status === 'pending').reduce((s, f) => s + parseFloat(f.amount || 0), 0)
-    const overdue = finances.filter(f => f.status === 'overdue').reduce((s, f) => s + parseFloat(f.amount || 0), 0)
+    const paid = stats?.amounts_by_status?.paid || 0
+    const pending = stats?.amounts_by_status?.pending || 0
+    const overdue = stats?.amounts_by_status?.overdue || 0
     const totalFinance = paid + pending + overdue
     const $fmt = (n: number) => `$${n.toLocaleString('en', { minimumFractionDigits: 0 })}`
 
     // Students per grade distribution
-    const gradeMap: Record<string, number> = {}
-    students.forEach((s: any) => { const g = s.grade || 'غير محدد'; gradeMap[g] = (gradeMap[g] || 0) + 1 })
+    const gradeMap: Record<string, number> = stats?.students_by_grade || {}
     const GRADE_COLORS = ['#0056D2', '#7C3AED', '#059669', '#D97706', '#DC2626', '#0891B2', '#9333EA', '#15803D', '#B45309', '#B91C1C', '#0369A1', '#6D28D9']
     const gradeData = Object.entries(gradeMap).map(([label, value], i) => ({
         label: label.replace('الصف ', '').replace(' ابتدائي', '\nابتدائي').replace(' إعدادي', '\nإعدادي').replace(' ثانوي', '\nثانوي'),
@@ -119,8 +121,8 @@ export default async function DashboardPage() {
 
     // Top stat cards
     const statCards = [
-        { label: 'إجمالي الطلاب', value: students.length, icon: Users, color: '#0056D2', bg: '#EFF6FF', sub: `${classes.length} فصل` },
-        { label: 'أعضاء هيئة التدريس', value: teachers.length, icon: GraduationCap, color: '#7C3AED', bg: '#F5F3FF', sub: 'معلم نشط' },
+        { label: 'إجمالي الطلاب', value: totalStudents, icon: Users, color: '#0056D2', bg: '#EFF6FF', sub: `${classes.length} فصل` },
+        { label: 'أعضاء هيئة التدريس', value: totalTeachers, icon: GraduationCap, color: '#7C3AED', bg: '#F5F3FF', sub: 'معلم نشط' },
         { label: 'الإيرادات المحصلة', value: $fmt(paid), icon: Wallet, color: '#059669', bg: '#F0FDF4', sub: `${$fmt(pending)} معلق` },
         { label: 'إجمالي الفصول', value: classes.length, icon: BookOpen, color: '#D97706', bg: '#FFFBEB', sub: `${classes.reduce((s: number, c: any) => s + (c.students_count || 0), 0)} طالب مسجل` },
     ]
@@ -169,7 +171,7 @@ export default async function DashboardPage() {
                     <div className="flex items-center justify-between mb-4">
                         <div>
                             <p style={{ fontWeight: 700, fontSize: '0.9375rem', color: 'var(--text-primary)' }}>توزيع الطلاب حسب الصف</p>
-                            <p style={{ fontSize: '0.75rem', color: 'var(--text-muted)' }}>{students.length} طالب في {Object.keys(gradeMap).length} صف</p>
+                            <p style={{ fontSize: '0.75rem', color: 'var(--text-muted)' }}>{totalStudents} طالب في {Object.keys(gradeMap).length} صف</p>
                         </div>
                         <Link href="/dashboard/students" style={{ color: 'var(--blue-primary)', fontSize: '0.8125rem', fontWeight: 600, display: 'flex', alignItems: 'center', gap: 4 }}>
                             عرض الكل <ArrowUpRight className="h-3.5 w-3.5" />
@@ -311,7 +313,7 @@ export default async function DashboardPage() {
                             <p style={{ fontWeight: 700, fontSize: '0.875rem', color: 'var(--text-primary)' }}>آخر الطلاب</p>
                             <Link href="/dashboard/students" style={{ color: 'var(--blue-primary)', fontSize: '0.8125rem', fontWeight: 600 }}>الكل</Link>
                         </div>
-                        {students.slice(-5).reverse().map((s: any) => (
+                        {recentStudents.map((s: any) => (
                             <Link key={s.id} href={`/dashboard/students/${s.id}`}
                                 className="flex items-center gap-3 px-5 py-2.5 hover:bg-gray-50 transition-colors"
                                 style={{ borderBottom: '1px solid #F9FAFB', textDecoration: 'none' }}
@@ -11,16 +11,16 @@ export default async function StudentProfilePage({ params }: { params: Promise<{
 
     const schoolId = user?.user_metadata?.school_id || ''
 
-    let student: any = null, attendance: any = null, finance: any = []
-    try {
-        const students = await fetchApi('/students/') || []
-        student = students.find((s: any) => s.id === id)
-        if (!student) notFound()
-        attendance = await fetchApi(`/attendance/student/${id}/summary`).catch(() => null)
-        finance = await fetchApi('/finance/')
-            .then((f: any[]) => f?.filter((r: any) => r.student_id === id) || [])
-            .catch(() => [])
-    } catch { }
+    // One request: student, attendance summary, finance, classes and recent grades
+    const profile: any = await fetchApi(`/students/${id}/profile`).catch(() => null)
+    if (!profile?.student) notFound()
 
-    return <StudentProfile student={student} attendance={attendance} finance={finance} schoolId={schoolId} />
+    return (
+        <StudentProfile
+            student={profile.student}
+            attendance={profile.attendance}
+            finance={profile.financial_records || []}
+            schoolId={schoolId}
+        />
+    )
 }
@@ -7,14 +7,16 @@ import { StudentEditModal } from "./StudentEditModal"
 import Link from "next/link"
 import { Search, Download, Users, Eye } from "lucide-react"
 
-export default async function StudentsPage() {
+export default async function StudentsPage({ searchParams }: { searchParams: Promise<{ q?: string }> }) {
+    const { q } = await searchParams
     const supabase = await createClient()
     const { data: { user } } = await supabase.auth.getUser()
     if (!user) redirect('/login')
 
     const schoolId = user?.user_metadata?.school_id || '00000000-0000-0000-0000-000000000000'
     let students: any[] = []
-    try { students = await fetchApi('/students/') || [] } catch (e: any) { console.error(e?.message) }
+    const query = q?.trim() ? `?name_prefix=${encodeURIComponent(q.trim())}` : ''
+    try { students = await fetchApi(`/students/${query}`) || [] } catch (e: any) { console.error(e?.message) }
 
     const gradeGroups = students.reduce((acc: Record<string, number>, s: any) => {
         const g = s.grade || 'غير محدد'
@@ -63,15 +65,17 @@ export default async function StudentsPage() {
             {/* Table Card */}
             <div className="card overflow-hidden">
                 <div className="flex flex-col sm:flex-row sm:items-center gap-3 px-5 py-4" style={{ borderBottom: '1px solid #F3F4F6' }}>
-                    <div className="relative max-w-xs w-full">
+                    <form method="get" className="relative max-w-xs w-full">
                         <Search className="absolute right-3 top-1/2 -translate-y-1/2 h-4 w-4 pointer-events-none" style={{ color: 'var(--text-subtle)' }} />
                         <input
                             type="text"
+                            name="q"
+                            defaultValue={q ?? ''}
                             placeholder="البحث في الطلاب..."
                             className="form-input"
                             style={{ paddingRight: '2.5rem' }}
                         />
-                    </div>
+                    </form>
                     <div className="flex items-center gap-2 mr-auto">
                         <span className="badge badge-blue">
                             <Users className="h-3 w-3 ml-1 inline" />
@@ -46,23 +46,53 @@ export async function fetchApi(endpoint: string, options: RequestInit = {}) {
     return data
 }
 
-/** Cached version — use for read-heavy data that rarely changes. Default TTL: 30s */
+type CachedEntry = { etag: string | null; data: any; fetchedAt: number }
+
+// Last response per (token, URL) in this server process, revalidated with If-None-Match
+const responseCache = new Map<string, CachedEntry>()
+const RESPONSE_CACHE_MAX_ENTRIES = 500
+
+function remember(key: string, entry: CachedEntry) {
+    responseCache.delete(key)
+    responseCache.set(key, entry)
+    if (responseCache.size > RESPONSE_CACHE_MAX_ENTRIES) {
+        responseCache.delete(responseCache.keys().next().value!)
+    }
+}
+
+/**
+ * Cached version — use for read-heavy data that rarely changes. Default TTL: 30s.
+ * Within the TTL the last body is reused as is; after it, the request carries the
+ * last ETag and a 304 from the API reuses that body instead of downloading it again.
+ */
 export async function fetchApiCached(endpoint: string, ttlSeconds = 30) {
     const token = await getSessionToken()
     const headers: Record<string, string> = { 'Content-Type': 'application/json' }
     if (token) headers['Authorization'] = `Bearer ${token}`
 
     const url = `${API_BASE_URL}${endpoint.startsWith('/') ? endpoint : `/${endpoint}`}`
+    const key = `${token ?? ''} ${url}`
+    const cached = responseCache.get(key)
+    if (cached && Date.now() - cached.fetchedAt < ttlSeconds * 1000) return cached.data
+    if (cached?.etag) headers['If-None-Match'] = cached.etag
 
     let res: Response
     try {
-        res = await fetch(url, { headers, next: { revalidate: ttlSeconds } })
+        // Our own cache: Next's data cache would answer without ever asking the API
+        res = await fetch(url, { headers, cache: 'no-store' })
     } catch (networkErr: any) {
         throw new Error(`Network error: ${networkErr?.message}`)
     }
 
+    if (res.status === 304 && cached) {
+        remember(key, { ...cached, fetchedAt: Date.now() })
+        return cached.data
+    }
     if (!res.ok) return null
     const text = await res.text()
-    try { return text ? JSON.parse(text) : null }
+    let data: any
+    try { data = text ? JSON.parse(text) : null }
     catch { return null }
+    remember(key, { etag: res.headers.get('ETag'), data, fetchedAt: Date.now() })
+    return data
 }